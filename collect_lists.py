@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Multi-List URL Collector via GraphQL API
+======================================================
+Walks several investor lists on signal-api.nfx.com/graphql at once.
+No browser needed. Uses cursor-based pagination per list.
+
+Every list gets its own coroutine and saves into its own data dir exactly
+like the single-list collectors (all_investor_urls.json, all_investor_lite.json,
+list_profiles/ with --rich). All lists share one pooled SignalClient, so
+MAX_REQUESTS_PER_SECOND caps the combined request rate: refreshing four
+lists takes about as long as the longest one, not the sum.
+
+Checkpoints append only newly found records to all_investor_urls.journal.jsonl
+(and the lite journal) and fold them into the sorted snapshots every
+url_journal.COMPACT_EVERY records and at the end of each walk, so a save
+costs time in proportion to what is new, not to the whole list.
+
+Resume: each save also writes collect_checkpoint.json (last endCursor, page,
+record_count) right after the URL file. An unfinished walk continues from
+that cursor on the next run; if the server rejects the cursor, the list is
+walked again from the start. --no-resume ignores checkpoints.
+
+Run:
+    python collect_lists.py                                  # every list in LISTS
+    python collect_lists.py fintech-seed enterprise-seed     # known slugs
+    python collect_lists.py marketplaces-seed=data-marketplaces --rate 4 --rich
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import logging
+import time
+from datetime import datetime
+
+from graphql_profiles import PROFILE_FRAGMENT, map_list_node, map_lite_record
+from signal_client import SignalAPIError, SignalClient
+from url_journal import Journal, load_records
+
+# =============================================================================
+# CONFIG
+# =============================================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+GRAPHQL_URL = "https://signal-api.nfx.com/graphql"
+PAGE_SIZE = 50
+SAVE_EVERY = 200                # save every N new URLs
+CHECKPOINT_EVERY_PAGES = 4      # ...and at least every N pages, so the cursor advances
+MAX_REQUESTS_PER_SECOND = 4.0   # across all lists together (be polite)
+LOG_FILE = os.path.join(SCRIPT_DIR, "collector_lists.log")
+
+# Known lists: list slug -> output data dir
+LISTS = {
+    "saas-seed": os.path.join(SCRIPT_DIR, "data-saas"),
+    "fintech-seed": os.path.join(SCRIPT_DIR, "data-fintech-seed"),
+    "enterprise-seed": os.path.join(SCRIPT_DIR, "data-enterprise-seed"),
+}
+
+LIST_QUERY = """
+query vclInvestors($slug: String!, $after: String) {
+  list(slug: $slug) {
+    id
+    slug
+    investor_count
+    scored_investors(first: %(page_size)d, after: $after) {
+      pageInfo {
+        hasNextPage
+        hasPreviousPage
+        endCursor
+      }
+      record_count
+      edges {
+        node {
+          id
+          person {
+%(person_fields)s
+          }
+          position
+          firm {
+            id
+            name
+            slug
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+BASIC_PERSON_FIELDS = """\
+            id
+            first_name
+            last_name
+            name
+            slug"""
+
+GRAPHQL_QUERY = LIST_QUERY % {"page_size": PAGE_SIZE, "person_fields": BASIC_PERSON_FIELDS}
+RICH_GRAPHQL_QUERY = (
+    LIST_QUERY % {"page_size": PAGE_SIZE, "person_fields": "            ...ProfileFields"}
+    + PROFILE_FRAGMENT
+)
+
+# Configured in main(); the single-list wrappers set up their own log files
+log = logging.getLogger(__name__)
+
+
+# =============================================================================
+# ONE LIST
+# =============================================================================
+class ListCollector:
+    """Paginates one investor list and keeps its data dir up to date.
+
+    rich:     also save a list-level profile record per edge (list_profiles/)
+    min_urls: skip the walk if the URL file already has this many entries
+    resume:   continue an unfinished walk from collect_checkpoint.json
+    """
+
+    def __init__(self, list_slug, data_dir, rich=False, min_urls=None, resume=True):
+        self.list_slug = list_slug
+        self.data_dir = data_dir
+        self.rich = rich
+        self.min_urls = min_urls
+        self.resume = resume
+        self.all_urls_file = os.path.join(data_dir, "all_investor_urls.json")
+        self.lite_file = os.path.join(data_dir, "all_investor_lite.json")
+        self.checkpoint_file = os.path.join(data_dir, "collect_checkpoint.json")
+        self.list_profiles_dir = os.path.join(data_dir, "list_profiles")
+        self.url_journal = Journal(self.all_urls_file)
+        self.lite_journal = Journal(self.lite_file)
+
+        self.all_investors = {}
+        self.lite_records = {}
+        self.new_urls = []        # records not yet in the URL journal
+        self.changed_lite = {}    # slug -> lite record not yet in the lite journal
+        self.start_count = 0
+        self.pages = 0
+        self.cursor = None
+        self.complete = False
+        self.resumed_from_page = None
+        self.record_count = None
+        self.list_profiles_saved = 0
+        self.elapsed = 0.0
+        self.error = None
+
+    # -- file I/O ------------------------------------------------------------
+    def load_existing_urls(self) -> dict:
+        try:
+            return {slug: item["url"] for slug, item in load_records(self.all_urls_file).items()}
+        except Exception as e:
+            log.warning(f"[{self.list_slug}] Could not load existing URLs: {e}")
+        return {}
+
+    def load_existing_lite(self) -> dict:
+        try:
+            return load_records(self.lite_file)
+        except Exception as e:
+            log.warning(f"[{self.list_slug}] Could not load existing lite records: {e}")
+        return {}
+
+    def save_list_profile(self, data: dict):
+        os.makedirs(self.list_profiles_dir, exist_ok=True)
+        filepath = os.path.join(self.list_profiles_dir, f"{data['slug']}.json")
+        tmp = filepath + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, filepath)
+
+    def save_urls(self, compact=False):
+        """Journal what is new since the last save, compacting when due, then checkpoint."""
+        os.makedirs(self.data_dir, exist_ok=True)
+        self.lite_journal.append(list(self.changed_lite.values()))
+        self.url_journal.append(self.new_urls)
+        self.changed_lite = {}
+        self.new_urls = []
+
+        if compact or self.url_journal.due or not os.path.exists(self.all_urls_file):
+            self.url_journal.compact([
+                {"slug": s, "url": self.all_investors[s]} for s in sorted(self.all_investors)
+            ])
+        if self.lite_records and (compact or self.lite_journal.due or not os.path.exists(self.lite_file)):
+            self.lite_journal.compact([self.lite_records[s] for s in sorted(self.lite_records)])
+
+        # Written last: the cursor never points past what the URL files hold
+        self.save_checkpoint()
+
+    def load_checkpoint(self):
+        """Return the saved checkpoint for this list, or None."""
+        if not os.path.exists(self.checkpoint_file):
+            return None
+        try:
+            with open(self.checkpoint_file, "r") as f:
+                checkpoint = json.load(f)
+        except Exception as e:
+            log.warning(f"[{self.list_slug}] Could not load checkpoint: {e}")
+            return None
+        if checkpoint.get("list_slug") != self.list_slug:
+            return None
+        return checkpoint
+
+    def save_checkpoint(self):
+        tmp = self.checkpoint_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "list_slug": self.list_slug,
+                "end_cursor": self.cursor,
+                "page": self.pages,
+                "record_count": self.record_count,
+                "url_count": len(self.all_investors),
+                "complete": self.complete,
+                "saved_at": datetime.now().isoformat(),
+            }, f, indent=2)
+        os.replace(tmp, self.checkpoint_file)
+
+    # -- pagination ----------------------------------------------------------
+    async def fetch_page(self, client, after_cursor=None):
+        variables = {
+            "slug": self.list_slug,
+            "order": [{}],
+        }
+        if after_cursor:
+            variables["after"] = after_cursor
+
+        return await client.post({
+            "operationName": "vclInvestors",
+            "variables": variables,
+            "query": RICH_GRAPHQL_QUERY if self.rich else GRAPHQL_QUERY,
+        })
+
+    def add_edges(self, edges):
+        """Merge one page of edges. Returns the number of new URLs."""
+        new = 0
+        for edge in edges:
+            node = edge.get("node", {})
+            person = node.get("person", {})
+            slug = person.get("slug")
+            lite = map_lite_record(node)
+            if lite and self.lite_records.get(slug) != lite:
+                self.lite_records[slug] = lite
+                self.changed_lite[slug] = lite
+            if self.rich and slug:
+                record = map_list_node(node)
+                if record:
+                    self.save_list_profile(record)
+                    self.list_profiles_saved += 1
+            if slug and slug not in self.all_investors:
+                url = f"https://signal.nfx.com/investors/{slug}"
+                self.all_investors[slug] = url
+                self.new_urls.append({"slug": slug, "url": url})
+                new += 1
+        return new
+
+    async def collect(self, client):
+        started = time.monotonic()
+        tag = f"[{self.list_slug}]"
+        self.all_investors = self.load_existing_urls()
+        self.lite_records = self.load_existing_lite()
+        self.start_count = len(self.all_investors)
+        log.info(f"{tag} Loaded {self.start_count} existing URLs from disk")
+
+        if self.min_urls and self.start_count >= self.min_urls:
+            log.info(f"{tag} Already have {self.start_count} URLs (>= {self.min_urls}). Done!")
+            return
+
+        checkpoint = self.load_checkpoint() if self.resume else None
+        if checkpoint and not checkpoint.get("complete") and checkpoint.get("end_cursor"):
+            self.cursor = checkpoint["end_cursor"]
+            self.pages = self.resumed_from_page = checkpoint.get("page") or 0
+            self.record_count = checkpoint.get("record_count")
+            log.info(f"{tag} Resuming after page {self.pages} from checkpoint "
+                     f"({checkpoint.get('saved_at', '?')})")
+
+        new_since_save = 0
+        pages_since_save = 0
+
+        try:
+            while True:
+                page_num = self.pages + 1
+                on_resumed_cursor = self.resumed_from_page is not None and self.pages == self.resumed_from_page
+
+                try:
+                    data = await self.fetch_page(client, after_cursor=self.cursor)
+                except SignalAPIError as e:
+                    if on_resumed_cursor:
+                        self.restart_walk(f"cursor rejected ({e})")
+                        continue
+                    log.error(f"{tag} Request failed: {e}")
+                    self.error = str(e)
+                    break
+                except Exception as e:
+                    log.error(f"{tag} Request failed: {e}")
+                    self.error = str(e)
+                    break
+
+                list_data = (data.get("data") or {}).get("list")
+                if not list_data and on_resumed_cursor:
+                    errors = "; ".join(err.get("message", "") for err in data.get("errors") or [])
+                    self.restart_walk(f"cursor rejected ({errors or 'no list data'})")
+                    continue
+                if not list_data:
+                    log.error(f"{tag} No list data in response: {json.dumps(data)[:500]}")
+                    self.error = "no list data"
+                    break
+
+                scored = list_data.get("scored_investors", {})
+                page_info = scored.get("pageInfo", {})
+                edges = scored.get("edges", [])
+
+                if self.record_count is None and scored.get("record_count"):
+                    self.record_count = scored["record_count"]
+                    log.info(f"{tag} Server reports {self.record_count} total investors")
+
+                new_this_page = self.add_edges(edges)
+                self.pages = page_num
+                new_since_save += new_this_page
+                pages_since_save += 1
+
+                total = len(self.all_investors)
+                has_next = page_info.get("hasNextPage", False)
+                if page_info.get("endCursor"):
+                    self.cursor = page_info["endCursor"]
+
+                log.info(
+                    f"{tag}  Page {self.pages} | +{new_this_page} new ({len(edges)} fetched) | "
+                    f"total: {total} | hasNext: {has_next}"
+                )
+
+                if not has_next:
+                    log.info(f"{tag} No more pages (hasNextPage=false)")
+                    self.complete = True
+                    break
+
+                if new_since_save >= SAVE_EVERY or pages_since_save >= CHECKPOINT_EVERY_PAGES:
+                    self.save_urls()
+                    if new_since_save >= SAVE_EVERY:
+                        log.info(f"{tag}  SAVED ({total} URLs)")
+                    new_since_save = 0
+                    pages_since_save = 0
+
+                if not page_info.get("endCursor"):
+                    log.warning(f"{tag} No cursor returned — stopping")
+                    break
+        finally:
+            # Also runs on cancellation (Ctrl+C), so nothing fetched is lost
+            self.save_urls(compact=True)
+            self.elapsed = time.monotonic() - started
+
+    def restart_walk(self, reason):
+        """Drop a stale resume cursor and walk the list from the first page."""
+        log.warning(f"[{self.list_slug}] {reason} — falling back to a full walk")
+        self.cursor = None
+        self.pages = 0
+        self.resumed_from_page = None
+
+    def report(self):
+        log.info(f"  [{self.list_slug}]")
+        log.info(f"    Total URLs:     {len(self.all_investors)}")
+        log.info(f"    New this run:   {len(self.all_investors) - self.start_count}")
+        log.info(f"    Pages fetched:  {self.pages}"
+                 + (f" (resumed after page {self.resumed_from_page})" if self.resumed_from_page else ""))
+        if self.record_count:
+            log.info(f"    Server total:   {self.record_count}")
+        log.info(f"    Wall time:      {self.elapsed:.1f}s")
+        log.info(f"    Saved to:       {self.all_urls_file}")
+        log.info(f"    Lite records:   {len(self.lite_records)} -> {self.lite_file}")
+        log.info(f"    Journal:        {self.url_journal.appended} URLs, {self.lite_journal.appended} lite "
+                 f"appended; {self.url_journal.compactions} compactions")
+        if self.rich:
+            log.info(f"    List profiles:  {self.list_profiles_saved} -> {self.list_profiles_dir}")
+        if self.error:
+            log.info(f"    Stopped early:  {self.error}")
+
+
+# =============================================================================
+# MANY LISTS
+# =============================================================================
+async def collect_lists(collectors, graphql_url=GRAPHQL_URL, rate=MAX_REQUESTS_PER_SECOND):
+    """Walk every collector's list concurrently over one rate-capped client."""
+    started = time.monotonic()
+    async with SignalClient(graphql_url, pool_size=max(1, len(collectors)),
+                            min_interval=1.0 / rate if rate > 0 else 0.0) as client:
+        await asyncio.gather(*(c.collect(client) for c in collectors))
+
+    log.info("")
+    log.info("=" * 60)
+    log.info("  URL COLLECTION COMPLETE")
+    for c in collectors:
+        c.report()
+    log.info(f"  Lists:          {len(collectors)} in {time.monotonic() - started:.1f}s "
+             f"(sum of lists: {sum(c.elapsed for c in collectors):.1f}s)")
+    log.info(f"  HTTP:           {client.summary()}")
+    log.info("=" * 60)
+    return collectors
+
+
+def parse_list_arg(value):
+    """'slug' (known list) or 'slug=data_dir' -> (slug, data_dir)."""
+    slug, _, data_dir = value.partition("=")
+    if data_dir:
+        return slug, os.path.abspath(data_dir)
+    if slug not in LISTS:
+        raise argparse.ArgumentTypeError(f"unknown list '{slug}' (use {slug}=DATA_DIR)")
+    return slug, LISTS[slug]
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler(LOG_FILE, encoding="utf-8"),
+            logging.StreamHandler(),
+        ],
+    )
+
+    parser = argparse.ArgumentParser(description="NFX Signal - concurrent multi-list URL collector")
+    parser.add_argument("lists", nargs="*", type=parse_list_arg, metavar="SLUG[=DATA_DIR]",
+                        help="Lists to collect (default: every list in LISTS)")
+    parser.add_argument("--rate", type=float, default=MAX_REQUESTS_PER_SECOND,
+                        help=f"Max requests per second across all lists (default: {MAX_REQUESTS_PER_SECOND})")
+    parser.add_argument("--rich", action="store_true",
+                        help="Request full profile fields and save list_profiles/ per dataset")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Ignore saved cursor checkpoints and walk every list from the start")
+    parser.add_argument("--graphql-url", default=GRAPHQL_URL, help="GraphQL endpoint")
+    args = parser.parse_args()
+
+    lists = args.lists or list(LISTS.items())
+    collectors = [ListCollector(slug, data_dir, rich=args.rich, resume=not args.no_resume)
+                  for slug, data_dir in lists]
+
+    log.info("=" * 60)
+    log.info("  NFX SIGNAL - MULTI-LIST URL COLLECTOR")
+    for slug, data_dir in lists:
+        log.info(f"  {slug:<20} -> {data_dir}")
+    log.info(f"  Page size: {PAGE_SIZE}")
+    log.info(f"  Rate cap:  {args.rate} req/s across all lists")
+    log.info(f"  Rich mode: {'ON (list profiles saved per edge)' if args.rich else 'off'}")
+    log.info("=" * 60)
+
+    try:
+        asyncio.run(collect_lists(collectors, graphql_url=args.graphql_url, rate=args.rate))
+    except KeyboardInterrupt:
+        log.info("\nStopped by user. Collected URLs saved.")
+    except Exception as e:
+        log.error(f"CRASH: {e}")
+        import traceback
+        log.error(traceback.format_exc())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Incremental Export Cache
+======================================
+Keeps the flattened row of every profile from the previous export, so a
+re-run only parses and flattens the profiles that changed since:
+
+    cache = ExportCache("csv", CACHE_VERSION)
+    for item in cache.iter(corpus, flatten_profile):   # same Items as Corpus.iter
+        writer.writerow(item.data)
+    print(cache.summary())
+
+Per dataset and export name, next to profiles/:
+
+    export_cache/<name>.index.json   {"version", "entries": {slug: [size, mtime_ns]}}
+    export_cache/<name>.rows.jsonl   "<slug>\\t<row JSON>" per line, in profile file order
+
+A profile is unchanged when its file size and mtime match the index, so
+unchanged profiles are never opened; their rows are streamed from the
+rows file, which is in the same order as the export. New and changed
+profiles go through the corpus workers (profile_corpus.py) as usual. The
+new index and rows file are written alongside and replace the old ones
+only when the export has read every row.
+
+Bump the caller's CACHE_VERSION whenever its row format changes; a
+version mismatch rebuilds the cache.
+
+Run:
+    python export_cache.py status                # cached exports per dataset
+    python export_cache.py clear                 # delete every export cache
+"""
+
+import argparse
+import json
+import os
+import shutil
+
+from profile_corpus import Corpus, Item, decode_chunk, dataset_sources, loads
+
+CACHE_DIRNAME = "export_cache"
+
+
+class DatasetCache:
+    """Index and rows file of one export for one dataset."""
+
+    def __init__(self, profiles_dir, name, version):
+        self.profiles_dir = profiles_dir
+        self.dir = os.path.join(os.path.dirname(os.path.abspath(profiles_dir)), CACHE_DIRNAME)
+        self.index_file = os.path.join(self.dir, f"{name}.index.json")
+        self.rows_file = os.path.join(self.dir, f"{name}.rows.jsonl")
+        self.version = version
+        self.entries = {}
+        if os.path.exists(self.index_file) and os.path.exists(self.rows_file):
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                index = {}
+            if index.get("version") == version:
+                self.entries = {slug: tuple(stamp) for slug, stamp in index.get("entries", {}).items()}
+
+    def stamps(self, slugs=None):
+        """[(slug, path, (size, mtime_ns)), ...] of the profile files, in file name order."""
+        files = []
+        with os.scandir(self.profiles_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    slug = entry.name[:-5]
+                    if slugs is None or slug in slugs:
+                        st = entry.stat()
+                        files.append((entry.name, slug, entry.path, (st.st_size, st.st_mtime_ns)))
+        files.sort()
+        return [(slug, path, stamp) for _, slug, path, stamp in files]
+
+    def cached_rows(self):
+        """(slug, raw row JSON) pairs from the rows file, decoded only on demand."""
+        if not self.entries:
+            return
+        with open(self.rows_file, "r", encoding="utf-8") as f:
+            for line in f:
+                slug, _, raw = line.rstrip("\n").partition("\t")
+                yield slug, raw
+
+
+class ExportCache:
+    """Incremental row cache of one export across the datasets of a corpus."""
+
+    def __init__(self, name, version):
+        self.name = name
+        self.version = version
+        self.stats = {"reused": 0, "parsed": 0, "errors": 0, "dropped": 0}
+
+    def iter(self, corpus, fn):
+        """
+        Yield an Item per profile of the corpus, in corpus order, with item.data
+        = fn(profile) taken from the cache when the file is unchanged. fn is
+        the same module-level function Corpus.iter would take.
+        """
+        for dataset, profiles_dir in corpus.sources.items():
+            if os.path.isdir(profiles_dir):
+                yield from self._iter_dataset(corpus, dataset, profiles_dir, fn)
+
+    def _iter_dataset(self, corpus, dataset, profiles_dir, fn):
+        cache = DatasetCache(profiles_dir, self.name, self.version)
+        files = cache.stamps(corpus.slugs)
+        changed = {slug for slug, _, stamp in files if cache.entries.get(slug) != stamp}
+        current = {slug for slug, _, _ in files}
+        self.stats["dropped"] += sum(1 for slug in cache.entries if slug not in current)
+
+        fresh = Corpus.from_files([(dataset, slug, path) for slug, path, _ in files if slug in changed],
+                                  workers=corpus.workers, chunk_size=corpus.chunk_size).iter(fn)
+        cached = cache.cached_rows()
+        entries = {}
+
+        os.makedirs(cache.dir, exist_ok=True)
+        tmp_rows = cache.rows_file + ".tmp"
+        try:
+            with open(tmp_rows, "w", encoding="utf-8") as out:
+                for slug, path, stamp in files:
+                    item, raw = None, None
+                    if slug in changed:
+                        item = next(fresh)
+                    else:
+                        # The rows file is in the same order: skip forward to this slug
+                        for cached_slug, cached_raw in cached:
+                            if cached_slug == slug:
+                                raw = cached_raw
+                                item = Item(dataset, slug, path, loads(raw), None)
+                                self.stats["reused"] += 1
+                                break
+                    if item is None:
+                        # In the index but missing from the rows file: read it here
+                        item = decode_chunk([(dataset, slug, path)], fn)[0]
+                    if item.error is not None:
+                        self.stats["errors"] += 1
+                    else:
+                        if raw is None:
+                            raw = json.dumps(item.data, ensure_ascii=False)
+                            self.stats["parsed"] += 1
+                        out.write(f"{slug}\t{raw}\n")
+                        entries[slug] = stamp
+                    yield item
+        except BaseException:
+            # The export stopped early (or failed): keep the previous cache
+            os.remove(tmp_rows)
+            raise
+        finally:
+            cached.close()
+            fresh.close()
+
+        tmp_index = cache.index_file + ".tmp"
+        with open(tmp_index, "w", encoding="utf-8") as f:
+            json.dump({"version": self.version, "entries": entries}, f)
+        os.replace(tmp_rows, cache.rows_file)
+        os.replace(tmp_index, cache.index_file)
+
+    def replay(self, corpus):
+        """
+        Yield the cached rows of the corpus again, without looking at the
+        profiles (for a second pass right after iter() has refreshed the cache).
+        """
+        for dataset, profiles_dir in corpus.sources.items():
+            if not os.path.isdir(profiles_dir):
+                continue
+            cache = DatasetCache(profiles_dir, self.name, self.version)
+            for slug, raw in cache.cached_rows():
+                if corpus.slugs is None or slug in corpus.slugs:
+                    yield Item(dataset, slug, os.path.join(profiles_dir, f"{slug}.json"), loads(raw), None)
+
+    def summary(self):
+        s = self.stats
+        return (f"{s['reused']} rows from cache, {s['parsed']} profiles parsed, "
+                f"{s['errors']} errors, {s['dropped']} deleted profiles dropped")
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Incremental export cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="Cached exports per dataset")
+    sub.add_parser("clear", help="Delete every export cache")
+    args = parser.parse_args()
+
+    for dataset, profiles_dir in dataset_sources().items():
+        cache_dir = os.path.join(os.path.dirname(profiles_dir), CACHE_DIRNAME)
+        if not os.path.isdir(cache_dir):
+            print(f"  [{dataset}] no export cache")
+            continue
+        if args.command == "clear":
+            shutil.rmtree(cache_dir)
+            print(f"  [{dataset}] removed {cache_dir}")
+            continue
+        for name in sorted(os.listdir(cache_dir)):
+            if name.endswith(".index.json"):
+                with open(os.path.join(cache_dir, name), "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                rows = os.path.join(cache_dir, name.replace(".index.json", ".rows.jsonl"))
+                size = os.path.getsize(rows) / 2**20 if os.path.exists(rows) else 0
+                print(f"  [{dataset}] {name[:-11]:<12} version {index.get('version')}: "
+                      f"{len(index.get('entries', {}))} rows, {size:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
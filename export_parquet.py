@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Normalized Parquet Export
+=======================================
+Columnar export of every dataset, instead of pipe-joined cells
+(generate_csv.py, the All Profiles sheet) or hundreds of exploded columns
+(generate_saas_csv.py, the category sheets). One investors table and one
+child table per array, all keyed by (dataset, slug):
+
+    investors.parquet        one row per profile: basicInfo, investingProfile,
+                             socials, profile_url, scraped_at
+    investments.parquet      one row per investment (idx = position in the
+                             profile), co_investors as a list column
+    experience.parquet       one row per experience entry
+    sector_rankings.parquet  one row per sector ranking (rank = position)
+
+Repetitive strings (dataset, location, stage, company, sector name/url, ...)
+are dictionary-encoded columns, so readers get them back as categoricals.
+Rows are streamed from profile_corpus.py and flushed as one Parquet row
+group per ROW_GROUP_ROWS rows, so memory stays flat and readers can skip
+row groups and columns:
+
+    pq.read_table("parquet/investments.parquet", columns=["slug", "stage"])
+
+Requires pyarrow (pip install pyarrow).
+
+Run:
+    python export_parquet.py                         # all datasets -> parquet/
+    python export_parquet.py --only Fintech SaaS --out /tmp/parquet
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    print("\n  Install pyarrow for the Parquet export:\n\n   pip install pyarrow\n")
+    sys.exit(1)
+
+from profile_corpus import WORKERS, Corpus
+
+# =============================================================================
+# CONFIG
+# =============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BASE_DIR, "parquet")
+ROW_GROUP_ROWS = 64 * 1024     # rows buffered per table before a row group is written
+COMPRESSION = "zstd"
+
+CAT = pa.dictionary(pa.int32(), pa.string())    # dictionary-encoded string column
+
+SCHEMAS = {
+    "investors": pa.schema([
+        ("dataset", CAT),
+        ("slug", pa.string()),
+        ("name", pa.string()),
+        ("location", CAT),
+        ("signal_score", pa.int64()),
+        ("investor_types", pa.list_(CAT)),
+        ("position_and_firm", pa.string()),
+        ("current_position", CAT),
+        ("current_firm", CAT),
+        ("current_firm_url", CAT),
+        ("investment_range", CAT),
+        ("sweet_spot", CAT),
+        ("fund_size", CAT),
+        ("investments_on_record", pa.int64()),
+        ("website", pa.string()),
+        ("linkedin", pa.string()),
+        ("twitter", pa.string()),
+        ("angellist", pa.string()),
+        ("crunchbase", pa.string()),
+        ("social_website", pa.string()),
+        ("profile_url", pa.string()),
+        ("profile_picture", pa.string()),
+        ("scraped_at", pa.timestamp("us")),
+    ]),
+    "investments": pa.schema([
+        ("dataset", CAT),
+        ("slug", pa.string()),
+        ("idx", pa.int32()),
+        ("company", CAT),
+        ("stage", CAT),
+        ("date", CAT),
+        ("round_size", CAT),
+        ("total_raised", CAT),
+        ("co_investors", pa.list_(CAT)),
+    ]),
+    "experience": pa.schema([
+        ("dataset", CAT),
+        ("slug", pa.string()),
+        ("idx", pa.int32()),
+        ("company", CAT),
+        ("position", CAT),
+        ("dates", pa.string()),
+    ]),
+    "sector_rankings": pa.schema([
+        ("dataset", CAT),
+        ("slug", pa.string()),
+        ("rank", pa.int32()),
+        ("name", CAT),
+        ("url", CAT),
+    ]),
+}
+
+
+def _int(value):
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _str(value):
+    return value if isinstance(value, str) else None
+
+
+def _timestamp(value):
+    try:
+        return datetime.fromisoformat(value) if isinstance(value, str) else None
+    except ValueError:
+        return None
+
+
+def normalize_profile(data):
+    """
+    Rows of every table for one profile, without the (dataset, slug) key
+    (runs in the corpus workers). Returns {table: [row tuple, ...]}.
+    """
+    basic = data.get("basicInfo") or {}
+    investing = data.get("investingProfile") or {}
+    socials = data.get("socials") or {}
+    cp = investing.get("currentPosition")
+    if isinstance(cp, dict):
+        position, firm, firm_url = _str(cp.get("position")), _str(cp.get("firm")), _str(cp.get("firmUrl"))
+    else:
+        position, firm, firm_url = _str(cp), None, None
+    types = basic.get("investorTypes")
+
+    investor = (
+        _str(basic.get("name")), _str(basic.get("location")), _int(basic.get("signalScore")),
+        [t for t in types if isinstance(t, str)] if isinstance(types, list) else [],
+        _str(basic.get("positionAndFirm")), position, firm, firm_url,
+        _str(investing.get("investmentRange")), _str(investing.get("sweetSpot")),
+        _str(investing.get("fundSize")), _int(investing.get("investmentsOnRecord")),
+        _str(basic.get("website")), _str(socials.get("linkedin")), _str(socials.get("twitter")),
+        _str(socials.get("angellist")), _str(socials.get("crunchbase")), _str(socials.get("website")),
+        _str(data.get("profileUrl")), _str(data.get("profilePicture")), _timestamp(data.get("scraped_at")),
+    )
+
+    investments = []
+    for i, v in enumerate(data.get("investments") or []):
+        if isinstance(v, dict):
+            co = v.get("coInvestors")
+            investments.append((i, _str(v.get("company")), _str(v.get("stage")), _str(v.get("date")),
+                                _str(v.get("roundSize")), _str(v.get("totalRaised")),
+                                [c for c in co if isinstance(c, str)] if isinstance(co, list) else []))
+    experience = [(i, _str(e.get("company")), _str(e.get("position") or e.get("title")), _str(e.get("dates")))
+                  for i, e in enumerate(data.get("experience") or []) if isinstance(e, dict)]
+    sectors = [(i, _str(s.get("name")), _str(s.get("url")))
+               for i, s in enumerate(data.get("sectorRankings") or []) if isinstance(s, dict)]
+    return {"investors": [investor], "investments": investments,
+            "experience": experience, "sector_rankings": sectors}
+
+
+class TableSink:
+    """Buffers rows of one table and writes them out a row group at a time."""
+
+    def __init__(self, path, schema, row_group_rows=ROW_GROUP_ROWS, compression=COMPRESSION):
+        self.path = path
+        self.schema = schema
+        self.row_group_rows = row_group_rows
+        self.tmp = path + ".tmp"
+        self.writer = pq.ParquetWriter(self.tmp, schema, compression=compression)
+        self.rows = []
+        self.written = 0
+        self.row_groups = 0
+
+    def append(self, dataset, slug, row):
+        self.rows.append((dataset, slug) + row)
+        if len(self.rows) >= self.row_group_rows:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        columns = list(zip(*self.rows))
+        arrays = [pa.array(col, type=field.type) for col, field in zip(columns, self.schema)]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema),
+                                row_group_size=self.row_group_rows)
+        self.written += len(self.rows)
+        self.row_groups += 1
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+        os.replace(self.tmp, self.path)
+
+
+def export(corpus, out_dir=OUTPUT_DIR, row_group_rows=ROW_GROUP_ROWS, compression=COMPRESSION):
+    """Stream the corpus into one Parquet file per table. Returns {table: TableSink}."""
+    os.makedirs(out_dir, exist_ok=True)
+    sinks = {name: TableSink(os.path.join(out_dir, f"{name}.parquet"), schema, row_group_rows, compression)
+             for name, schema in SCHEMAS.items()}
+    errors = 0
+    for item in corpus.iter(normalize_profile):
+        if item.error:
+            print(f"  Skipping {item.dataset}/{item.slug}: {item.error}")
+            errors += 1
+            continue
+        for name, rows in item.data.items():
+            sink = sinks[name]
+            for row in rows:
+                sink.append(item.dataset, item.slug, row)
+    for sink in sinks.values():
+        sink.close()
+    return sinks, errors
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Normalized Parquet export of all profiles")
+    parser.add_argument("--only", nargs="+", metavar="DATASET", help="Only these datasets (e.g. Fintech SaaS)")
+    parser.add_argument("--out", default=OUTPUT_DIR, help=f"Output directory (default: {OUTPUT_DIR})")
+    parser.add_argument("--row-group-rows", type=int, default=ROW_GROUP_ROWS, help="Rows per Parquet row group")
+    parser.add_argument("--compression", default=COMPRESSION, help="Parquet codec (zstd, snappy, none)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Decoder processes (default: all cores)")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    corpus = Corpus(only=args.only, workers=args.workers)
+    print(f"  Exporting {len(corpus)} profiles to {args.out}")
+    sinks, errors = export(corpus, args.out, args.row_group_rows, args.compression)
+    for name, sink in sinks.items():
+        size = os.path.getsize(sink.path) / 2**20
+        print(f"  {name + '.parquet':<24} {sink.written:>8} rows  {sink.row_groups:>3} row groups  {size:6.1f} MiB")
+    print(f"  {corpus.summary()}; {errors} skipped; {time.monotonic() - started:.1f}s total")
+
+
+if __name__ == "__main__":
+    main()
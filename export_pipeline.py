@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Single-Scan Export Pipeline
+=========================================
+Runs the exports in one pass over the corpus, instead of generate_csv.py,
+generate_master_excel.py, quality_analysis.py and export_parquet.py each
+walking and parsing the same profile directories:
+
+    profile_corpus workers         main thread           sink threads
+    read + decode + per-sink   ->  fan out       ->  [queue] csv      -> <dataset>/all_investors.csv
+    payloads (flatten_profile,     every parsed      [queue] excel    -> all_investors_master.xlsx
+    profile_rows, ...)             profile           [queue] quality  -> quality_report.json
+                                                     [queue] parquet  -> parquet/*.parquet
+                                                     [queue] summary  -> export_summary.json
+
+- every profile file is read and decoded once; the per-sink work that
+  only needs the profile (the exporters' own flatten functions) runs in
+  the corpus workers, so only the sinks' rows come back
+- each sink drains its own bounded queue (QUEUE_SIZE batches of BATCH_SIZE
+  profiles) in its own thread; a slow sink (openpyxl) slows the scan down
+  instead of growing memory, and never holds up the other sinks' queues
+  beyond that
+- the Excel sink measures the sheets while the scan runs and spools its
+  rows to a temp file per dataset, then writes the workbook exactly as
+  generate_master_excel.py does
+- a sink that fails stops writing but keeps draining, so the others finish;
+  the run then exits non-zero
+
+The pipeline does not use the export cache (export_cache.py): one scan
+feeds every sink, which is what the separate exporters need the cache for.
+
+Excel needs openpyxl and Parquet needs pyarrow. Without --sinks, a sink
+whose dependency is missing is skipped with a note.
+
+Run:
+    python export_pipeline.py                            # every sink, every dataset
+    python export_pipeline.py --sinks csv quality summary
+    python export_pipeline.py --only Fintech SaaS --out /tmp/exports
+"""
+
+import argparse
+import csv
+import functools
+import importlib
+import importlib.util
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from profile_corpus import WORKERS, Corpus, Item, loads
+
+# =============================================================================
+# CONFIG
+# =============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+QUALITY_FILE = os.path.join(BASE_DIR, "quality_report.json")
+SUMMARY_FILE = os.path.join(BASE_DIR, "export_summary.json")
+QUEUE_SIZE = 16        # batches waiting per sink before the scan blocks
+BATCH_SIZE = 64        # profiles per queued batch
+
+# sink name -> (module, per-profile function run in the corpus workers)
+PAYLOADS = {
+    "csv":     ("generate_csv", "flatten_profile"),
+    "excel":   ("generate_master_excel", "profile_rows"),
+    "quality": ("quality_analysis", "analyze_profile"),
+    "parquet": ("export_parquet", "normalize_profile"),
+    "summary": ("export_pipeline", "summary_fields"),
+}
+SINKS = list(PAYLOADS)
+DEPENDENCIES = {"excel": "openpyxl", "parquet": "pyarrow"}
+
+_STOP = object()
+
+
+def summary_fields(data):
+    return data.get("scraped_at") or None
+
+
+def build_payloads(data, sinks):
+    """
+    Worker: {sink: (payload, error)} of one decoded profile, for the enabled
+    sinks. A function that raises only costs its own sink the profile.
+    """
+    payloads = {}
+    for name in sinks:
+        module, fn = PAYLOADS[name]
+        try:
+            payloads[name] = (getattr(importlib.import_module(module), fn)(data), None)
+        except Exception as e:
+            payloads[name] = (None, f"{type(e).__name__}: {e}")
+    return payloads
+
+
+# =============================================================================
+# SINKS
+# =============================================================================
+class Sink:
+    """One export fed from its own bounded queue by a dedicated thread."""
+
+    name = None
+
+    def __init__(self, out_dir=None, queue_size=QUEUE_SIZE):
+        self.out_dir = out_dir
+        self.queue_size = queue_size
+        self.outputs = []
+        self.error = None
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name=f"sink-{self.name}", daemon=True)
+        self.stats = {"profiles": 0, "skipped": 0, "seconds": 0.0, "max_depth": 0, "full_waits": 0}
+
+    def start(self):
+        self._thread.start()
+
+    def put(self, batch):
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            self.stats["full_waits"] += 1
+            self._queue.put(batch)
+        self.stats["max_depth"] = max(self.stats["max_depth"], self._queue.qsize())
+
+    def close(self):
+        """Queue the end of the scan; join() waits for the outputs."""
+        self.put(_STOP)
+
+    def join(self):
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if self.error is not None:
+                # Failed earlier: keep draining so the scan is never blocked on this sink
+                if batch is _STOP:
+                    return
+                continue
+            started = time.monotonic()
+            try:
+                if batch is _STOP:
+                    self.finish()
+                else:
+                    for item in batch:
+                        if item.error is None:
+                            self.consume(item)
+                            self.stats["profiles"] += 1
+                        else:
+                            self.skip(item)
+                            self.stats["skipped"] += 1
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                self.abort()
+            finally:
+                self.stats["seconds"] += time.monotonic() - started
+            if batch is _STOP:
+                return
+
+    # -- per sink --------------------------------------------------------------
+    def consume(self, item):
+        """One parsed profile; item.data is this sink's payload."""
+        raise NotImplementedError
+
+    def skip(self, item):
+        """A profile that could not be read, decoded or flattened (item.error)."""
+
+    def finish(self):
+        """Write the outputs after the last profile."""
+
+    def abort(self):
+        """Release what the sink holds after a failure."""
+
+    def path(self, default, name):
+        return default if self.out_dir is None else os.path.join(self.out_dir, name)
+
+    def summary(self):
+        s = self.stats
+        state = f"FAILED ({self.error})" if self.error else f"{s['profiles']} profiles"
+        return (f"{state}, {s['seconds']:.1f}s busy | queue max {s['max_depth']}/{self.queue_size}, "
+                f"{s['full_waits']} full")
+
+
+class CsvSink(Sink):
+    """generate_csv.py's flat CSV, one file per dataset."""
+
+    name = "csv"
+
+    def __init__(self, datasets, **kwargs):
+        super().__init__(**kwargs)
+        from generate_csv import COLUMNS
+        self.columns = COLUMNS
+        self.datasets = datasets
+        self.dataset = None
+        self.file = None
+        self.writer = None
+
+    def _open(self, dataset):
+        self._close_file()
+        path = self.path(os.path.join(self.datasets[dataset], "all_investors.csv"),
+                         f"{dataset.lower()}_investors.csv")
+        self.dataset = dataset
+        self.file = open(path + ".tmp", "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.columns, extrasaction="ignore")
+        self.writer.writeheader()
+        self.outputs.append(path)
+
+    def _close_file(self):
+        if self.file is not None:
+            self.file.close()
+            os.replace(self.file.name, self.outputs[-1])
+            self.file = None
+
+    def consume(self, item):
+        if item.dataset != self.dataset:
+            self._open(item.dataset)
+        self.writer.writerow(item.data)
+
+    def finish(self):
+        self._close_file()
+
+    def abort(self):
+        if self.file is not None:
+            self.file.close()
+            os.remove(self.file.name)
+            self.file = None
+
+
+class ExcelSink(Sink):
+    """generate_master_excel.py's workbook: sheets measured during the scan, written at the end."""
+
+    name = "excel"
+
+    def __init__(self, datasets, **kwargs):
+        super().__init__(**kwargs)
+        import generate_master_excel as g
+        self.g = g
+        self.plans = {name: g.SheetPlan(name, profiles_dir, urls_file)
+                      for name, profiles_dir, urls_file in g.SOURCES if name in datasets}
+        self.spools = {name: tempfile.TemporaryFile("w+", encoding="utf-8") for name in self.plans}
+        self.all_widths = {}
+        self.all_sampled = 0
+
+    def consume(self, item):
+        plan = self.plans.get(item.dataset)
+        if plan is None:
+            return
+        # measure() adds matched_url/source to the rows: spool the payload first
+        self.spools[item.dataset].write(f"{item.slug}\t{json.dumps(item.data, ensure_ascii=False)}\n")
+        self.all_sampled = plan.measure(item, self.all_widths, self.all_sampled)
+
+    def _spooled(self, plan):
+        spool = self.spools[plan.sheet_name]
+        spool.seek(0)
+        for line in spool:
+            slug, _, raw = line.rstrip("\n").partition("\t")
+            yield Item(plan.sheet_name, slug, None, loads(raw), None)
+
+    def finish(self):
+        from openpyxl import Workbook
+        output = self.path(self.g.OUTPUT_FILE, os.path.basename(self.g.OUTPUT_FILE))
+        for plan in self.plans.values():
+            plan.report()
+        wb = Workbook(write_only=True)
+        self.g.write_sources(wb, list(self.plans.values()), self.all_widths, self._spooled)
+        wb.save(output)
+        self.outputs.append(output)
+        self.abort()
+
+    def abort(self):
+        for spool in self.spools.values():
+            spool.close()
+
+
+class QualitySink(Sink):
+    """quality_analysis.py's tiers and field coverage per dataset, as JSON."""
+
+    name = "quality"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        from quality_analysis import classify_profile
+        self.classify = classify_profile
+        self.report = {}
+
+    def _dataset(self, dataset):
+        if dataset not in self.report:
+            self.report[dataset] = {"profiles": 0, "malformed": [], "tiers": Counter(),
+                                    "coverage": Counter(), "garbage": []}
+        return self.report[dataset]
+
+    def consume(self, item):
+        report = self._dataset(item.dataset)
+        fields = item.data
+        tier = self.classify(fields)
+        report["profiles"] += 1
+        report["tiers"][tier] += 1
+        if tier == "garbage":
+            report["garbage"].append(item.slug)
+        for key, present in fields.items():
+            if key != "name_value" and present:
+                report["coverage"][key] += 1
+
+    def skip(self, item):
+        self._dataset(item.dataset)["malformed"].append([item.slug, item.error])
+
+    def finish(self):
+        output = self.path(QUALITY_FILE, os.path.basename(QUALITY_FILE))
+        for dataset, report in self.report.items():
+            tiers = report["tiers"]
+            report["tiers"] = {tier: tiers[tier] for tier in ["complete", "good", "minimal", "garbage"]}
+            report["coverage"] = dict(sorted(report["coverage"].items()))
+            print(f"  [{dataset}] {report['profiles']} profiles: "
+                  + ", ".join(f"{count} {tier}" for tier, count in report["tiers"].items())
+                  + f", {len(report['malformed'])} malformed")
+        with open(output + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.report, f, indent=2, ensure_ascii=False)
+        os.replace(output + ".tmp", output)
+        self.outputs.append(output)
+
+
+class ParquetSink(Sink):
+    """export_parquet.py's normalized tables."""
+
+    name = "parquet"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        from export_parquet import OUTPUT_DIR, SCHEMAS, TableSink
+        out = self.path(OUTPUT_DIR, "parquet")
+        os.makedirs(out, exist_ok=True)
+        self.tables = {name: TableSink(os.path.join(out, f"{name}.parquet"), schema)
+                       for name, schema in SCHEMAS.items()}
+
+    def consume(self, item):
+        for name, rows in item.data.items():
+            table = self.tables[name]
+            for row in rows:
+                table.append(item.dataset, item.slug, row)
+
+    def finish(self):
+        for table in self.tables.values():
+            table.close()
+            self.outputs.append(table.path)
+
+    def abort(self):
+        for table in self.tables.values():
+            table.writer.close()
+            if os.path.exists(table.tmp):
+                os.remove(table.tmp)
+
+
+class SummarySink(Sink):
+    """
+    export_summary.json: profiles, errors and scraped_at range per dataset,
+    plus what every other sink wrote. Waits for the other sinks to finish.
+    """
+
+    name = "summary"
+
+    def __init__(self, corpus, others, **kwargs):
+        super().__init__(**kwargs)
+        self.corpus = corpus
+        self.others = others
+        self.started = time.monotonic()
+        self.datasets = {}
+
+    def _dataset(self, dataset):
+        if dataset not in self.datasets:
+            self.datasets[dataset] = {"profiles": 0, "errors": 0, "first_scraped": None, "last_scraped": None}
+        return self.datasets[dataset]
+
+    def consume(self, item):
+        d = self._dataset(item.dataset)
+        d["profiles"] += 1
+        scraped = item.data
+        if isinstance(scraped, str):
+            if d["first_scraped"] is None or scraped < d["first_scraped"]:
+                d["first_scraped"] = scraped
+            if d["last_scraped"] is None or scraped > d["last_scraped"]:
+                d["last_scraped"] = scraped
+
+    def skip(self, item):
+        self._dataset(item.dataset)["errors"] += 1
+
+    def finish(self):
+        for sink in self.others:
+            sink.join()
+        output = self.path(SUMMARY_FILE, os.path.basename(SUMMARY_FILE))
+        summary = {
+            "datasets": self.datasets,
+            "corpus": self.corpus.summary(),
+            "sinks": {sink.name: {"outputs": sink.outputs, "error": sink.error,
+                                  "seconds": round(sink.stats["seconds"], 2)} for sink in self.others},
+            "seconds": round(time.monotonic() - self.started, 2),
+        }
+        with open(output + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        os.replace(output + ".tmp", output)
+        self.outputs.append(output)
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+def make_sinks(names, corpus, out_dir, queue_size):
+    from profile_manifest import DATASETS
+    kwargs = {"out_dir": out_dir, "queue_size": queue_size}
+    sinks = []
+    for name in names:
+        if name == "csv":
+            sinks.append(CsvSink(DATASETS, **kwargs))
+        elif name == "excel":
+            sinks.append(ExcelSink(corpus.sources, **kwargs))
+        elif name == "quality":
+            sinks.append(QualitySink(**kwargs))
+        elif name == "parquet":
+            sinks.append(ParquetSink(**kwargs))
+        elif name == "summary":
+            sinks.append(SummarySink(corpus, list(sinks), **kwargs))
+    return sinks
+
+
+def run(corpus, sinks, batch_size=BATCH_SIZE):
+    """Scan the corpus once, fanning each parsed profile out to every sink. Returns scan errors."""
+    fn = functools.partial(build_payloads, sinks=tuple(sink.name for sink in sinks))
+    for sink in sinks:
+        sink.start()
+
+    def flush(batch):
+        for sink in sinks:
+            sink.put([item if item.error else item._replace(data=item.data[sink.name][0],
+                                                             error=item.data[sink.name][1])
+                      for item in batch])
+
+    errors = 0
+    batch = []
+    try:
+        for item in corpus.iter(fn):
+            if item.error:
+                print(f"  Skipping {item.dataset}/{item.slug}: {item.error}")
+                errors += 1
+            batch.append(item)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        for sink in sinks:
+            sink.close()
+        for sink in sinks:
+            sink.join()
+    return errors
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Export every format in one pass over the profiles")
+    parser.add_argument("--sinks", nargs="+", choices=SINKS, help="Sinks to run (default: all available)")
+    parser.add_argument("--only", nargs="+", metavar="DATASET", help="Only these datasets (e.g. Fintech SaaS)")
+    parser.add_argument("--out", help="Write every output into this directory instead of next to the data")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Decoder processes (default: all cores)")
+    parser.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="Batches queued per sink")
+    args = parser.parse_args()
+
+    names = []
+    for name in args.sinks or SINKS:
+        module = DEPENDENCIES.get(name)
+        if module and importlib.util.find_spec(module) is None:
+            if args.sinks:
+                print(f"\n  Install {module} for the {name} sink:\n\n   pip install {module}\n")
+                sys.exit(1)
+            print(f"  Skipping the {name} sink: {module} is not installed")
+            continue
+        names.append(name)
+    # The summary sink reports on the others, so it always goes last
+    names.sort(key=lambda name: name == "summary")
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+    started = time.monotonic()
+    corpus = Corpus(only=args.only, workers=args.workers)
+    print(f"  Exporting {len(corpus)} profiles to: {', '.join(names)}")
+    sinks = make_sinks(names, corpus, args.out, args.queue_size)
+    errors = run(corpus, sinks)
+
+    print()
+    for sink in sinks:
+        print(f"  {sink.name:<8} {sink.summary()}")
+        for path in sink.outputs:
+            print(f"           -> {path}")
+    print(f"  {corpus.summary()}; {errors} skipped; {time.monotonic() - started:.1f}s total")
+    if any(sink.error for sink in sinks):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Failure Ledger
+============================
+One entry per failing slug instead of a list that grows by one item per
+failed attempt and is rewritten in full after every batch:
+
+    slug -> {"slug", "url", "attempts", "error", "error_class",
+             "first_failed", "last_failed", "next_eligible"}
+
+Storage follows progress_log.py: failed_profiles.json is the snapshot and
+failed_profiles.wal.jsonl an append-only log of changes, one line per
+failure or recovery. Every COMPACT_EVERY records the log is rotated and a
+background thread folds it into the snapshot; close() writes a final one
+in place. The snapshot keeps the old {"failed": [{"slug", "url",
+"error", "timestamp", ...}]} shape, so older readers still work, and its
+size is bounded by the number of distinct failing slugs.
+
+A failed slug is not eligible for another attempt until next_eligible:
+BACKOFF_BASE seconds after the first failure, doubling with every attempt
+up to BACKOFF_MAX. Scrapers retry eligible() slugs and call clear() when a
+profile is finally saved.
+
+Usage:
+    ledger = FailureLedger(FAILED_FILE)
+    ledger.fail(slug, url, error)
+    ledger.clear(slug)
+    for entry in ledger.eligible(): ...
+    ledger.close()
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+COMPACT_EVERY = 500     # log records between snapshots
+BACKOFF_BASE = 60       # seconds before a slug that failed once is retried
+BACKOFF_MAX = 6 * 3600  # cap on the retry delay
+
+
+def classify_error(error):
+    """Coarse error class for grouping and backoff decisions."""
+    error_lower = (error or "").lower()
+    if error_lower.startswith("cloudflare") or "just a moment" in error_lower:
+        return "cloudflare"
+    if error_lower.startswith(("garbage name", "invalid")):
+        return "garbage"
+    if "timeout" in error_lower or "never appeared" in error_lower:
+        return "timeout"
+    if error_lower.startswith("save failed"):
+        return "save"
+    if error_lower.startswith("no data"):
+        return "no_data"
+    return "error"
+
+
+class FailureLedger:
+    """Failing slugs of one dataset with attempt counts and retry times."""
+
+    def __init__(self, failed_file, compact_every=COMPACT_EVERY,
+                 backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.snapshot_file = failed_file
+        self.path = os.path.splitext(failed_file)[0] + ".wal.jsonl"
+        self.rotated_path = os.path.splitext(failed_file)[0] + ".wal.old.jsonl"
+        self.compact_every = compact_every
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.entries = {}
+        self._lock = threading.Lock()
+        self._records = 0
+        self._fd = None
+        self._compactor = None
+        self.stats = {"failures": 0, "cleared": 0, "compactions": 0}
+        self._replay()
+
+    # -- replay ----------------------------------------------------------------
+    def _apply(self, rec):
+        if rec.get("st") == "ok":
+            self.entries.pop(rec["slug"], None)
+        else:
+            self.entries[rec["slug"]] = rec["e"]
+
+    def _replay(self):
+        if os.path.exists(self.snapshot_file):
+            try:
+                with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                data = {}
+            for item in data.get("failed", []):
+                # Old-format files list a slug once per attempt; fold them
+                slug = item.get("slug")
+                if not slug:
+                    continue
+                old = self.entries.get(slug)
+                ts = item.get("last_failed") or item.get("timestamp") or datetime.now().isoformat()
+                self.entries[slug] = {
+                    "slug": slug,
+                    "url": item.get("url", ""),
+                    "attempts": item.get("attempts", 1) + (old["attempts"] if old else 0),
+                    "error": item.get("error", ""),
+                    "error_class": item.get("error_class") or classify_error(item.get("error")),
+                    "first_failed": old["first_failed"] if old else item.get("first_failed", ts),
+                    "last_failed": ts,
+                    "timestamp": ts,
+                    "next_eligible": item.get("next_eligible", 0),
+                }
+        for path in (self.rotated_path, self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue   # torn line from a hard kill
+                    self._apply(rec)
+                    if path == self.path:
+                        self._records += 1
+
+    # -- recording -------------------------------------------------------------
+    def _append(self, rec):
+        line = (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._apply(rec)
+            os.write(self._fd, line)
+            self._records += 1
+            due = self._records >= self.compact_every
+        if due:
+            self.compact(background=True)
+
+    def fail(self, slug, url, error):
+        """Record a failed attempt. Returns the updated entry."""
+        now = datetime.now().isoformat()
+        error = str(error or "")[:200]
+        old = self.entries.get(slug)
+        attempts = (old["attempts"] if old else 0) + 1
+        delay = min(self.backoff_base * 2 ** (attempts - 1), self.backoff_max)
+        entry = {
+            "slug": slug,
+            "url": url,
+            "attempts": attempts,
+            "error": error,
+            "error_class": classify_error(error),
+            "first_failed": old["first_failed"] if old else now,
+            "last_failed": now,
+            "timestamp": now,
+            "next_eligible": time.time() + delay,
+        }
+        self._append({"slug": slug, "st": "fail", "e": entry})
+        self.stats["failures"] += 1
+        return entry
+
+    def clear(self, slug):
+        """Forget a slug once its profile has been saved."""
+        if slug in self.entries:
+            self._append({"slug": slug, "st": "ok"})
+            self.stats["cleared"] += 1
+
+    # -- queries ---------------------------------------------------------------
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, slug):
+        return slug in self.entries
+
+    def slugs(self):
+        with self._lock:
+            return set(self.entries)
+
+    def eligible(self, now=None, ignore_backoff=False):
+        """Entries whose backoff has expired, fewest attempts first."""
+        now = time.time() if now is None else now
+        with self._lock:
+            ready = [e for e in self.entries.values() if ignore_backoff or e["next_eligible"] <= now]
+        return sorted(ready, key=lambda e: (e["attempts"], e["slug"]))
+
+    def by_class(self):
+        """{error_class: count}."""
+        counts = {}
+        for e in self.entries.values():
+            counts[e["error_class"]] = counts.get(e["error_class"], 0) + 1
+        return counts
+
+    # -- compaction ------------------------------------------------------------
+    def compact(self, background=False):
+        """Rotate the log and fold everything so far into failed_profiles.json."""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            if os.path.exists(self.path):
+                if os.path.exists(self.rotated_path):
+                    # A previous compaction died before finishing; keep its records
+                    with open(self.rotated_path, "ab") as old, open(self.path, "rb") as live:
+                        old.write(b"\n" + live.read())   # newline seals a torn last line
+                    os.remove(self.path)
+                else:
+                    os.replace(self.path, self.rotated_path)
+            self._records = 0
+            failed = sorted(self.entries.values(), key=lambda e: e["slug"])
+
+        def work():
+            tmp = self.snapshot_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({
+                    "format": "ledger",
+                    "total_failed": len(failed),
+                    "failed": failed,
+                    "compacted_at": datetime.now().isoformat(),
+                }, f, ensure_ascii=False)
+            os.replace(tmp, self.snapshot_file)
+            if os.path.exists(self.rotated_path):
+                os.remove(self.rotated_path)
+            self.stats["compactions"] += 1
+
+        # The scrapers record failures from the event loop: only the rotation
+        # above happens inline, the snapshot is written off it
+        if background:
+            self._compactor = threading.Thread(target=work, name="ledger-compactor", daemon=True)
+            self._compactor.start()
+        else:
+            work()
+
+    def close(self):
+        """Wait for background compaction and write a final snapshot."""
+        if self._compactor is not None:
+            self._compactor.join()
+        self.compact()
+
+    def summary(self):
+        classes = ", ".join(f"{n} {c}" for c, n in sorted(self.by_class().items())) or "none"
+        return (f"{len(self.entries)} failing ({classes}), {self.stats['failures']} failures recorded, "
+                f"{self.stats['cleared']} recovered")
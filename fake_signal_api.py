@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Local Stand-in GraphQL Server
+===========================================
+A tiny offline stand-in for signal-api.nfx.com/graphql, for exercising the
+GraphQL tools without touching the real site.
+
+Answers the aliased investorProfiles query sent by graphql_profiles.py with
+deterministic synthetic people built from the slug. Slugs starting with
+"missing-" come back as null, like an unknown investor.
+
+Also answers the vclInvestors list query used by the URL collectors: every
+list slug has LIST_SIZE synthetic investors, paginated with opaque cursors.
+
+Run:
+    python fake_signal_api.py --port 8765
+    python graphql_profiles.py --data-dir /tmp/t --graphql-url http://127.0.0.1:8765/graphql \\
+        --slugs jane-doe john-roe missing-person
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PERSON_ALIAS_RE = re.compile(r"(\w+)\s*:\s*person\(\s*slug\s*:\s*\$(\w+)\s*\)")
+PAGE_SIZE_RE = re.compile(r"scored_investors\(\s*first\s*:\s*(\d+)")
+
+LIST_SIZE = 230
+THROTTLE_EVERY = 0    # answer every Nth request with 429 + Retry-After (0 = never)
+
+SECTORS = [
+    ("Fintech (Seed)", "top-fintech-seed-investors"),
+    ("SaaS (Seed)", "top-saas-seed-investors"),
+    ("Enterprise (Seed)", "top-enterprise-seed-investors"),
+    ("Marketplaces (Seed)", "top-marketplaces-seed-investors"),
+]
+STAGES = ["Pre Seed", "Seed", "Series A"]
+
+
+# =============================================================================
+# SYNTHETIC DATA
+# =============================================================================
+def _seed(slug):
+    return int(hashlib.md5(slug.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def fake_person(slug):
+    """Build a deterministic person object for a slug (None for missing-*)."""
+    if slug.startswith("missing-"):
+        return None
+    n = _seed(slug)
+    words = [w for w in slug.split("_")[0].split("-") if w]
+    first, last = (words[0].title(), " ".join(w.title() for w in words[1:]) or "Investor") if words else ("X", "Y")
+    firm_name = f"{last} Capital"
+    firm_slug = f"{last.lower().replace(' ', '-')}-capital"
+    return {
+        "id": str(n),
+        "slug": slug,
+        "name": f"{first} {last}",
+        "first_name": first,
+        "last_name": last,
+        "avatar_url": f"https://example.invalid/avatars/{slug}.png",
+        "website_url": f"https://{firm_slug}.example/",
+        "linkedin_url": f"https://www.linkedin.com/in/{slug}",
+        "twitter_url": f"https://twitter.com/{slug.replace('-', '')}" if n % 2 else None,
+        "angellist_url": None,
+        "crunchbase_url": f"https://www.crunchbase.com/person/{slug}" if n % 3 else None,
+        "location": {"display_name": ["San Francisco, California", "New York, New York", "London, United Kingdom"][n % 3]},
+        "investor_profile": {
+            "signal_score": n % 1000,
+            "investor_types": ["Investor", "VC"] if n % 2 else ["Angel"],
+            "position": ["Partner", "Principal", "Managing Partner"][n % 3],
+            "firm": {"name": firm_name, "slug": firm_slug},
+            "min_investment": 250_000,
+            "max_investment": 2_000_000 + (n % 5) * 500_000,
+            "target_investment": 1_000_000,
+            "fund_size": 50_000_000 + (n % 10) * 10_000_000,
+            "investments_on_record": n % 40,
+            "investor_lists": [{"name": name, "slug": s} for name, s in SECTORS[: 1 + n % len(SECTORS)]],
+            "investments": [
+                {
+                    "company": {"name": f"Company {i + 1}"},
+                    "stage": STAGES[(n + i) % len(STAGES)],
+                    "date": f"Jan {2015 + i}",
+                    "round_size": 3_000_000 if i % 2 else None,
+                    "total_raised": 10_000_000 + i * 1_000_000,
+                    "coinvestor_names": [f"Co Investor {j + 1}" for j in range(i % 3)],
+                }
+                for i in range(n % 6)
+            ],
+        },
+        "positions": [
+            {"title": "Partner", "company": {"name": firm_name}, "start_date": "2019", "end_date": None},
+            {"title": "Founder", "company": {"name": f"{first} Labs"}, "start_date": "2012", "end_date": "2018"},
+        ],
+    }
+
+
+def list_slugs(list_slug):
+    prefix = list_slug.replace("-seed", "")
+    return [f"{prefix}-investor-{i:04d}" for i in range(LIST_SIZE)]
+
+
+def encode_cursor(offset):
+    return base64.b64encode(f"offset:{offset}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Offset for a cursor, or None if it is not one of ours."""
+    try:
+        kind, _, value = base64.b64decode(cursor.encode()).decode().partition(":")
+        return int(value) if kind == "offset" else None
+    except Exception:
+        return None
+
+
+def scored_investors_page(list_slug, after, first):
+    slugs = list_slugs(list_slug)
+    start = 0
+    if after:
+        start = decode_cursor(after)
+        if start is None:
+            return None
+    page = slugs[start:start + first]
+    end = start + len(page)
+    return {
+        "id": list_slug,
+        "slug": list_slug,
+        "investor_count": len(slugs),
+        "scored_investors": {
+            "pageInfo": {
+                "hasNextPage": end < len(slugs),
+                "hasPreviousPage": start > 0,
+                "endCursor": encode_cursor(end) if page else None,
+            },
+            "record_count": len(slugs),
+            "edges": [
+                {"node": {
+                    "id": f"{list_slug}:{slug}",
+                    "person": fake_person(slug),
+                    "position": fake_person(slug)["investor_profile"]["position"],
+                    "firm": fake_person(slug)["investor_profile"]["firm"],
+                }}
+                for slug in page
+            ],
+        },
+    }
+
+
+# =============================================================================
+# GRAPHQL HANDLING
+# =============================================================================
+def execute(payload):
+    """Resolve the subset of the Signal schema the GraphQL tools use."""
+    query = payload.get("query") or ""
+    variables = payload.get("variables") or {}
+
+    aliases = PERSON_ALIAS_RE.findall(query)
+    if aliases:
+        return {"data": {alias: fake_person(variables.get(var, "")) for alias, var in aliases}}
+
+    if payload.get("operationName") == "vclInvestors" or "scored_investors" in query:
+        m = PAGE_SIZE_RE.search(query)
+        lst = scored_investors_page(variables.get("slug", ""), variables.get("after"), int(m.group(1)) if m else 8)
+        if lst is None:
+            return {"data": {"list": None}, "errors": [{"message": "invalid cursor", "path": ["list"]}]}
+        return {"data": {"list": lst}}
+
+    return {"errors": [{"message": "stand-in server: unsupported query"}]}
+
+
+class Handler(BaseHTTPRequestHandler):
+    # Keep-alive, like the real endpoint
+    protocol_version = "HTTP/1.1"
+    requests_seen = 0
+    _count_lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length)
+        with Handler._count_lock:
+            Handler.requests_seen += 1
+            seen = Handler.requests_seen
+        if THROTTLE_EVERY and seen % THROTTLE_EVERY == 0:
+            self.send_response(429)
+            self.send_header("Retry-After", "1")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        try:
+            payload = json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            self.send_error(400, "invalid JSON")
+            return
+        body = json.dumps(execute(payload)).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def serve(port=0):
+    """Start the stand-in on a background thread. Returns (server, graphql_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/graphql"
+
+
+def main():
+    global LIST_SIZE, THROTTLE_EVERY
+    parser = argparse.ArgumentParser(description="Local stand-in for the NFX Signal GraphQL API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--list-size", type=int, default=LIST_SIZE, help="Investors per list")
+    parser.add_argument("--throttle-every", type=int, default=0,
+                        help="Answer every Nth request with 429 + Retry-After: 1")
+    args = parser.parse_args()
+
+    LIST_SIZE = args.list_size
+    THROTTLE_EVERY = args.throttle_every
+
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), Handler)
+    print(f"Stand-in Signal API on http://127.0.0.1:{args.port}/graphql (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
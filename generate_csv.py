@@ -5,12 +5,14 @@ Flattens nested structures into consistent columns.
 """
 
 import csv
-import json
 import os
-import sys
+
+from export_cache import ExportCache
+from profile_corpus import Corpus
 
 PROFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "profiles")
 OUTPUT_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "all_investors.csv")
+CACHE_VERSION = 1      # bump when flatten_profile() output changes
 
 # CSV columns in order
 COLUMNS = [
@@ -132,31 +134,32 @@ def flatten_profile(data):
 
 
 def main():
-    files = sorted(f for f in os.listdir(PROFILES_DIR) if f.endswith(".json"))
-    print(f"Processing {len(files)} profiles...")
+    corpus = Corpus.from_profiles_dir(PROFILES_DIR)
+    cache = ExportCache("csv", CACHE_VERSION)
+    print(f"Processing {len(corpus)} profiles...")
 
-    rows = []
+    rows = 0
+    first = None
     errors = []
 
-    for fname in files:
-        filepath = os.path.join(PROFILES_DIR, fname)
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            row = flatten_profile(data)
-            rows.append(row)
-        except Exception as e:
-            errors.append((fname, str(e)))
-
-    # Write CSV
+    # Rows come from the export cache; only new or changed profiles are
+    # flattened (in the corpus workers). Either way they go straight to the CSV
     with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=COLUMNS, extrasaction="ignore")
         writer.writeheader()
-        writer.writerows(rows)
+        for item in cache.iter(corpus, flatten_profile):
+            if item.error:
+                errors.append((os.path.basename(item.path), item.error))
+                continue
+            writer.writerow(item.data)
+            rows += 1
+            if first is None:
+                first = item.data
 
     print(f"CSV written: {OUTPUT_CSV}")
-    print(f"Total rows: {len(rows)}")
+    print(f"Total rows: {rows}")
     print(f"Columns: {len(COLUMNS)}")
+    print(f"Export cache: {cache.summary()}")
 
     if errors:
         print(f"\nErrors ({len(errors)}):")
@@ -167,8 +170,8 @@ def main():
 
     # Quick sanity check
     print(f"\nSample row (first):")
-    if rows:
-        r = rows[0]
+    if first:
+        r = first
         for col in COLUMNS:
             val = str(r.get(col, ""))
             print(f"  {col}: {val[:80]}{'...' if len(val) > 80 else ''}")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Generate lite investor CSVs (name, position, firm) straight from the URL
+collectors' all_investor_lite.json files — no profile scrape needed.
+
+  <dataset>/investors_lite.csv   – one per dataset that has lite records
+  all_investors_lite.csv         – every dataset combined, with a source column
+
+The "scraped" column says whether a full profile JSON already exists for the
+slug, so consumers can tell which rows will get richer data later.
+
+Run:
+    python generate_lite_csv.py
+    python generate_lite_csv.py --only Fintech SaaS
+"""
+
+import argparse
+import csv
+import os
+
+from url_journal import load_records
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_CSV = os.path.join(BASE_DIR, "all_investors_lite.csv")
+
+# Data sources: (source_name, dataset_dir)
+SOURCES = [
+    ("General",    os.path.join(BASE_DIR, "data")),
+    ("Enterprise", os.path.join(BASE_DIR, "data-enterprise-seed")),
+    ("Fintech",    os.path.join(BASE_DIR, "data-fintech-seed")),
+    ("SaaS",       os.path.join(BASE_DIR, "data-saas")),
+]
+
+COLUMNS = [
+    "slug",
+    "profile_url",
+    "name",
+    "first_name",
+    "last_name",
+    "position",
+    "firm",
+    "firm_url",
+    "scraped",
+]
+
+
+def load_lite_records(dataset_dir):
+    """Read <dataset>/all_investor_lite.json plus its journal, or [] if the collector hasn't written one."""
+    lite_file = os.path.join(dataset_dir, "all_investor_lite.json")
+    return list(load_records(lite_file).values())
+
+
+def lite_row(record, profiles_dir):
+    """Flatten one lite record into a CSV row."""
+    slug = record.get("slug", "")
+    firm_slug = record.get("firm_slug")
+    return {
+        "slug": slug,
+        "profile_url": record.get("url", ""),
+        "name": record.get("name") or "",
+        "first_name": record.get("first_name") or "",
+        "last_name": record.get("last_name") or "",
+        "position": record.get("position") or "",
+        "firm": record.get("firm") or "",
+        "firm_url": f"https://signal.nfx.com/firms/{firm_slug}" if firm_slug else "",
+        "scraped": "yes" if os.path.exists(os.path.join(profiles_dir, f"{slug}.json")) else "no",
+    }
+
+
+def write_csv(path, rows, columns):
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lite investor CSVs from collector records")
+    parser.add_argument("--only", nargs="+", metavar="SOURCE",
+                        help="Only these sources (e.g. Fintech SaaS)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("  Lite CSV Generator — NFX Signal Investor Lists")
+    print("=" * 60)
+
+    all_rows = []
+    for source, dataset_dir in SOURCES:
+        if args.only and source not in args.only:
+            continue
+        records = load_lite_records(dataset_dir)
+        if not records:
+            print(f"  [{source}] no all_investor_lite.json — run the URL collector first")
+            continue
+
+        profiles_dir = os.path.join(dataset_dir, "profiles")
+        rows = [lite_row(r, profiles_dir) for r in records]
+        out = os.path.join(dataset_dir, "investors_lite.csv")
+        write_csv(out, rows, COLUMNS)
+        scraped = sum(1 for r in rows if r["scraped"] == "yes")
+        print(f"  [{source}] {len(rows)} rows ({scraped} already scraped) -> {out}")
+
+        all_rows.extend({"source": source, **r} for r in rows)
+
+    if all_rows:
+        write_csv(OUTPUT_CSV, all_rows, ["source"] + COLUMNS)
+        print(f"\nCombined CSV: {OUTPUT_CSV} ({len(all_rows)} rows)")
+    else:
+        print("\nNo lite records found.")
+
+
+if __name__ == "__main__":
+    main()
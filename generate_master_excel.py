@@ -6,18 +6,31 @@ Generate a master Excel file with 5 tabs:
   3. Fintech     – profiles from data-fintech-seed/profiles/
   4. SaaS        – profiles from data-saas/profiles/
   5. All Profiles – every profile from all 4 sources combined
+
+The workbook is streamed: a first pass brings the export cache
+(export_cache.py) up to date, parsing only new or changed profiles, and
+measures the rows (row counts, longest experience/investment/sector arrays,
+column widths from the first SAMPLE_ROWS rows); the second pass streams the
+cached rows straight to write-only worksheets, the category sheet and
+"All Profiles" side by side. No profile is kept after its rows are written.
 """
 
-import json
-import glob
 import os
-import sys
+import time
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
+from export_cache import ExportCache
+from profile_corpus import Corpus
+from url_journal import load_url_list
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 OUTPUT_FILE = os.path.join(BASE_DIR, "all_investors_master.xlsx")
+SAMPLE_ROWS = 100      # rows per sheet used to size the columns
+CACHE_VERSION = 1      # bump when profile_rows() output changes
+MAX_WIDTH = 50
 
 # Data sources: (sheet_name, profiles_dir, urls_file_or_None)
 SOURCES = [
@@ -48,22 +61,10 @@ ALL_HEADERS = [
 
 
 def load_url_map(urls_file):
-    """Load slug -> url mapping from all_investor_urls.json."""
-    if not urls_file or not os.path.exists(urls_file):
+    """Load slug -> url mapping from all_investor_urls.json plus its journal."""
+    if not urls_file:
         return {}
-    with open(urls_file, "r", encoding="utf-8") as f:
-        url_list = json.load(f)
-    return {item["slug"]: item["url"] for item in url_list}
-
-
-def parse_profile(filepath):
-    """Read and return a profile JSON, or None on error."""
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError) as e:
-        print(f"  Skipping {os.path.basename(filepath)}: {e}")
-        return None
+    return {item["slug"]: item["url"] for item in load_url_list(urls_file)}
 
 
 def extract_base_row(data, url_map):
@@ -195,78 +196,30 @@ def extract_all_row(data, source_name):
     }
 
 
-def style_header(ws, num_cols):
-    """Apply styling to the header row."""
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    header_fill = PatternFill(start_color="2F5496", end_color="2F5496", fill_type="solid")
-    thin_border = Border(
-        bottom=Side(style="thin", color="000000"),
-    )
-    for col in range(1, num_cols + 1):
-        cell = ws.cell(row=1, column=col)
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        cell.border = thin_border
+def extract_category_row(data, url_map):
+    """Base row plus the expanded experience/investment/sector columns."""
+    row = extract_base_row(data, url_map)
+    for i, e in enumerate(data.get("experience", []), 1):
+        row[f"experience_{i}_company"] = e.get("company", "")
+        row[f"experience_{i}_position"] = e.get("position", "")
+        row[f"experience_{i}_dates"] = e.get("dates", "")
 
+    for i, v in enumerate(data.get("investments", []), 1):
+        row[f"investment_{i}_company"] = v.get("company", "")
+        row[f"investment_{i}_stage"] = v.get("stage", "")
+        row[f"investment_{i}_date"] = v.get("date", "")
+        row[f"investment_{i}_round_size"] = v.get("roundSize", "")
+        row[f"investment_{i}_total_raised"] = v.get("totalRaised", "")
+        co = v.get("coInvestors", [])
+        row[f"investment_{i}_co_investors"] = "; ".join(co) if isinstance(co, list) else str(co)
 
-def auto_width(ws, max_width=50):
-    """Auto-fit column widths based on content (capped)."""
-    for col_idx in range(1, ws.max_column + 1):
-        max_len = 0
-        col_letter = get_column_letter(col_idx)
-        for row in range(1, min(ws.max_row + 1, 102)):  # sample first 100 rows
-            val = ws.cell(row=row, column=col_idx).value
-            if val:
-                max_len = max(max_len, len(str(val)))
-        ws.column_dimensions[col_letter].width = min(max_len + 2, max_width)
+    for i, s in enumerate(data.get("sectorRankings", []), 1):
+        row[f"sector_ranking_{i}_name"] = s.get("name", "")
+        row[f"sector_ranking_{i}_url"] = s.get("url", "")
+    return row
 
 
-def build_category_sheet(wb, sheet_name, profiles_dir, urls_file):
-    """
-    Build one sheet with expanded columns for experience/investments/sectors.
-    Returns list of (data_dict, source_name) for the All Profiles sheet.
-    """
-    if not os.path.isdir(profiles_dir):
-        print(f"  [{sheet_name}] Directory not found: {profiles_dir} — skipping")
-        ws = wb.create_sheet(title=sheet_name)
-        ws.append(["No data found"])
-        return []
-
-    url_map = load_url_map(urls_file)
-    profile_files = sorted(glob.glob(os.path.join(profiles_dir, "*.json")))
-    print(f"  [{sheet_name}] Processing {len(profile_files)} profiles...")
-
-    if not profile_files:
-        ws = wb.create_sheet(title=sheet_name)
-        ws.append(["No profiles found"])
-        return []
-
-    # First pass: collect rows and discover max array sizes
-    rows = []
-    raw_data = []
-    max_exp = 0
-    max_inv = 0
-    max_sec = 0
-
-    for fp in profile_files:
-        data = parse_profile(fp)
-        if data is None:
-            continue
-        raw_data.append(data)
-        row = extract_base_row(data, url_map)
-        exp = data.get("experience", [])
-        inv = data.get("investments", [])
-        sec = data.get("sectorRankings", [])
-        max_exp = max(max_exp, len(exp))
-        max_inv = max(max_inv, len(inv))
-        max_sec = max(max_sec, len(sec))
-        row["_exp"] = exp
-        row["_inv"] = inv
-        row["_sec"] = sec
-        rows.append(row)
-
-    # Build headers
+def category_headers(max_exp, max_inv, max_sec):
     headers = list(BASE_HEADERS)
     for i in range(1, max_exp + 1):
         headers.extend([f"experience_{i}_company", f"experience_{i}_position", f"experience_{i}_dates"])
@@ -275,89 +228,192 @@ def build_category_sheet(wb, sheet_name, profiles_dir, urls_file):
                         f"investment_{i}_round_size", f"investment_{i}_total_raised", f"investment_{i}_co_investors"])
     for i in range(1, max_sec + 1):
         headers.extend([f"sector_ranking_{i}_name", f"sector_ranking_{i}_url"])
+    return headers
+
+
+def measure_widths(widths, row):
+    """Fold one row (dict) into {column: longest value}."""
+    for key, val in row.items():
+        if val:
+            widths[key] = max(widths.get(key, 0), len(str(val)))
+
+
+class SheetPlan:
+    """What the pre-pass learns about one source: its corpus, row count, array sizes, widths."""
+
+    def __init__(self, sheet_name, profiles_dir, urls_file):
+        self.sheet_name = sheet_name
+        self.profiles_dir = profiles_dir
+        self.url_map = load_url_map(urls_file)
+        self.corpus = Corpus(sources={sheet_name: profiles_dir})
+        self.rows = 0
+        self.max_exp = self.max_inv = self.max_sec = 0
+        self.widths = {}
+
+    @property
+    def headers(self):
+        return category_headers(self.max_exp, self.max_inv, self.max_sec)
+
+    def measure(self, item, all_widths, all_sampled):
+        """Fold one profile_rows() item into the plan. Returns rows sampled for All Profiles so far."""
+        n_exp, n_inv, n_sec = item.data["shape"]
+        self.rows += 1
+        self.max_exp = max(self.max_exp, n_exp)
+        self.max_inv = max(self.max_inv, n_inv)
+        self.max_sec = max(self.max_sec, n_sec)
+        if self.rows <= SAMPLE_ROWS or all_sampled < SAMPLE_ROWS:
+            row, all_row = source_rows(self, item)
+            if self.rows <= SAMPLE_ROWS:
+                measure_widths(self.widths, row)
+            if all_sampled < SAMPLE_ROWS:
+                measure_widths(all_widths, all_row)
+                all_sampled += 1
+        return all_sampled
+
+    def report(self):
+        print(f"  [{self.sheet_name}] {self.rows} profiles, up to {self.max_exp} experience / "
+              f"{self.max_inv} investments / {self.max_sec} sectors")
+
+
+def profile_rows(data):
+    """
+    Cached per-profile result (runs in the corpus workers): array sizes, the
+    category row without matched_url and the All Profiles row without source,
+    so the cache does not depend on the URL files or sheet names.
+    """
+    return {
+        "shape": [len(data.get("experience", [])), len(data.get("investments", [])),
+                  len(data.get("sectorRankings", []))],
+        "category": extract_category_row(data, {}),
+        "all": extract_all_row(data, ""),
+    }
 
-    # Create sheet and write
-    ws = wb.create_sheet(title=sheet_name)
-    ws.append(headers)
-
-    for row in rows:
-        exp = row.pop("_exp")
-        inv = row.pop("_inv")
-        sec = row.pop("_sec")
-
-        for i, e in enumerate(exp, 1):
-            row[f"experience_{i}_company"] = e.get("company", "")
-            row[f"experience_{i}_position"] = e.get("position", "")
-            row[f"experience_{i}_dates"] = e.get("dates", "")
-
-        for i, v in enumerate(inv, 1):
-            row[f"investment_{i}_company"] = v.get("company", "")
-            row[f"investment_{i}_stage"] = v.get("stage", "")
-            row[f"investment_{i}_date"] = v.get("date", "")
-            row[f"investment_{i}_round_size"] = v.get("roundSize", "")
-            row[f"investment_{i}_total_raised"] = v.get("totalRaised", "")
-            co = v.get("coInvestors", [])
-            row[f"investment_{i}_co_investors"] = "; ".join(co) if isinstance(co, list) else str(co)
-
-        for i, s in enumerate(sec, 1):
-            row[f"sector_ranking_{i}_name"] = s.get("name", "")
-            row[f"sector_ranking_{i}_url"] = s.get("url", "")
-
-        ws.append([row.get(h, "") for h in headers])
-
-    style_header(ws, len(headers))
-    auto_width(ws)
-    ws.freeze_panes = "A2"
-    ws.auto_filter.ref = ws.dimensions
 
-    print(f"  [{sheet_name}] {len(rows)} rows, {len(headers)} columns")
-    return raw_data
+def source_rows(plan, item):
+    """(category row, All Profiles row) of a cached profile_rows() result."""
+    row = item.data["category"]
+    row["matched_url"] = plan.url_map.get(row["slug"], "")
+    all_row = item.data["all"]
+    all_row["source"] = plan.sheet_name
+    return row, all_row
 
 
-def build_all_sheet(wb, all_data):
-    """Build the combined 'All Profiles' sheet."""
-    ws = wb.create_sheet(title="All Profiles")
-    ws.append(ALL_HEADERS)
+def plan_source(sheet_name, profiles_dir, urls_file, all_widths, all_sampled, cache):
+    """
+    Pre-pass over one source. Brings the export cache up to date (only new
+    or changed profiles are parsed) and keeps only counts, array sizes and
+    the widths of the first SAMPLE_ROWS rows (also for the All Profiles
+    sheet, which starts with the first source's rows).
+    Returns (plan, rows sampled for All Profiles so far).
+    """
+    plan = SheetPlan(sheet_name, profiles_dir, urls_file)
+    if not os.path.isdir(profiles_dir):
+        print(f"  [{sheet_name}] Directory not found: {profiles_dir} — skipping")
+        return plan, all_sampled
+
+    for item in cache.iter(plan.corpus, profile_rows):
+        if item.error:
+            print(f"  Skipping {os.path.basename(item.path)}: {item.error}")
+            continue
+        all_sampled = plan.measure(item, all_widths, all_sampled)
+
+    plan.report()
+    return plan, all_sampled
+
+
+def header_cells(ws, headers):
+    """Styled header row for a write-only sheet."""
+    header_font = Font(bold=True, color="FFFFFF", size=11)
+    header_fill = PatternFill(start_color="2F5496", end_color="2F5496", fill_type="solid")
+    alignment = Alignment(horizontal="center", vertical="center")
+    thin_border = Border(
+        bottom=Side(style="thin", color="000000"),
+    )
+    cells = []
+    for h in headers:
+        cell = WriteOnlyCell(ws, value=h)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = alignment
+        cell.border = thin_border
+        cells.append(cell)
+    return cells
 
-    for source_name, data_list in all_data:
-        for data in data_list:
-            row = extract_all_row(data, source_name)
-            ws.append([row.get(h, "") for h in ALL_HEADERS])
 
-    style_header(ws, len(ALL_HEADERS))
-    auto_width(ws)
+def open_sheet(wb, title, headers, widths, rows):
+    """Create a write-only sheet with widths, frozen header and filter set up front."""
+    ws = wb.create_sheet(title=title)
+    for col_idx, h in enumerate(headers, 1):
+        width = max(len(h), widths.get(h, 0))
+        ws.column_dimensions[get_column_letter(col_idx)].width = min(width + 2, MAX_WIDTH)
     ws.freeze_panes = "A2"
-    ws.auto_filter.ref = ws.dimensions
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}{rows + 1}"
+    ws.append(header_cells(ws, headers))
+    return ws
 
-    total = sum(len(d) for _, d in all_data)
-    print(f"  [All Profiles] {total} rows, {len(ALL_HEADERS)} columns")
+
+def write_sources(wb, plans, all_widths, rows_for):
+    """
+    Second pass: create every sheet up front (the pre-pass knows all headers),
+    then stream the profile_rows() items of rows_for(plan) into each category
+    sheet and All Profiles. Returns the number of All Profiles rows.
+    """
+    sheets = []
+    for plan in plans:
+        if len(plan.corpus):
+            sheets.append(open_sheet(wb, plan.sheet_name, plan.headers, plan.widths, plan.rows))
+        else:
+            ws = wb.create_sheet(title=plan.sheet_name)
+            ws.append(["No profiles found" if os.path.isdir(plan.profiles_dir) else "No data found"])
+            sheets.append(None)
+    total = sum(plan.rows for plan in plans)
+    ws_all = open_sheet(wb, "All Profiles", ALL_HEADERS, all_widths, total)
+
+    written = 0
+    for plan, ws in zip(plans, sheets):
+        if ws is None:
+            continue
+        headers = plan.headers
+        rows = 0
+        for item in rows_for(plan):
+            row, all_row = source_rows(plan, item)
+            ws.append([row.get(h, "") for h in headers])
+            ws_all.append([all_row.get(h, "") for h in ALL_HEADERS])
+            rows += 1
+        written += rows
+        print(f"  [{plan.sheet_name}] {rows} rows, {len(headers)} columns")
+    print(f"  [All Profiles] {written} rows, {len(ALL_HEADERS)} columns")
+    return written
 
 
 def main():
     print("=" * 60)
     print("  Master Excel Generator — NFX Signal Investor Profiles")
     print("=" * 60)
+    started = time.monotonic()
 
-    wb = Workbook()
-    # Remove the default sheet
-    wb.remove(wb.active)
-
-    all_data = []
-
+    # Pass 1: refresh the export cache and measure every source without keeping any profile
+    cache = ExportCache("excel", CACHE_VERSION)
+    plans = []
+    all_widths = {}
+    all_sampled = 0
     for sheet_name, profiles_dir, urls_file in SOURCES:
-        raw = build_category_sheet(wb, sheet_name, profiles_dir, urls_file)
-        all_data.append((sheet_name, raw))
+        plan, all_sampled = plan_source(sheet_name, profiles_dir, urls_file, all_widths, all_sampled, cache)
+        plans.append(plan)
+    print(f"  Export cache: {cache.summary()}")
 
+    # Pass 2: stream rows into write-only sheets
     print()
-    build_all_sheet(wb, all_data)
+    wb = Workbook(write_only=True)
+    total = write_sources(wb, plans, all_widths, lambda plan: cache.replay(plan.corpus))
 
     print(f"\nSaving to {OUTPUT_FILE} ...")
     wb.save(OUTPUT_FILE)
 
-    total = sum(len(d) for _, d in all_data)
     print(f"\nDone! File saved: {OUTPUT_FILE}")
     print(f"Total profiles across all sheets: {total}")
-    print(f"Sheets: {[ws.title for ws in wb.worksheets]}")
+    print(f"Sheets: {[plan.sheet_name for plan in plans] + ['All Profiles']}")
+    print(f"Time: {time.monotonic() - started:.1f}s")
 
 
 if __name__ == "__main__":
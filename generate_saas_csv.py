@@ -5,158 +5,148 @@ Each profile becomes one row. Nested/list fields are flattened into columns.
 URLs from all_investor_urls.json are matched by slug.
 """
 
-import json
 import csv
-import glob
 import os
 
+from profile_corpus import Corpus
+from profile_model import Profile, StringPool
+from url_journal import load_url_list
+
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PROFILES_DIR = os.path.join(BASE_DIR, "data-saas", "profiles")
 URLS_FILE = os.path.join(BASE_DIR, "data-saas", "all_investor_urls.json")
 OUTPUT_CSV = os.path.join(BASE_DIR, "data-saas", "saas_investors.csv")
 
-# Load URL mapping (slug -> url)
-with open(URLS_FILE) as f:
-    url_list = json.load(f)
-url_map = {item["slug"]: item["url"] for item in url_list}
-
-# Collect all rows first to discover max counts for list fields
-rows = []
-max_investments = 0
-max_experience = 0
-max_sector_rankings = 0
-max_investor_types = 0
-
-profile_files = sorted(glob.glob(os.path.join(PROFILES_DIR, "*.json")))
-print(f"Processing {len(profile_files)} profiles...")
-
-for filepath in profile_files:
-    with open(filepath) as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            print(f"  Skipping invalid JSON: {filepath}")
-            continue
-
-    slug = data.get("slug", os.path.splitext(os.path.basename(filepath))[0])
 
-    # Basic info
-    basic = data.get("basicInfo", {})
-    investor_types = basic.get("investorTypes", [])
-    max_investor_types = max(max_investor_types, len(investor_types))
+# Strings of the profiles built in this process (a worker's, or the main one with one CPU)
+_pool = StringPool()
 
-    # Investing profile
-    investing = data.get("investingProfile", {}) or {}
-    current_pos = investing.get("currentPosition", {})
-    if not isinstance(current_pos, dict):
-        current_pos = {}
 
-    # Experience
-    experience = data.get("experience", [])
-    max_experience = max(max_experience, len(experience))
+def compact_profile(data):
+    """Profile model of one profile JSON (runs in the corpus workers)."""
+    return Profile.from_dict(data, _pool)
 
-    # Investments
-    investments = data.get("investments", [])
-    max_investments = max(max_investments, len(investments))
 
-    # Sector rankings
-    sectors = data.get("sectorRankings", [])
-    max_sector_rankings = max(max_sector_rankings, len(sectors))
-
-    # Socials
-    socials = data.get("socials", {}) or {}
-
-    row = {
-        "slug": slug,
-        "matched_url": url_map.get(slug, ""),
-        "profile_url": data.get("profileUrl", ""),
-        "profile_picture": data.get("profilePicture", ""),
-        "scraped_at": data.get("scraped_at", ""),
+def profile_row(profile):
+    """Flat row of one profile, without the expanded list columns."""
+    return {
+        "slug": profile.slug,
+        "profile_url": profile.get("profile_url"),
+        "profile_picture": profile.get("profile_picture"),
+        "scraped_at": profile.get("scraped_at"),
         # Basic info
-        "name": basic.get("name", ""),
-        "location": basic.get("location", ""),
-        "signal_score": basic.get("signalScore", ""),
-        "position_and_firm": basic.get("positionAndFirm", ""),
-        "website": basic.get("website", ""),
-        "investor_types": "; ".join(investor_types),
+        "name": profile.get("name"),
+        "location": profile.get("location"),
+        "signal_score": profile.get("signal_score"),
+        "position_and_firm": profile.get("position_and_firm"),
+        "website": profile.get("website"),
+        "investor_types": "; ".join(profile.investor_types),
         # Investing profile
-        "current_firm": current_pos.get("firm", ""),
-        "current_firm_url": current_pos.get("firmUrl", ""),
-        "current_position": current_pos.get("position", ""),
-        "investment_range": investing.get("investmentRange", ""),
-        "sweet_spot": investing.get("sweetSpot", ""),
-        "fund_size": investing.get("fundSize", ""),
-        "investments_on_record": investing.get("investmentsOnRecord", ""),
+        "current_firm": profile.current_firm,
+        "current_firm_url": profile.current_firm_url,
+        "current_position": profile.current_position,
+        "investment_range": profile.get("investment_range"),
+        "sweet_spot": profile.get("sweet_spot"),
+        "fund_size": profile.get("fund_size"),
+        "investments_on_record": profile.get("investments_on_record"),
         # Socials
-        "linkedin": socials.get("linkedin", ""),
-        "twitter": socials.get("twitter", ""),
-        "angellist": socials.get("angellist", ""),
-        "crunchbase": socials.get("crunchbase", ""),
-        "social_website": socials.get("website", ""),
-        # Lists stored for later expansion
-        "_experience": experience,
-        "_investments": investments,
-        "_sectors": sectors,
+        "linkedin": profile.get("linkedin"),
+        "twitter": profile.get("twitter"),
+        "angellist": profile.get("angellist"),
+        "crunchbase": profile.get("crunchbase"),
+        "social_website": profile.get("social_website"),
     }
-    rows.append(row)
-
-print(f"Max experience entries: {max_experience}")
-print(f"Max investment entries: {max_investments}")
-print(f"Max sector rankings: {max_sector_rankings}")
-
-# Build CSV headers
-headers = [
-    "slug", "matched_url", "profile_url", "profile_picture", "scraped_at",
-    "name", "location", "signal_score", "position_and_firm", "website", "investor_types",
-    "current_firm", "current_firm_url", "current_position",
-    "investment_range", "sweet_spot", "fund_size", "investments_on_record",
-    "linkedin", "twitter", "angellist", "crunchbase", "social_website",
-]
-
-# Experience columns
-for i in range(1, max_experience + 1):
-    headers.extend([f"experience_{i}_company", f"experience_{i}_position", f"experience_{i}_dates"])
-
-# Investment columns
-for i in range(1, max_investments + 1):
-    headers.extend([
-        f"investment_{i}_company", f"investment_{i}_stage", f"investment_{i}_date",
-        f"investment_{i}_round_size", f"investment_{i}_total_raised", f"investment_{i}_co_investors"
-    ])
-
-# Sector ranking columns
-for i in range(1, max_sector_rankings + 1):
-    headers.extend([f"sector_ranking_{i}_name", f"sector_ranking_{i}_url"])
-
-# Write CSV
-with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as csvfile:
-    writer = csv.DictWriter(csvfile, fieldnames=headers, extrasaction="ignore")
-    writer.writeheader()
-
-    for row in rows:
-        # Expand experience
-        for i, exp in enumerate(row.pop("_experience"), 1):
-            row[f"experience_{i}_company"] = exp.get("company", "")
-            row[f"experience_{i}_position"] = exp.get("position", "")
-            row[f"experience_{i}_dates"] = exp.get("dates", "")
-
-        # Expand investments
-        for i, inv in enumerate(row.pop("_investments"), 1):
-            row[f"investment_{i}_company"] = inv.get("company", "")
-            row[f"investment_{i}_stage"] = inv.get("stage", "")
-            row[f"investment_{i}_date"] = inv.get("date", "")
-            row[f"investment_{i}_round_size"] = inv.get("roundSize", "")
-            row[f"investment_{i}_total_raised"] = inv.get("totalRaised", "")
-            co = inv.get("coInvestors", [])
-            row[f"investment_{i}_co_investors"] = "; ".join(co) if isinstance(co, list) else str(co)
-
-        # Expand sector rankings
-        for i, sec in enumerate(row.pop("_sectors"), 1):
-            row[f"sector_ranking_{i}_name"] = sec.get("name", "")
-            row[f"sector_ranking_{i}_url"] = sec.get("url", "")
-
-        writer.writerow(row)
-
-print(f"\nCSV written to: {OUTPUT_CSV}")
-print(f"Total rows: {len(rows)}")
-print(f"Total columns: {len(headers)}")
+
+
+def main():
+    # Load URL mapping (slug -> url), including URLs journaled since the last compaction
+    url_map = {item["slug"]: item["url"] for item in load_url_list(URLS_FILE)}
+
+    # Collect all profiles first to discover max counts for list fields. They are
+    # held as compact Profile objects, built in the workers, not as raw dicts
+    profiles = []
+    max_investments = 0
+    max_experience = 0
+    max_sector_rankings = 0
+
+    corpus = Corpus.from_profiles_dir(PROFILES_DIR)
+    print(f"Processing {len(corpus)} profiles...")
+
+    for item in corpus.iter(compact_profile):
+        if item.error:
+            print(f"  Skipping invalid JSON: {item.path}")
+            continue
+        profile = item.data
+        if profile.get("slug", None) is None:
+            profile.slug = item.slug
+        max_experience = max(max_experience, len(profile.experience))
+        max_investments = max(max_investments, len(profile.investments))
+        max_sector_rankings = max(max_sector_rankings, len(profile.sector_rankings))
+        profiles.append(profile)
+
+    print(f"Max experience entries: {max_experience}")
+    print(f"Max investment entries: {max_investments}")
+    print(f"Max sector rankings: {max_sector_rankings}")
+
+    # Build CSV headers
+    headers = [
+        "slug", "matched_url", "profile_url", "profile_picture", "scraped_at",
+        "name", "location", "signal_score", "position_and_firm", "website", "investor_types",
+        "current_firm", "current_firm_url", "current_position",
+        "investment_range", "sweet_spot", "fund_size", "investments_on_record",
+        "linkedin", "twitter", "angellist", "crunchbase", "social_website",
+    ]
+
+    # Experience columns
+    for i in range(1, max_experience + 1):
+        headers.extend([f"experience_{i}_company", f"experience_{i}_position", f"experience_{i}_dates"])
+
+    # Investment columns
+    for i in range(1, max_investments + 1):
+        headers.extend([
+            f"investment_{i}_company", f"investment_{i}_stage", f"investment_{i}_date",
+            f"investment_{i}_round_size", f"investment_{i}_total_raised", f"investment_{i}_co_investors"
+        ])
+
+    # Sector ranking columns
+    for i in range(1, max_sector_rankings + 1):
+        headers.extend([f"sector_ranking_{i}_name", f"sector_ranking_{i}_url"])
+
+    # Write CSV
+    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=headers, extrasaction="ignore")
+        writer.writeheader()
+
+        for profile in profiles:
+            row = profile_row(profile)
+            row["matched_url"] = url_map.get(profile.slug, "")
+
+            # Expand experience
+            for i, exp in enumerate(profile.experience, 1):
+                row[f"experience_{i}_company"] = exp.company
+                row[f"experience_{i}_position"] = exp.position
+                row[f"experience_{i}_dates"] = exp.dates
+
+            # Expand investments
+            for i, inv in enumerate(profile.investments, 1):
+                row[f"investment_{i}_company"] = inv.company
+                row[f"investment_{i}_stage"] = inv.stage
+                row[f"investment_{i}_date"] = inv.date
+                row[f"investment_{i}_round_size"] = inv.round_size
+                row[f"investment_{i}_total_raised"] = inv.total_raised
+                row[f"investment_{i}_co_investors"] = "; ".join(inv.co_investors)
+
+            # Expand sector rankings
+            for i, sec in enumerate(profile.sector_rankings, 1):
+                row[f"sector_ranking_{i}_name"] = sec.name
+                row[f"sector_ranking_{i}_url"] = sec.url
+
+            writer.writerow(row)
+
+    print(f"\nCSV written to: {OUTPUT_CSV}")
+    print(f"Total rows: {len(profiles)}")
+    print(f"Total columns: {len(headers)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Profile Fetcher via GraphQL API (No Browser)
+==========================================================
+Fetches investor profiles straight from signal-api.nfx.com/graphql instead
+of loading every profile page in Chromium and running SCRAPE_JS.
+Many slugs go into one request as aliased fields (p0: person(slug: $s0) ...).
+Responses are mapped into the same profile JSON that save_profile writes
+(basicInfo, investingProfile, sectorRankings, investments, experience, socials),
+so exporters and analysers read them unchanged.
+
+Run:
+    python graphql_profiles.py --data-dir data-fintech-seed
+    python graphql_profiles.py --data-dir data --slugs boris-bakech nandeet-mehta
+    python graphql_profiles.py --data-dir /tmp/t --graphql-url http://127.0.0.1:8765/graphql
+      (against the local stand-in: python fake_signal_api.py --port 8765)
+"""
+
+import argparse
+import json
+import os
+import sys
+import logging
+import time
+import urllib.request
+import urllib.error
+from datetime import datetime
+
+from failure_ledger import FailureLedger
+from profile_manifest import Manifest
+from profile_writer import record_profile, write_profile
+from progress_log import ProgressLog
+from url_journal import load_url_list
+
+# =============================================================================
+# CONFIG
+# =============================================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+GRAPHQL_URL = "https://signal-api.nfx.com/graphql"
+SLUGS_PER_REQUEST = 25     # aliased person(...) fields per request
+REQUEST_PAUSE = 0.3        # seconds between requests (be polite)
+LOG_FILE = os.path.join(SCRIPT_DIR, "graphql_profiles.log")
+
+SIGNAL_URL = "https://signal.nfx.com"
+
+# Fields requested for every person; mirrors what the profile page renders.
+PROFILE_FRAGMENT = """
+fragment ProfileFields on Person {
+  id
+  slug
+  name
+  first_name
+  last_name
+  avatar_url
+  website_url
+  linkedin_url
+  twitter_url
+  angellist_url
+  crunchbase_url
+  location {
+    display_name
+  }
+  investor_profile {
+    signal_score
+    investor_types
+    position
+    firm {
+      name
+      slug
+    }
+    min_investment
+    max_investment
+    target_investment
+    fund_size
+    investments_on_record
+    investor_lists {
+      name
+      slug
+    }
+    investments {
+      company {
+        name
+      }
+      stage
+      date
+      round_size
+      total_raised
+      coinvestor_names
+    }
+  }
+  positions {
+    title
+    company {
+      name
+    }
+    start_date
+    end_date
+  }
+}
+"""
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Accept": "application/json",
+    "Origin": "https://signal.nfx.com",
+    "Referer": "https://signal.nfx.com/",
+}
+
+# Configured in main(); the collectors import map_person() from this module
+log = logging.getLogger(__name__)
+
+
+# =============================================================================
+# QUERY BUILDING
+# =============================================================================
+def build_profiles_query(slugs):
+    """Build one query with an aliased person(...) field per slug.
+
+    Returns (query, variables, alias_to_slug).
+    """
+    params = []
+    fields = []
+    variables = {}
+    alias_to_slug = {}
+    for i, slug in enumerate(slugs):
+        params.append(f"$s{i}: String!")
+        fields.append(f"  p{i}: person(slug: $s{i}) {{ ...ProfileFields }}")
+        variables[f"s{i}"] = slug
+        alias_to_slug[f"p{i}"] = slug
+    query = (
+        f"query investorProfiles({', '.join(params)}) {{\n"
+        + "\n".join(fields)
+        + "\n}\n"
+        + PROFILE_FRAGMENT
+    )
+    return query, variables, alias_to_slug
+
+
+# =============================================================================
+# RESPONSE MAPPING
+# =============================================================================
+def format_money(amount, decimals=0):
+    """Render a dollar amount the way the profile page does ($500K, $88M, $2.0M with decimals=1)."""
+    if amount is None or amount == "":
+        return None
+    if isinstance(amount, str):
+        return amount
+    if amount >= 1_000_000_000:
+        return f"${amount / 1_000_000_000:.{decimals}f}B"
+    if amount >= 1_000_000:
+        return f"${amount / 1_000_000:.{decimals}f}M"
+    if amount >= 1_000:
+        return f"${amount / 1_000:.0f}K"
+    return f"${amount}"
+
+
+def map_person(person, slug):
+    """Map a GraphQL person object into the profile JSON schema SCRAPE_JS produces."""
+    ip = person.get("investor_profile") or {}
+    firm = ip.get("firm") or {}
+
+    data = {
+        "basicInfo": {},
+        "investingProfile": {},
+        "sectorRankings": [],
+        "investments": [],
+        "experience": [],
+        "socials": {},
+        "profilePicture": person.get("avatar_url"),
+    }
+
+    # === BASIC INFO ===
+    basic = data["basicInfo"]
+    name = person.get("name") or " ".join(
+        p for p in (person.get("first_name"), person.get("last_name")) if p
+    )
+    basic["name"] = name
+    if ip.get("signal_score") is not None:
+        basic["signalScore"] = ip["signal_score"]
+    if ip.get("investor_types"):
+        basic["investorTypes"] = list(ip["investor_types"])
+    if ip.get("position") and firm.get("name"):
+        basic["positionAndFirm"] = f"{ip['position']}, {firm['name']}"
+    if person.get("website_url"):
+        basic["website"] = person["website_url"]
+    location = (person.get("location") or {}).get("display_name")
+    if location:
+        basic["location"] = location
+
+    # === INVESTING PROFILE ===
+    investing = data["investingProfile"]
+    if firm.get("name"):
+        investing["currentPosition"] = {
+            "firm": firm["name"],
+            "firmUrl": f"{SIGNAL_URL}/firms/{firm['slug']}" if firm.get("slug") else None,
+            "position": ip.get("position") or "",
+        }
+    elif ip.get("position"):
+        investing["currentPosition"] = ip["position"]
+    low, high = format_money(ip.get("min_investment"), 1), format_money(ip.get("max_investment"), 1)
+    if low and high:
+        investing["investmentRange"] = f"{low} - {high}"
+    if ip.get("target_investment") is not None:
+        investing["sweetSpot"] = format_money(ip["target_investment"], 1)
+    if ip.get("investments_on_record") is not None:
+        investing["investmentsOnRecord"] = ip["investments_on_record"]
+    if ip.get("fund_size") is not None:
+        investing["fundSize"] = format_money(ip["fund_size"])
+
+    # === SECTOR RANKINGS ===
+    for lst in ip.get("investor_lists") or []:
+        data["sectorRankings"].append({
+            "name": lst.get("name"),
+            "url": f"{SIGNAL_URL}/investor-lists/{lst['slug']}" if lst.get("slug") else None,
+        })
+
+    # === INVESTMENTS ===
+    for inv in ip.get("investments") or []:
+        data["investments"].append({
+            "company": (inv.get("company") or {}).get("name"),
+            "stage": inv.get("stage"),
+            "date": inv.get("date"),
+            "roundSize": format_money(inv.get("round_size")),
+            "totalRaised": format_money(inv.get("total_raised")),
+            "coInvestors": list(inv.get("coinvestor_names") or []),
+        })
+
+    # === EXPERIENCE ===
+    for pos in person.get("positions") or []:
+        start, end = pos.get("start_date"), pos.get("end_date")
+        dates = f"{start or ''} - {end or 'Present'}" if (start or end) else None
+        company = (pos.get("company") or {}).get("name")
+        if company:
+            data["experience"].append({"position": pos.get("title"), "company": company, "dates": dates})
+        else:
+            data["experience"].append({"title": pos.get("title"), "dates": dates})
+
+    # === SOCIAL LINKS ===
+    for key, field in (("linkedin", "linkedin_url"), ("twitter", "twitter_url"),
+                       ("angellist", "angellist_url"), ("crunchbase", "crunchbase_url")):
+        if person.get(field):
+            data["socials"][key] = person[field]
+
+    data["profileUrl"] = f"{SIGNAL_URL}/investors/{slug}"
+    data["scraped_at"] = datetime.now().isoformat()
+    data["slug"] = slug
+    return data
+
+
+def map_list_node(node):
+    """Map one scored_investors edge node into a (possibly partial) profile record.
+
+    The node's own position/firm fill in the current position when the
+    person carries no investor profile. Returns None for nodes without a slug.
+    """
+    person = node.get("person") or {}
+    slug = person.get("slug")
+    if not slug:
+        return None
+    data = map_person(person, slug)
+
+    firm = node.get("firm") or {}
+    position = node.get("position") or ""
+    if firm.get("name") and "currentPosition" not in data["investingProfile"]:
+        data["investingProfile"]["currentPosition"] = {
+            "firm": firm["name"],
+            "firmUrl": f"{SIGNAL_URL}/firms/{firm['slug']}" if firm.get("slug") else None,
+            "position": position,
+        }
+    if position and firm.get("name") and "positionAndFirm" not in data["basicInfo"]:
+        data["basicInfo"]["positionAndFirm"] = f"{position}, {firm['name']}"
+
+    data["source"] = "list"
+    return data
+
+
+def map_lite_record(node):
+    """Reduce one scored_investors edge node to the lite record the collectors keep.
+
+    Uses only the fields the basic list query already returns. Returns None
+    for nodes without a slug.
+    """
+    person = node.get("person") or {}
+    slug = person.get("slug")
+    if not slug:
+        return None
+    firm = node.get("firm") or {}
+    name = person.get("name") or " ".join(
+        p for p in (person.get("first_name"), person.get("last_name")) if p
+    )
+    return {
+        "slug": slug,
+        "url": f"{SIGNAL_URL}/investors/{slug}",
+        "name": name,
+        "first_name": person.get("first_name"),
+        "last_name": person.get("last_name"),
+        "position": node.get("position"),
+        "firm": firm.get("name"),
+        "firm_slug": firm.get("slug"),
+    }
+
+
+# =============================================================================
+# GRAPHQL CLIENT
+# =============================================================================
+def graphql_post(payload, graphql_url=GRAPHQL_URL, retries=5):
+    """POST one GraphQL payload and return parsed JSON."""
+    body = json.dumps(payload).encode("utf-8")
+
+    for attempt in range(retries):
+        try:
+            req = urllib.request.Request(graphql_url, data=body, headers=HEADERS, method="POST")
+            with urllib.request.urlopen(req, timeout=30) as resp:
+                return json.loads(resp.read())
+        except urllib.error.HTTPError as e:
+            log.warning(f"HTTP {e.code} on attempt {attempt+1}: {e.reason}")
+            if e.code == 429:
+                wait = min(60, 5 * (attempt + 1))
+                log.info(f"Rate limited. Waiting {wait}s...")
+                time.sleep(wait)
+            elif e.code >= 500:
+                time.sleep(3 * (attempt + 1))
+            else:
+                raise
+        except (urllib.error.URLError, TimeoutError, OSError) as e:
+            log.warning(f"Network error on attempt {attempt+1}: {e}")
+            time.sleep(5 * (attempt + 1))
+
+    raise RuntimeError(f"Failed after {retries} retries")
+
+
+def fetch_profiles(slugs, graphql_url=GRAPHQL_URL):
+    """Fetch several profiles in one request.
+
+    Returns (profiles, errors): profiles maps slug -> profile dict,
+    errors maps slug -> reason for every slug that came back empty.
+    """
+    query, variables, alias_to_slug = build_profiles_query(slugs)
+    resp = graphql_post({
+        "operationName": "investorProfiles",
+        "variables": variables,
+        "query": query,
+    }, graphql_url=graphql_url)
+
+    data = resp.get("data") or {}
+    profiles = {}
+    errors = {}
+    for alias, slug in alias_to_slug.items():
+        person = data.get(alias)
+        if not person:
+            errors[slug] = "not found"
+            continue
+        profile = map_person(person, slug)
+        if len(profile["basicInfo"].get("name", "").strip()) < 2:
+            errors[slug] = "no valid name"
+            continue
+        profiles[slug] = profile
+
+    for err in resp.get("errors") or []:
+        path = err.get("path") or []
+        if path and path[0] in alias_to_slug:
+            errors[alias_to_slug[path[0]]] = err.get("message", "graphql error")[:200]
+    return profiles, errors
+
+
+# =============================================================================
+# FILE I/O
+# =============================================================================
+def save_profile(profiles_dir, slug, data, manifest=None):
+    try:
+        raw = write_profile(profiles_dir, slug, data)
+    except Exception as e:
+        log.error(f"Save error {slug}: {e}")
+        return False
+    record_profile(manifest, slug, raw, data)
+    return True
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+def run(data_dir, slugs=None, graphql_url=GRAPHQL_URL, batch_size=SLUGS_PER_REQUEST, force=False):
+    profiles_dir = os.path.join(data_dir, "profiles")
+    progress_file = os.path.join(data_dir, "progress.json")
+    failed_file = os.path.join(data_dir, "failed_profiles.json")
+    os.makedirs(profiles_dir, exist_ok=True)
+
+    if slugs is None:
+        slugs = [inv["slug"] for inv in load_url_list(os.path.join(data_dir, "all_investor_urls.json"))]
+
+    progress = ProgressLog(progress_file)
+    ledger = FailureLedger(failed_file)
+    # Saved profiles are recorded in the dataset manifest, built by a full scan the first time
+    manifest = Manifest(data_dir)
+    if not manifest.exists:
+        manifest.refresh()
+    if force:
+        to_fetch = list(slugs)
+    else:
+        on_disk = manifest.slugs()
+        to_fetch = [s for s in slugs if s not in progress.scraped and s not in on_disk]
+
+    log.info("=" * 60)
+    log.info("  NFX SIGNAL - GRAPHQL PROFILE FETCHER")
+    log.info(f"  Data dir:     {data_dir}")
+    log.info(f"  Endpoint:     {graphql_url}")
+    log.info(f"  To fetch:     {len(to_fetch)}")
+    log.info(f"  Per request:  {batch_size}")
+    log.info("=" * 60)
+
+    ok = 0
+    failed = []
+    started = time.monotonic()
+
+    for i in range(0, len(to_fetch), batch_size):
+        batch = to_fetch[i:i + batch_size]
+        try:
+            profiles, errors = fetch_profiles(batch, graphql_url=graphql_url)
+        except Exception as e:
+            log.error(f"  Request failed for {len(batch)} slugs: {e}")
+            profiles, errors = {}, {s: str(e)[:200] for s in batch}
+
+        saved = set()
+        for slug, data in profiles.items():
+            if save_profile(profiles_dir, slug, data, manifest):
+                progress.done(slug)
+                ledger.clear(slug)
+                saved.add(slug)
+            else:
+                errors[slug] = "save failed"
+        # A partial GraphQL error on an aliased field can name a slug whose
+        # profile came back anyway; once saved, it is not a failure
+        errors = {slug: error for slug, error in errors.items() if slug not in saved}
+        ok += len(saved)
+        for slug, error in errors.items():
+            log.warning(f"  FAIL {slug}: {error[:60]}")
+            progress.fail(slug, error)
+            failed.append(ledger.fail(slug, f"{SIGNAL_URL}/investors/{slug}", error))
+
+        log.info(f"  Batch {i // batch_size + 1} | +{len(saved)} ok, {len(errors)} failed | "
+                 f"{i + len(batch)}/{len(to_fetch)}")
+        time.sleep(REQUEST_PAUSE)
+
+    progress.close()
+    ledger.close()
+    manifest.close()
+
+    elapsed = time.monotonic() - started
+    per_profile = elapsed / len(to_fetch) * 1000 if to_fetch else 0
+
+    log.info("")
+    log.info("=" * 60)
+    log.info("  GRAPHQL FETCH COMPLETE")
+    log.info(f"  Fetched:       {ok}")
+    log.info(f"  Failed:        {len(failed)}")
+    log.info(f"  Wall time:     {elapsed:.1f}s ({per_profile:.0f} ms/profile)")
+    log.info(f"  Saved to:      {profiles_dir}")
+    log.info("=" * 60)
+    return ok, failed
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler(LOG_FILE, encoding="utf-8"),
+            logging.StreamHandler(),
+        ],
+    )
+
+    parser = argparse.ArgumentParser(description="NFX Signal - GraphQL profile fetcher (no browser)")
+    parser.add_argument("--data-dir", default=os.path.join(SCRIPT_DIR, "data"),
+                        help="Dataset dir holding all_investor_urls.json and profiles/")
+    parser.add_argument("--slugs", nargs="+", help="Only fetch these slugs")
+    parser.add_argument("--graphql-url", default=GRAPHQL_URL, help="GraphQL endpoint")
+    parser.add_argument("--batch", type=int, default=SLUGS_PER_REQUEST,
+                        help=f"Slugs per request (default: {SLUGS_PER_REQUEST})")
+    parser.add_argument("--force", action="store_true", help="Re-fetch profiles that already exist")
+    args = parser.parse_args()
+
+    try:
+        run(args.data_dir, slugs=args.slugs, graphql_url=args.graphql_url,
+            batch_size=args.batch, force=args.force)
+    except KeyboardInterrupt:
+        log.info("\nStopped by user. Progress saved.")
+    except Exception as e:
+        log.error(f"CRASH: {e}")
+        import traceback
+        log.error(traceback.format_exc())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,10 @@ NFX Signal - URL Collector
 Clicks "Load More" until 3100+ URLs collected. NEVER reloads. NEVER quits early.
 Saves incrementally. If it crashes, bat file restarts and it picks up.
 
+Saves append only the new URLs to all_investor_urls.journal.jsonl; the
+journal is folded into the sorted all_investor_urls.json every
+COMPACT_EVERY URLs and when collection finishes. Loading reads both.
+
 Run locally:   collect_urls.bat
 Run on server:  python collect_urls.py --server
 """
@@ -33,9 +37,11 @@ MIN_URLS = 3100
 
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
 ALL_URLS_FILE = os.path.join(DATA_DIR, "all_investor_urls.json")
+URLS_JOURNAL_FILE = os.path.join(DATA_DIR, "all_investor_urls.journal.jsonl")
 LOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "collector.log")
 
 SAVE_EVERY = 5
+COMPACT_EVERY = 1000   # journaled URLs before rewriting ALL_URLS_FILE
 
 logging.basicConfig(
     level=logging.INFO,
@@ -52,21 +58,74 @@ logger = logging.getLogger(__name__)
 # URL FILE I/O
 # =============================================================================
 def load_existing_urls():
+    """Snapshot plus journal. Torn journal lines (hard kill) are skipped."""
+    urls = {}
     if os.path.exists(ALL_URLS_FILE):
         try:
             with open(ALL_URLS_FILE, "r") as f:
                 data = json.load(f)
-                return {item["slug"]: item["url"] for item in data}
+                urls = {item["slug"]: item["url"] for item in data}
         except Exception:
             pass
-    return {}
-
-
-def save_urls(url_dict):
+    if os.path.exists(URLS_JOURNAL_FILE):
+        with open(URLS_JOURNAL_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    continue   # torn line from a hard kill
+                urls[item["slug"]] = item["url"]
+    return urls
+
+
+def merge_links(url_dict, pending, links):
+    """Add newly seen links to url_dict, remembering them in pending for the journal."""
+    for slug, url in links.items():
+        if slug not in url_dict:
+            url_dict[slug] = url
+            pending[slug] = url
+
+
+def journal_lines():
+    if not os.path.exists(URLS_JOURNAL_FILE):
+        return 0
+    with open(URLS_JOURNAL_FILE, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def seal_journal():
+    """Newline after a partial last journal line, so the next append starts clean."""
+    if not os.path.exists(URLS_JOURNAL_FILE) or os.path.getsize(URLS_JOURNAL_FILE) == 0:
+        return
+    with open(URLS_JOURNAL_FILE, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def save_urls(url_dict, pending=None, compact=False):
+    """Append pending URLs to the journal; rewrite the snapshot only on compaction."""
     os.makedirs(DATA_DIR, exist_ok=True)
-    investor_list = [{"slug": s, "url": u} for s, u in url_dict.items()]
-    with open(ALL_URLS_FILE, "w") as f:
-        json.dump(investor_list, f, indent=2)
+    if pending:
+        seal_journal()
+        with open(URLS_JOURNAL_FILE, "a", encoding="utf-8") as f:
+            for slug, url in pending.items():
+                f.write(json.dumps({"slug": slug, "url": url}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        pending.clear()
+
+    if compact or not os.path.exists(ALL_URLS_FILE) or journal_lines() >= COMPACT_EVERY:
+        investor_list = sorted(
+            [{"slug": s, "url": u} for s, u in url_dict.items()],
+            key=lambda x: x["slug"],
+        )
+        tmp = ALL_URLS_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(investor_list, f, indent=2)
+        os.replace(tmp, ALL_URLS_FILE)
+        if os.path.exists(URLS_JOURNAL_FILE):
+            os.remove(URLS_JOURNAL_FILE)
 
 
 COLLECT_JS = """
@@ -89,6 +148,7 @@ COLLECT_JS = """
 # =============================================================================
 async def collect(list_url, server_mode=False):
     all_investors = load_existing_urls()
+    pending = {}   # found since the last save, not yet journaled
     start_count = len(all_investors)
     logger.info(f"Loaded {start_count} existing URLs from disk")
 
@@ -144,7 +204,7 @@ async def collect(list_url, server_mode=False):
             try:
                 links = await page.evaluate(COLLECT_JS)
                 if links:
-                    all_investors.update(links)
+                    merge_links(all_investors, pending, links)
             except Exception as e:
                 logger.warning(f"Error collecting links: {e}")
 
@@ -152,7 +212,7 @@ async def collect(list_url, server_mode=False):
 
             # === DONE CHECK: only exit if we have enough ===
             if total >= MIN_URLS:
-                save_urls(all_investors)
+                save_urls(all_investors, pending)
                 logger.info(f"  HIT TARGET! {total} URLs (>= {MIN_URLS}). Final sweep...")
 
                 # Few more clicks to squeeze out any remaining
@@ -165,11 +225,11 @@ async def collect(list_url, server_mode=False):
                     try:
                         links = await page.evaluate(COLLECT_JS)
                         if links:
-                            all_investors.update(links)
+                            merge_links(all_investors, pending, links)
                     except Exception:
                         pass
 
-                save_urls(all_investors)
+                save_urls(all_investors, pending, compact=True)
                 break
 
             # === CLICK LOAD MORE ===
@@ -181,7 +241,7 @@ async def collect(list_url, server_mode=False):
                 await page.wait_for_timeout(3500)
 
                 if clicks % SAVE_EVERY == 0:
-                    save_urls(all_investors)
+                    save_urls(all_investors, pending)
                     logger.info(f"  Click #{clicks} | {total} URLs | saved")
                 elif clicks % 10 == 0:
                     logger.info(f"  Click #{clicks} | {total} URLs")
@@ -202,14 +262,14 @@ async def collect(list_url, server_mode=False):
                     await page.wait_for_timeout(15000)
 
                 if no_button_streak % 10 == 0:
-                    save_urls(all_investors)
+                    save_urls(all_investors, pending)
                     logger.warning(
                         f"  No button for {no_button_streak} rounds. "
                         f"Have {total}/{MIN_URLS}. Waiting and retrying..."
                     )
 
         # --- FINAL SAVE ---
-        save_urls(all_investors)
+        save_urls(all_investors, pending, compact=True)
         new_this_run = len(all_investors) - start_count
 
         logger.info("")
@@ -270,7 +330,7 @@ def main():
         try:
             existing = load_existing_urls()
             if existing:
-                save_urls(existing)
+                save_urls(existing, compact=True)
                 logger.info(f"Emergency save: {len(existing)} URLs preserved.")
         except Exception:
             pass
@@ -38,9 +38,15 @@ import sys
 import logging
 import csv
 import signal
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads    # faster decoder for phase 3
+except ImportError:
+    json_loads = json.loads
+
 try:
     from playwright.async_api import async_playwright, TimeoutError as PWTimeout
 except ImportError:
@@ -59,6 +65,7 @@ PROFILES_DIR = os.path.join(DATA_DIR, "profiles")
 PROGRESS_FILE = os.path.join(DATA_DIR, "progress.json")
 FAILED_FILE = os.path.join(DATA_DIR, "failed_profiles.json")
 ALL_URLS_FILE = os.path.join(DATA_DIR, "all_investor_urls.json")
+URLS_JOURNAL_FILE = os.path.join(DATA_DIR, "all_investor_urls.journal.jsonl")  # written by collect_urls.py
 FINAL_CSV = os.path.join(DATA_DIR, "investors_final.csv")
 FINAL_JSON = os.path.join(DATA_DIR, "investors_final.json")
 COOKIES_FILE = "cookies.json"
@@ -73,6 +80,9 @@ DELAY_AFTER_LOAD_MORE = 3.5      # seconds after clicking Load More
 PAGE_TIMEOUT = 25000              # ms, per page load timeout
 MAX_RETRIES = 3                   # retries per profile before marking failed
 
+# Phase 3
+COMPILE_CHUNK = 200              # profile files per compile worker task
+
 # Memory management - instead of browser restart, we clear page state
 MEMORY_CLEANUP_EVERY = 50        # clear cache every N profiles
 
@@ -140,10 +150,23 @@ def save_profile(slug: str, data: dict):
         json.dump(data, f, indent=2, ensure_ascii=False)
 
 def load_urls():
+    urls = []
     if os.path.exists(ALL_URLS_FILE):
         with open(ALL_URLS_FILE) as f:
-            return json.load(f)
-    return []
+            urls = json.load(f)
+    # URLs collect_urls.py journaled but has not compacted into the snapshot yet
+    if os.path.exists(URLS_JOURNAL_FILE):
+        seen = {u["slug"] for u in urls}
+        with open(URLS_JOURNAL_FILE, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    continue   # torn line from a hard kill
+                if item["slug"] not in seen:
+                    seen.add(item["slug"])
+                    urls.append(item)
+    return urls
 
 def save_urls(urls: list):
     with open(ALL_URLS_FILE, "w") as f:
@@ -736,52 +759,68 @@ async def phase2_scrape(browser, context, page, investor_list, scraped_set, fail
 
 # ─── PHASE 3: COMPILE INTO CSV + JSON ───────────────────────────────────────
 
+def compile_row(data):
+    """One row of the final CSV/JSON from a profile."""
+    bi = data.get("basicInfo", {})
+    ip = data.get("investingProfile", {})
+    soc = data.get("socials", {})
+
+    cp = ip.get("currentPosition", "")
+    if isinstance(cp, dict):
+        position_text = cp.get("text", "")
+        position_extra = cp.get("extra", "")
+        cp = f"{position_extra} @ {position_text}".strip(" @")
+
+    return {
+        "name": bi.get("name", ""),
+        "slug": data.get("slug", ""),
+        "signal_score": bi.get("signalScore", ""),
+        "investor_types": ", ".join(bi.get("investorTypes", [])),
+        "position_and_firm": bi.get("positionAndFirm", "") or cp,
+        "location": bi.get("location", ""),
+        "website": bi.get("website", ""),
+        "sweet_spot": ip.get("sweetSpot", ""),
+        "investment_range": ip.get("investmentRange", ""),
+        "fund_size": ip.get("fundSize", ""),
+        "investments_on_record": ip.get("investmentsOnRecord", ""),
+        "sectors": "; ".join([s["name"] for s in data.get("sectorRankings", [])[:15]]),
+        "num_investments": len(data.get("investments", [])),
+        "linkedin": soc.get("linkedin", ""),
+        "twitter": soc.get("twitter", ""),
+        "crunchbase": soc.get("crunchbase", ""),
+        "angellist": soc.get("angellist", ""),
+        "profile_url": data.get("profileUrl", ""),
+        "profile_picture": data.get("profilePicture", ""),
+        "scraped_at": data.get("scraped_at", ""),
+    }
+
+def compile_chunk(paths):
+    """Worker: decode and flatten a chunk of profile files. Returns [(file name, row, error), ...]."""
+    results = []
+    for path in paths:
+        try:
+            with open(path, "rb") as fh:
+                results.append((os.path.basename(path), compile_row(json_loads(fh.read())), None))
+        except Exception as e:
+            results.append((os.path.basename(path), None, str(e)))
+    return results
+
 def phase3_compile():
     log.info("")
     log.info("=" * 60)
     log.info("  PHASE 3: Compiling final output")
     log.info("=" * 60)
 
+    files = sorted(str(f) for f in Path(PROFILES_DIR).glob("*.json"))
+    chunks = [files[i:i + COMPILE_CHUNK] for i in range(0, len(files), COMPILE_CHUNK)]
     profiles = []
-    for f in sorted(Path(PROFILES_DIR).glob("*.json")):
-        try:
-            with open(f) as fh:
-                data = json.load(fh)
-
-            bi = data.get("basicInfo", {})
-            ip = data.get("investingProfile", {})
-            soc = data.get("socials", {})
-
-            cp = ip.get("currentPosition", "")
-            if isinstance(cp, dict):
-                position_text = cp.get("text", "")
-                position_extra = cp.get("extra", "")
-                cp = f"{position_extra} @ {position_text}".strip(" @")
-
-            profiles.append({
-                "name": bi.get("name", ""),
-                "slug": data.get("slug", ""),
-                "signal_score": bi.get("signalScore", ""),
-                "investor_types": ", ".join(bi.get("investorTypes", [])),
-                "position_and_firm": bi.get("positionAndFirm", "") or cp,
-                "location": bi.get("location", ""),
-                "website": bi.get("website", ""),
-                "sweet_spot": ip.get("sweetSpot", ""),
-                "investment_range": ip.get("investmentRange", ""),
-                "fund_size": ip.get("fundSize", ""),
-                "investments_on_record": ip.get("investmentsOnRecord", ""),
-                "sectors": "; ".join([s["name"] for s in data.get("sectorRankings", [])[:15]]),
-                "num_investments": len(data.get("investments", [])),
-                "linkedin": soc.get("linkedin", ""),
-                "twitter": soc.get("twitter", ""),
-                "crunchbase": soc.get("crunchbase", ""),
-                "angellist": soc.get("angellist", ""),
-                "profile_url": data.get("profileUrl", ""),
-                "profile_picture": data.get("profilePicture", ""),
-                "scraped_at": data.get("scraped_at", ""),
-            })
-        except Exception as e:
-            log.warning(f"  Error reading {f.name}: {e}")
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+        for results in pool.map(compile_chunk, chunks):
+            for name, row, error in results:
+                if error:
+                    log.warning(f"  Error reading {name}: {error}")
+                else:
+                    profiles.append(row)
 
     if not profiles:
         log.warning("  No profiles found to compile!")
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Profile Corpus Loader
+===================================
+One way for the exporters and analysers to read profile JSON, instead of
+each of them globbing a profiles/ directory and json.load()ing files one
+at a time:
+
+    corpus = Corpus(only=["Fintech"])                 # or Corpus.from_profiles_dir(path)
+    for item in corpus:                               # streamed, never the full list
+        item.dataset, item.slug, item.path, item.data, item.error
+
+    for item in corpus.iter(flatten_profile):         # fn runs in the workers;
+        rows.append(item.data)                        # only its result comes back
+
+- profiles are yielded lazily, dataset by dataset in DATASETS order and in
+  slug order within a dataset
+- datasets can be limited with only=[...] and slugs with slugs={...}
+- files are read and decoded across a process pool, CHUNK_SIZE files per
+  task, with at most PREFETCH chunks per worker in flight, so memory stays
+  bounded however large the corpus is
+- decoding uses orjson when it is installed and the json module otherwise
+- a file that cannot be read or decoded (or for which fn raises) is
+  yielded with data=None and error set, so callers keep their own
+  reporting
+
+With one CPU (or workers=1) everything runs in-process.
+
+Run:
+    python profile_corpus.py --bench              # decode time per mode on every dataset
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+    loads = orjson.loads
+    DECODER = "orjson"
+except ImportError:
+    loads = json.loads
+    DECODER = "json"
+
+# =============================================================================
+# CONFIG
+# =============================================================================
+CHUNK_SIZE = 200       # profile files per worker task
+PREFETCH = 4           # chunks per worker decoded ahead of the consumer
+WORKERS = os.cpu_count() or 1
+
+Item = namedtuple("Item", "dataset slug path data error")
+
+
+def dataset_sources(only=None):
+    """{dataset name: profiles dir} for the known datasets (optionally only some)."""
+    # Imported here: profile_manifest imports quality_analysis, which imports this module
+    from profile_manifest import DATASETS
+    return {name: os.path.join(path, "profiles") for name, path in DATASETS.items()
+            if not only or name in only}
+
+
+def decode_chunk(chunk, fn=None):
+    """Worker: read and decode [(dataset, slug, path), ...]. Returns [Item, ...]."""
+    items = []
+    for dataset, slug, path in chunk:
+        try:
+            with open(path, "rb") as f:
+                data = loads(f.read())
+        except (ValueError, OSError) as e:   # JSONDecodeError and UnicodeDecodeError are ValueErrors
+            items.append(Item(dataset, slug, path, None, str(e)))
+            continue
+        if fn is not None:
+            try:
+                data = fn(data)
+            except Exception as e:
+                items.append(Item(dataset, slug, path, None, f"{type(e).__name__}: {e}"))
+                continue
+        items.append(Item(dataset, slug, path, data, None))
+    return items
+
+
+class Corpus:
+    """Lazy, parallel reader of the profile files of one or more datasets."""
+
+    def __init__(self, sources=None, only=None, slugs=None, workers=WORKERS,
+                 chunk_size=CHUNK_SIZE, manifest=False):
+        if sources is None:
+            self.sources = dataset_sources(only)
+        else:
+            self.sources = {name: d for name, d in sources.items() if not only or name in only}
+        self.slugs = set(slugs) if slugs is not None else None
+        self.workers = max(1, workers or 1)
+        self.chunk_size = chunk_size
+        self.manifest = manifest     # list files from the dataset manifest (refreshed) instead of scandir
+        self._files = None
+        self.stats = {"files": 0, "decoded": 0, "errors": 0, "seconds": 0.0}
+
+    @classmethod
+    def from_profiles_dir(cls, profiles_dir, name=None, **kwargs):
+        """Corpus over a single profiles/ directory; name defaults to the directory's parent."""
+        name = name or os.path.basename(os.path.dirname(os.path.abspath(profiles_dir)))
+        return cls(sources={name: str(profiles_dir)}, **kwargs)
+
+    @classmethod
+    def from_files(cls, files, **kwargs):
+        """Corpus over an explicit [(dataset, slug, path), ...] list, read in that order."""
+        corpus = cls(sources={}, **kwargs)
+        corpus._files = list(files)
+        corpus.stats["files"] = len(corpus._files)
+        return corpus
+
+    # -- listing ---------------------------------------------------------------
+    def _list(self, profiles_dir):
+        if self.manifest:
+            from profile_manifest import Manifest
+            manifest = Manifest.for_profiles_dir(profiles_dir)
+            manifest.refresh()
+            manifest.close()
+            return manifest.paths(valid=None)
+        with os.scandir(profiles_dir) as it:
+            return sorted(os.path.join(profiles_dir, e.name) for e in it if e.name.endswith(".json"))
+
+    def files(self):
+        """[(dataset, slug, path), ...] of every profile file selected."""
+        if self._files is None:
+            files = []
+            for name, profiles_dir in self.sources.items():
+                if not os.path.isdir(profiles_dir):
+                    continue
+                for path in self._list(profiles_dir):
+                    slug = os.path.basename(path)[:-5]
+                    if self.slugs is None or slug in self.slugs:
+                        files.append((name, slug, path))
+            self._files = files
+            self.stats["files"] = len(files)
+        return self._files
+
+    def __len__(self):
+        return len(self.files())
+
+    def count(self, dataset):
+        return sum(1 for name, _, _ in self.files() if name == dataset)
+
+    # -- reading ---------------------------------------------------------------
+    def _chunks(self, dataset=None):
+        files = self.files()
+        if dataset is not None:
+            files = [f for f in files if f[0] == dataset]
+        for i in range(0, len(files), self.chunk_size):
+            yield files[i:i + self.chunk_size]
+
+    def iter(self, fn=None, dataset=None):
+        """
+        Yield an Item per profile file, in order. fn (a module-level function,
+        so it can be sent to the workers) is applied to each decoded profile
+        and its result becomes item.data. dataset limits this pass to one source.
+        """
+        started = time.monotonic()
+        try:
+            if self.workers == 1:
+                for chunk in self._chunks(dataset):
+                    yield from self._count(decode_chunk(chunk, fn))
+                return
+
+            pool = ProcessPoolExecutor(max_workers=self.workers)
+            try:
+                chunks = self._chunks(dataset)
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(decode_chunk, chunk, fn))
+                    if len(pending) >= self.workers * PREFETCH:
+                        break
+                while pending:
+                    items = pending.popleft().result()
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        pending.append(pool.submit(decode_chunk, chunk, fn))
+                    yield from self._count(items)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+        finally:
+            self.stats["seconds"] += time.monotonic() - started
+
+    def _count(self, items):
+        for item in items:
+            self.stats["decoded" if item.error is None else "errors"] += 1
+        return items
+
+    def __iter__(self):
+        return self.iter()
+
+    def load(self, fn=None, dataset=None):
+        """Every Item as a list (for callers that need random access)."""
+        return list(self.iter(fn, dataset))
+
+    def summary(self):
+        s = self.stats
+        return (f"{s['decoded']} profiles decoded ({DECODER}, {self.workers} worker"
+                f"{'s' if self.workers > 1 else ''}), {s['errors']} errors, {s['seconds']:.1f}s")
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+def profile_name(data):
+    """Small per-profile result, to time fn in the workers without shipping dicts back."""
+    basic = data.get("basicInfo") or {}
+    return basic.get("name") if isinstance(basic, dict) else None
+
+
+def bench(workers):
+    def run(label, **kwargs):
+        corpus = Corpus(workers=kwargs.pop("workers", 1))
+        started = time.monotonic()
+        n = sum(1 for _ in corpus.iter(**kwargs))
+        print(f"  {label:<36} {n} files  {time.monotonic() - started:6.1f}s")
+
+    global loads
+    fast = loads
+    loads = json.loads
+    run("json.load loop (old exporters)")
+    loads = fast
+    run(f"{DECODER}, in-process")
+    if workers > 1:
+        run(f"{DECODER}, {workers} workers, full dicts", workers=workers)
+        run(f"{DECODER}, {workers} workers, fn in worker", workers=workers, fn=profile_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile corpus loader")
+    parser.add_argument("--bench", action="store_true", help="Time decoding of every dataset")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Decoder processes (default: all cores)")
+    args = parser.parse_args()
+    if args.bench:
+        bench(args.workers)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
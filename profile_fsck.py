@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Dataset fsck
+==========================
+Integrity check for every dataset's profiles/ directory, run after a crash
+(or before an export) instead of eyeballing quality_analysis.py output.
+
+Checks, with the profile files split across a process pool:
+  bad_json      file is empty, truncated or not a JSON object
+  slug          "slug" inside the file does not match the file name
+  garbage       basicInfo.name is missing or an error page (quality_analysis)
+  tmp           leftover *.tmp from a write that never reached os.replace
+  no_file       progress.json lists the slug as scraped but no file exists
+
+With --repair:
+  - bad_json / slug / garbage files are moved to <dataset>/quarantine/ and
+    requeued in the progress log, so the next scraper run takes them first
+  - tmp files are deleted (the profile they belonged to was never counted)
+  - no_file slugs are dropped from the progress log and scraped again
+  - the dataset manifest is refreshed
+
+Stop the scrapers of a dataset before repairing it: they keep their progress
+state in memory and would not see the requeued slugs until restarted.
+
+Run:
+    python profile_fsck.py                      # check all datasets
+    python profile_fsck.py --only Fintech --repair
+    python profile_fsck.py --workers 8 --report fsck_report.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from profile_manifest import DATASETS, Manifest
+from progress_log import ProgressLog
+from quality_analysis import is_garbage_name
+
+CHUNK_SIZE = 500       # profile files per worker task
+SHOW_ISSUES = 20       # issues printed per dataset
+
+REQUEUE_KINDS = ("bad_json", "slug", "garbage")
+
+
+def check_files(profiles_dir, names):
+    """Worker: check a chunk of profile files. Returns [(slug, kind, detail), ...]."""
+    issues = []
+    for name in names:
+        slug = name[:-5]
+        path = os.path.join(profiles_dir, name)
+        try:
+            with open(path, "rb") as f:
+                data = json.loads(f.read())
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            issues.append((slug, "bad_json", str(e)[:100]))
+            continue
+        except OSError as e:
+            issues.append((slug, "bad_json", f"unreadable: {e}"[:100]))
+            continue
+        if not isinstance(data, dict):
+            issues.append((slug, "bad_json", f"top level is {type(data).__name__}"))
+            continue
+        if data.get("slug") and data["slug"] != slug:
+            issues.append((slug, "slug", f"file says {data['slug']!r}"))
+            continue
+        basic = data.get("basicInfo") or {}
+        profile_name = basic.get("name") if isinstance(basic, dict) else None
+        if is_garbage_name(profile_name):
+            issues.append((slug, "garbage", repr(profile_name)[:100]))
+    return issues
+
+
+def scan_dataset(pool, dataset_dir):
+    """Check one dataset. Returns ([(slug, kind, detail), ...], files checked)."""
+    profiles_dir = os.path.join(dataset_dir, "profiles")
+    names, issues = [], []
+    with os.scandir(profiles_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".json"):
+                names.append(entry.name)
+            elif entry.name.endswith(".tmp"):
+                issues.append((entry.name, "tmp", "profiles/" + entry.name))
+    for entry in os.listdir(dataset_dir):
+        if entry.endswith(".tmp"):
+            issues.append((entry, "tmp", entry))
+
+    chunks = [names[i:i + CHUNK_SIZE] for i in range(0, len(names), CHUNK_SIZE)]
+    for chunk_issues in pool.map(check_files, [profiles_dir] * len(chunks), chunks):
+        issues.extend(chunk_issues)
+
+    progress_file = os.path.join(dataset_dir, "progress.json")
+    if os.path.exists(progress_file):
+        on_disk = {n[:-5] for n in names}
+        progress = ProgressLog(progress_file, readonly=True)
+        issues.extend((slug, "no_file", "in progress.json") for slug in sorted(progress.scraped - on_disk))
+    return issues, len(names)
+
+
+def repair_dataset(dataset_dir, issues):
+    """Quarantine bad files, clear tmp files and requeue slugs. Returns counts per action."""
+    profiles_dir = os.path.join(dataset_dir, "profiles")
+    quarantine_dir = os.path.join(dataset_dir, "quarantine")
+    progress = ProgressLog(os.path.join(dataset_dir, "progress.json"))
+    done = {"quarantined": 0, "tmp_removed": 0, "requeued": 0}
+    for slug, kind, detail in issues:
+        if kind == "tmp":
+            try:
+                os.remove(os.path.join(dataset_dir, detail))
+                done["tmp_removed"] += 1
+            except FileNotFoundError:
+                pass
+        elif kind in REQUEUE_KINDS:
+            os.makedirs(quarantine_dir, exist_ok=True)
+            shutil.move(os.path.join(profiles_dir, f"{slug}.json"), os.path.join(quarantine_dir, f"{slug}.json"))
+            progress.requeue(slug, f"fsck {kind}: {detail}")
+            done["quarantined"] += 1
+            done["requeued"] += 1
+        elif kind == "no_file":
+            progress.drop(slug)
+            done["requeued"] += 1
+    progress.close()
+
+    manifest = Manifest(dataset_dir)
+    if manifest.exists:
+        manifest.refresh()
+        manifest.close()
+    return done
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Check (and repair) scraped profile datasets")
+    parser.add_argument("--only", nargs="+", metavar="DATASET", help="Only these datasets (e.g. Fintech SaaS)")
+    parser.add_argument("--repair", action="store_true", help="Quarantine bad files and requeue their slugs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Checker processes (default: all cores)")
+    parser.add_argument("--report", help="Also write every issue to this JSON file")
+    args = parser.parse_args()
+
+    report = {}
+    started = time.monotonic()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for name, dataset_dir in DATASETS.items():
+            if args.only and name not in args.only:
+                continue
+            if not os.path.isdir(os.path.join(dataset_dir, "profiles")):
+                print(f"  [{name}] no profiles dir — skipping")
+                continue
+            t = time.monotonic()
+            issues, checked = scan_dataset(pool, dataset_dir)
+            counts = {}
+            for _, kind, _ in issues:
+                counts[kind] = counts.get(kind, 0) + 1
+            summary = ", ".join(f"{n} {kind}" for kind, n in sorted(counts.items())) or "clean"
+            print(f"  [{name}] {checked} files checked in {time.monotonic() - t:.1f}s: {summary}")
+            for slug, kind, detail in issues[:SHOW_ISSUES]:
+                print(f"      {kind:<9} {slug}  {detail}")
+            if len(issues) > SHOW_ISSUES:
+                print(f"      ... {len(issues) - SHOW_ISSUES} more")
+
+            if args.repair and issues:
+                done = repair_dataset(dataset_dir, issues)
+                print(f"  [{name}] repaired: {done['quarantined']} quarantined, "
+                      f"{done['tmp_removed']} tmp removed, {done['requeued']} requeued")
+            report[name] = [{"slug": s, "kind": k, "detail": d} for s, k, d in issues]
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    total = sum(len(v) for v in report.values())
+    print(f"\n  {total} issues across {len(report)} datasets ({time.monotonic() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Dataset Manifest
+==============================
+One index per dataset of what is in its profiles/ directory, so tools stop
+listing and parsing thousands of files to find out what exists:
+
+    slug -> {"size", "mtime", "sha1", "scraped_at", "valid"}
+
+"valid" means the file parses as a JSON object with a non-garbage
+basicInfo.name (quality_analysis.is_garbage_name).
+
+Storage follows progress_log.py: manifest.json is a snapshot next to
+profiles/, manifest.wal.jsonl is an append-only log of changes replayed on
+top of it, and the log is folded into the snapshot every COMPACT_EVERY
+records and on close(). A torn last line (hard kill) is ignored.
+
+The scrapers keep it current through ProfileWriter (every profile written
+is recorded with the hash of the bytes that went to disk). refresh() brings
+it up to date with files changed behind its back: one scandir, and only
+files whose size or mtime differ from the manifest are read and hashed.
+
+Run:
+    python profile_manifest.py refresh                # all datasets
+    python profile_manifest.py refresh --only Fintech SaaS
+    python profile_manifest.py status
+    python profile_manifest.py changed General --since 2026-10-01T00:00:00
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from quality_analysis import is_garbage_name
+
+# =============================================================================
+# CONFIG
+# =============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+COMPACT_EVERY = 2000    # log records between snapshots
+
+# Datasets: name -> dataset dir (holds profiles/ and the manifest)
+DATASETS = {
+    "General":    os.path.join(BASE_DIR, "data"),
+    "Enterprise": os.path.join(BASE_DIR, "data-enterprise-seed"),
+    "Fintech":    os.path.join(BASE_DIR, "data-fintech-seed"),
+    "SaaS":       os.path.join(BASE_DIR, "data-saas"),
+}
+
+
+def inspect_bytes(raw):
+    """(sha1, scraped_at, valid) for the raw bytes of a profile file."""
+    digest = hashlib.sha1(raw).hexdigest()
+    try:
+        data = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return digest, None, False
+    return digest, *inspect_data(data)
+
+
+def inspect_data(data):
+    """(scraped_at, valid) for an already parsed profile."""
+    if not isinstance(data, dict):
+        return None, False
+    basic = data.get("basicInfo") or {}
+    name = basic.get("name") if isinstance(basic, dict) else None
+    return data.get("scraped_at"), not is_garbage_name(name)
+
+
+# =============================================================================
+# MANIFEST
+# =============================================================================
+class Manifest:
+    """slug -> file entry for one dataset's profiles/ directory."""
+
+    def __init__(self, dataset_dir, compact_every=COMPACT_EVERY):
+        self.dataset_dir = dataset_dir
+        self.profiles_dir = os.path.join(dataset_dir, "profiles")
+        self.snapshot_file = os.path.join(dataset_dir, "manifest.json")
+        self.path = os.path.join(dataset_dir, "manifest.wal.jsonl")
+        self.compact_every = compact_every
+
+        self.entries = {}
+        self.updated_at = None
+        self._lock = threading.Lock()
+        self._records = 0
+        self._fd = None
+        self.stats = {"records": 0, "hashed": 0, "compactions": 0}
+        self._replay()
+
+    @classmethod
+    def for_profiles_dir(cls, profiles_dir, **kwargs):
+        return cls(os.path.dirname(os.path.abspath(profiles_dir)), **kwargs)
+
+    @property
+    def exists(self):
+        """True once the manifest has been built (by refresh() or by a scraper)."""
+        return os.path.exists(self.snapshot_file) or os.path.exists(self.path)
+
+    # -- replay ----------------------------------------------------------------
+    def _apply(self, rec):
+        if rec.get("del"):
+            self.entries.pop(rec["s"], None)
+        else:
+            self.entries[rec["s"]] = rec["e"]
+
+    def _replay(self):
+        if os.path.exists(self.snapshot_file):
+            try:
+                with open(self.snapshot_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.entries = data.get("entries", {})
+                self.updated_at = data.get("updated_at")
+            except (json.JSONDecodeError, OSError):
+                self.entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue   # torn line from a hard kill
+                    self._apply(rec)
+                    self._records += 1
+
+    # -- recording -------------------------------------------------------------
+    def _append(self, recs):
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in recs).encode("utf-8")
+        with self._lock:
+            if self._fd is None:
+                os.makedirs(self.dataset_dir, exist_ok=True)
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            for r in recs:
+                self._apply(r)
+            os.write(self._fd, lines)
+            self._records += len(recs)
+            self.stats["records"] += len(recs)
+            due = self._records >= self.compact_every
+        if due:
+            self.compact()
+
+    def record(self, slug, raw, data=None, mtime=None):
+        """Record a profile file that was just written with the bytes `raw`."""
+        if data is None:
+            digest, scraped_at, valid = inspect_bytes(raw)
+        else:
+            digest = hashlib.sha1(raw).hexdigest()
+            scraped_at, valid = inspect_data(data)
+        if mtime is None:
+            mtime = os.stat(os.path.join(self.profiles_dir, f"{slug}.json")).st_mtime
+        self._append([{"s": slug, "e": {"size": len(raw), "mtime": mtime, "sha1": digest,
+                                        "scraped_at": scraped_at, "valid": valid}}])
+
+    def remove(self, slug):
+        if slug in self.entries:
+            self._append([{"s": slug, "del": True}])
+
+    def refresh(self):
+        """Bring the manifest in line with profiles/. Only files whose size or mtime
+        changed are read. Returns (added, changed, removed, unchanged)."""
+        recs = []
+        seen = set()
+        added = changed = unchanged = 0
+        if os.path.isdir(self.profiles_dir):
+            with os.scandir(self.profiles_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    slug = entry.name[:-5]
+                    seen.add(slug)
+                    st = entry.stat()
+                    old = self.entries.get(slug)
+                    if old and old["size"] == st.st_size and old["mtime"] == st.st_mtime:
+                        unchanged += 1
+                        continue
+                    try:
+                        with open(entry.path, "rb") as f:
+                            raw = f.read()
+                    except OSError:
+                        continue
+                    digest, scraped_at, valid = inspect_bytes(raw)
+                    self.stats["hashed"] += 1
+                    if old is None:
+                        added += 1
+                    else:
+                        changed += 1
+                    recs.append({"s": slug, "e": {"size": st.st_size, "mtime": st.st_mtime, "sha1": digest,
+                                                  "scraped_at": scraped_at, "valid": valid}})
+        gone = [slug for slug in self.entries if slug not in seen]
+        recs.extend({"s": slug, "del": True} for slug in gone)
+        for i in range(0, len(recs), self.compact_every):
+            self._append(recs[i:i + self.compact_every])
+        return added, changed, len(gone), unchanged
+
+    # -- queries ---------------------------------------------------------------
+    def slugs(self, valid=None):
+        """Set of slugs with a profile file; valid=True/False filters on validity."""
+        with self._lock:
+            if valid is None:
+                return set(self.entries)
+            return {s for s, e in self.entries.items() if e["valid"] == valid}
+
+    def paths(self, valid=True):
+        """Sorted profile file paths, like sorted(glob(profiles/*.json)) without the listing."""
+        return [os.path.join(self.profiles_dir, f"{s}.json") for s in sorted(self.slugs(valid))]
+
+    def changed_since(self, since):
+        """Slugs whose file changed after `since` (epoch seconds or ISO timestamp)."""
+        if isinstance(since, str):
+            since = datetime.fromisoformat(since).timestamp()
+        with self._lock:
+            return {s for s, e in self.entries.items() if e["mtime"] > since}
+
+    # -- compaction ------------------------------------------------------------
+    def compact(self):
+        """Fold the log into manifest.json and start a fresh log."""
+        with self._lock:
+            self.updated_at = datetime.now().isoformat()
+            tmp = self.snapshot_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"format": 1, "updated_at": self.updated_at,
+                           "count": len(self.entries), "entries": self.entries},
+                          f, ensure_ascii=False, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.snapshot_file)
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._records = 0
+            self.stats["compactions"] += 1
+
+    def close(self):
+        if self._records or self._fd is not None:
+            self.compact()
+
+    def summary(self):
+        valid = sum(1 for e in self.entries.values() if e["valid"])
+        return (f"{len(self.entries)} files ({valid} valid, {len(self.entries) - valid} invalid), "
+                f"{self.stats['hashed']} hashed, {self.stats['records']} log records")
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+def selected(args):
+    return [(name, path) for name, path in DATASETS.items() if not args.only or name in args.only]
+
+
+def cmd_refresh(args):
+    for name, dataset_dir in selected(args):
+        if not os.path.isdir(os.path.join(dataset_dir, "profiles")):
+            print(f"  [{name}] no profiles dir — skipping")
+            continue
+        started = time.monotonic()
+        manifest = Manifest(dataset_dir)
+        added, changed, removed, unchanged = manifest.refresh()
+        manifest.close()
+        print(f"  [{name}] +{added} new, {changed} changed, -{removed} removed, {unchanged} unchanged "
+              f"({time.monotonic() - started:.1f}s) | {manifest.summary()}")
+
+
+def cmd_status(args):
+    for name, dataset_dir in selected(args):
+        manifest = Manifest(dataset_dir)
+        if not manifest.exists:
+            print(f"  [{name}] no manifest — run: python profile_manifest.py refresh --only {name}")
+            continue
+        print(f"  [{name}] {manifest.summary()} | updated {manifest.updated_at or 'never'}")
+
+
+def cmd_changed(args):
+    manifest = Manifest(DATASETS[args.dataset])
+    for slug in sorted(manifest.changed_since(args.since)):
+        print(slug)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-dataset manifest of scraped profile files")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("refresh", help="Sync manifests with the profiles/ directories")
+    p.add_argument("--only", nargs="+", metavar="DATASET", help="Only these datasets (e.g. Fintech SaaS)")
+    p.set_defaults(func=cmd_refresh)
+
+    p = sub.add_parser("status", help="File counts per dataset")
+    p.add_argument("--only", nargs="+", metavar="DATASET")
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser("changed", help="Print slugs whose file changed after a timestamp")
+    p.add_argument("dataset", choices=list(DATASETS))
+    p.add_argument("--since", required=True, help="ISO timestamp")
+    p.set_defaults(func=cmd_changed)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
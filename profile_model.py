@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Compact Profile Model
+===================================
+In-memory form of a scraped profile for tools that need many profiles in
+memory at once. generate_saas_csv.py holds every SaaS profile this way
+until it knows how many experience/investment/sector columns to write.
+
+A profile JSON is a dict of dicts and lists; every one of those carries a
+hash table, and the same sector names, sector URLs, stages, firm names and
+co-investor names are repeated as separate str objects in thousands of
+files. Here:
+- Profile, Investment, Experience and SectorRanking use __slots__ (no
+  per-object __dict__), and nested lists become tuples
+- every repeated string goes through one StringPool, so each distinct
+  value is stored once however many profiles mention it
+- keys the model does not know are kept in Profile.extra, so
+  to_dict() gives back the profile JSON (None values and empty optional
+  fields aside)
+
+Run:
+    python profile_model.py --bench            # dict vs compact memory on every dataset
+"""
+
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+
+from profile_manifest import DATASETS
+
+
+class StringPool:
+    """Interns strings: equal values share one object. Counts lookups for the report."""
+
+    __slots__ = ("_strings", "lookups")
+
+    def __init__(self):
+        self._strings = {}
+        self.lookups = 0
+
+    def __call__(self, value):
+        if not isinstance(value, str):
+            return value
+        self.lookups += 1
+        return self._strings.setdefault(value, value)
+
+    def __len__(self):
+        return len(self._strings)
+
+    def strings(self, values):
+        return tuple(self(v) for v in values) if isinstance(values, list) else ()
+
+
+class SectorRanking:
+    __slots__ = ("name", "url")
+
+    def __init__(self, name, url):
+        self.name = name
+        self.url = url
+
+    def to_dict(self):
+        return {"name": self.name, "url": self.url}
+
+
+class Experience:
+    __slots__ = ("company", "position", "title", "dates")
+
+    def __init__(self, company, position, title, dates):
+        self.company = company
+        self.position = position
+        self.title = title
+        self.dates = dates
+
+    def to_dict(self):
+        d = {}
+        if self.company is not None:
+            d["company"] = self.company
+        if self.position is not None:
+            d["position"] = self.position
+        if self.title is not None:
+            d["title"] = self.title
+        if self.dates is not None:
+            d["dates"] = self.dates
+        return d
+
+
+class Investment:
+    __slots__ = ("company", "stage", "date", "round_size", "total_raised", "co_investors")
+
+    def __init__(self, company, stage, date, round_size, total_raised, co_investors):
+        self.company = company
+        self.stage = stage
+        self.date = date
+        self.round_size = round_size
+        self.total_raised = total_raised
+        self.co_investors = co_investors
+
+    def to_dict(self):
+        return {"company": self.company, "stage": self.stage, "date": self.date,
+                "roundSize": self.round_size, "totalRaised": self.total_raised,
+                "coInvestors": list(self.co_investors)}
+
+
+# (attribute, section, JSON key) for the flat string/number fields
+BASIC_FIELDS = [
+    ("name", "basicInfo", "name"),
+    ("location", "basicInfo", "location"),
+    ("signal_score", "basicInfo", "signalScore"),
+    ("position_and_firm", "basicInfo", "positionAndFirm"),
+    ("website", "basicInfo", "website"),
+    ("investment_range", "investingProfile", "investmentRange"),
+    ("sweet_spot", "investingProfile", "sweetSpot"),
+    ("fund_size", "investingProfile", "fundSize"),
+    ("investments_on_record", "investingProfile", "investmentsOnRecord"),
+    ("linkedin", "socials", "linkedin"),
+    ("twitter", "socials", "twitter"),
+    ("angellist", "socials", "angellist"),
+    ("crunchbase", "socials", "crunchbase"),
+    ("social_website", "socials", "website"),
+]
+TOP_FIELDS = [("slug", "slug"), ("profile_url", "profileUrl"),
+              ("profile_picture", "profilePicture"), ("scraped_at", "scraped_at")]
+KNOWN_KEYS = {"basicInfo", "investingProfile", "socials", "sectorRankings", "experience",
+              "investments", "slug", "profileUrl", "profilePicture", "scraped_at"}
+
+
+class _Missing:
+    """Marks a field absent from the JSON; pickles by name so it survives the corpus workers."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+class Profile:
+    """One investor profile; attribute names follow the export CSV columns."""
+
+    __slots__ = ([a for a, _, _ in BASIC_FIELDS] + [a for a, _ in TOP_FIELDS]
+                 + ["investor_types", "current_position", "current_firm", "current_firm_url",
+                    "current_position_text", "sector_rankings", "experience", "investments", "extra"])
+
+    @classmethod
+    def from_dict(cls, data, pool=None):
+        """Build a Profile from parsed profile JSON, interning strings through pool."""
+        pool = StringPool() if pool is None else pool
+        p = cls.__new__(cls)
+        sections = {}
+        for name in ("basicInfo", "investingProfile", "socials"):
+            section = data.get(name)
+            sections[name] = section if isinstance(section, dict) else {}
+        for attr, section, key in BASIC_FIELDS:
+            setattr(p, attr, pool(sections[section].get(key, MISSING)))
+        for attr, key in TOP_FIELDS:
+            setattr(p, attr, data.get(key, MISSING) if attr in ("slug", "scraped_at") else pool(data.get(key, MISSING)))
+
+        p.investor_types = pool.strings(sections["basicInfo"].get("investorTypes"))
+        cp = sections["investingProfile"].get("currentPosition", MISSING)
+        p.current_position_text = None
+        if isinstance(cp, dict):
+            p.current_position = pool(cp.get("position"))
+            p.current_firm = pool(cp.get("firm"))
+            p.current_firm_url = pool(cp.get("firmUrl"))
+        else:
+            p.current_position = p.current_firm = p.current_firm_url = None
+            p.current_position_text = cp if isinstance(cp, str) else MISSING
+
+        p.sector_rankings = tuple(SectorRanking(pool(s.get("name")), pool(s.get("url")))
+                                  for s in data.get("sectorRankings") or () if isinstance(s, dict))
+        p.experience = tuple(Experience(pool(e.get("company")), pool(e.get("position")),
+                                        pool(e.get("title")), pool(e.get("dates")))
+                             for e in data.get("experience") or () if isinstance(e, dict))
+        p.investments = tuple(Investment(pool(v.get("company")), pool(v.get("stage")), pool(v.get("date")),
+                                         pool(v.get("roundSize")), pool(v.get("totalRaised")),
+                                         pool.strings(v.get("coInvestors")))
+                              for v in data.get("investments") or () if isinstance(v, dict))
+
+        extra = {k: v for k, v in data.items() if k not in KNOWN_KEYS}
+        for section, known in (("basicInfo", {"name", "location", "signalScore", "positionAndFirm",
+                                              "website", "investorTypes"}),
+                               ("investingProfile", {"investmentRange", "sweetSpot", "fundSize",
+                                                     "investmentsOnRecord", "currentPosition"})):
+            rest = {k: v for k, v in sections[section].items() if k not in known}
+            if rest:
+                extra[section] = rest
+        p.extra = extra or None
+        return p
+
+    def get(self, attr, default=""):
+        """Attribute value, or default when the field was absent from the JSON."""
+        value = getattr(self, attr)
+        return default if value is MISSING else value
+
+    def to_dict(self):
+        """Profile JSON in the scraper layout."""
+        sections = {"basicInfo": {}, "investingProfile": {}, "socials": {}}
+        for attr, section, key in BASIC_FIELDS:
+            value = getattr(self, attr)
+            if value is not MISSING:
+                sections[section][key] = value
+        if self.investor_types:
+            sections["basicInfo"]["investorTypes"] = list(self.investor_types)
+        if self.current_position_text is None:
+            sections["investingProfile"]["currentPosition"] = {
+                k: v for k, v in (("firm", self.current_firm), ("firmUrl", self.current_firm_url),
+                                  ("position", self.current_position)) if v is not None}
+        elif self.current_position_text is not MISSING:
+            sections["investingProfile"]["currentPosition"] = self.current_position_text
+        extra = dict(self.extra or {})
+        for section in ("basicInfo", "investingProfile"):
+            sections[section].update(extra.pop(section, {}))
+
+        data = {"basicInfo": sections["basicInfo"], "investingProfile": sections["investingProfile"],
+                "sectorRankings": [s.to_dict() for s in self.sector_rankings],
+                "investments": [v.to_dict() for v in self.investments],
+                "experience": [e.to_dict() for e in self.experience],
+                "socials": sections["socials"]}
+        for attr, key in TOP_FIELDS:
+            value = getattr(self, attr)
+            if value is not MISSING:
+                data[key] = value
+        data.update(extra)
+        return data
+
+
+def load_profile(filepath, pool=None):
+    """Profile from one JSON file, or None if it cannot be read."""
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return Profile.from_dict(json.load(f), pool)
+    except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+        return None
+
+
+def load_profiles(profiles_dir, pool=None):
+    """Every profile in a profiles/ directory, in slug order, sharing one string pool."""
+    pool = StringPool() if pool is None else pool
+    profiles = []
+    for name in sorted(os.listdir(profiles_dir)):
+        if name.endswith(".json"):
+            profile = load_profile(os.path.join(profiles_dir, name), pool)
+            if profile is not None:
+                profiles.append(profile)
+    return profiles
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+def _measure(load):
+    gc.collect()
+    tracemalloc.start()
+    started = time.monotonic()
+    result = load()
+    elapsed = time.monotonic() - started
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, held, elapsed
+
+
+def bench():
+    dirs = [os.path.join(d, "profiles") for d in DATASETS.values() if os.path.isdir(os.path.join(d, "profiles"))]
+
+    def load_dicts():
+        out = []
+        for profiles_dir in dirs:
+            for name in sorted(os.listdir(profiles_dir)):
+                if name.endswith(".json"):
+                    with open(os.path.join(profiles_dir, name), "r", encoding="utf-8") as f:
+                        out.append(json.load(f))
+        return out
+
+    pool = StringPool()
+    dicts, dict_bytes, dict_time = _measure(load_dicts)
+    n = len(dicts)
+    del dicts
+    compact, compact_bytes, compact_time = _measure(
+        lambda: [p for profiles_dir in dirs for p in load_profiles(profiles_dir, pool)])
+
+    print(f"  Profiles:        {n} (compact: {len(compact)})")
+    print(f"  dict of dicts:   {dict_bytes / 2**20:8.1f} MiB held  ({dict_time:.1f}s to load)")
+    print(f"  slotted+pooled:  {compact_bytes / 2**20:8.1f} MiB held  ({compact_time:.1f}s to load)")
+    print(f"  Saving:          {(1 - compact_bytes / dict_bytes) * 100:.0f}% "
+          f"({dict_bytes / max(compact_bytes, 1):.1f}x smaller)")
+    print(f"  String pool:     {len(pool)} distinct of {pool.lookups} strings")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact in-memory profile model")
+    parser.add_argument("--bench", action="store_true", help="Memory benchmark: dicts vs compact model")
+    args = parser.parse_args()
+    if args.bench:
+        bench()
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
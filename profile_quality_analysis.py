@@ -4,13 +4,14 @@ Comprehensive Quality Analysis of All Scraped Investor Profiles
 Analyzes every JSON file in data/profiles/ and reports detailed quality metrics.
 """
 
-import json
 import os
 import sys
-from collections import Counter, defaultdict
+from collections import Counter
 from pathlib import Path
 
-PROFILES_DIR = Path("/Users/apple/Desktop/Techweer/SAUD BHAI/Scraping VC/data/profiles")
+from profile_corpus import Corpus
+
+PROFILES_DIR = Path(__file__).resolve().parent / "data" / "profiles"
 
 def is_populated(value):
     """Check if a value is meaningfully populated (non-null, non-empty)."""
@@ -140,9 +141,15 @@ def classify_profile(fields):
     return "partial"
 
 
+def summarize_profile(data):
+    """Per-profile result sent back from the corpus workers: fields plus the values main() tallies."""
+    bi = data.get("basicInfo") or {}
+    return analyze_profile(data), bi.get("signalScore"), bi.get("investorTypes") or [], bi.get("location")
+
+
 def main():
-    json_files = sorted(PROFILES_DIR.glob("*.json"))
-    total = len(json_files)
+    corpus = Corpus.from_profiles_dir(PROFILES_DIR)
+    total = len(corpus)
     print("=" * 80)
     print("  COMPREHENSIVE INVESTOR PROFILE QUALITY ANALYSIS")
     print("=" * 80)
@@ -173,22 +180,14 @@ def main():
     SKIP_KEYS = {"experience_count", "investments_count", "sectorRankings_count", "_cp_is_string"}
     boolean_field_keys = None
 
-    for filepath in json_files:
-        filename = filepath.name
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                raw = f.read()
-            data = json.loads(raw)
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            malformed_files.append((filename, str(e)))
-            classification_counts["malformed"] += 1
-            continue
-        except Exception as e:
-            malformed_files.append((filename, f"Unexpected: {e}"))
+    for item in corpus.iter(summarize_profile):
+        filename = os.path.basename(item.path)
+        if item.error:
+            malformed_files.append((filename, item.error))
             classification_counts["malformed"] += 1
             continue
 
-        fields = analyze_profile(data)
+        fields, ss, investor_types, loc = item.data
 
         if boolean_field_keys is None:
             boolean_field_keys = [k for k in fields.keys() if k not in SKIP_KEYS]
@@ -204,15 +203,12 @@ def main():
         investment_counts.append(fields["investments_count"])
         sector_counts.append(fields["sectorRankings_count"])
 
-        bi = data.get("basicInfo") or {}
-        ss = bi.get("signalScore")
         if ss is not None:
             signal_scores.append(ss)
 
-        for it in (bi.get("investorTypes") or []):
+        for it in investor_types:
             investor_type_counter[it] += 1
 
-        loc = bi.get("location")
         if loc and isinstance(loc, str) and loc.strip():
             location_counter[loc.strip()] += 1
 
@@ -330,11 +326,13 @@ def main():
         print("-" * 80)
         print(f"  7. EMPTY/GARBAGE PROFILES (showing up to 20 of {len(empty_profiles)})")
         print("-" * 80)
-        for fname in empty_profiles[:20]:
-            fpath = PROFILES_DIR / fname
+        shown = Corpus.from_profiles_dir(PROFILES_DIR, slugs={f[:-5] for f in empty_profiles[:20]})
+        for item in shown:
+            fname = os.path.basename(item.path)
             try:
-                with open(fpath) as f:
-                    d = json.load(f)
+                if item.error:
+                    raise ValueError(item.error)
+                d = item.data
                 bi = d.get("basicInfo") or {}
                 name = bi.get("name", "N/A")
                 loc = bi.get("location", "N/A")
@@ -369,12 +367,10 @@ def main():
         ]
         depth_fields = ["experience (>=1 entry)", "investments (>=1 entry)", "sectorRankings (>=1 entry)"]
 
-        for fname in partial_profiles:
-            fpath = PROFILES_DIR / fname
+        partial = Corpus.from_profiles_dir(PROFILES_DIR, slugs={f[:-5] for f in partial_profiles})
+        for item in partial.iter(analyze_profile):
             try:
-                with open(fpath) as f:
-                    d = json.load(f)
-                fields = analyze_profile(d)
+                fields = item.data
                 for k in key_fields_for_complete:
                     if not fields[k]:
                         missing_field_counter[k] += 1
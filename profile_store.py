@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - SQLite Profile Store
+==================================
+One indexed table of investor profiles for every dataset, instead of one
+pretty-printed JSON file per investor that every exporter globs and parses.
+
+    profiles (dataset, slug) PRIMARY KEY
+        name, url, scraped_at, tier, source, file_mtime, updated_at, data (JSON)
+    urls     (dataset, slug) PRIMARY KEY
+        url  (the collector's all_investor_urls.json, for "what's missing")
+
+Writes are buffered and committed in batches of BATCH_SIZE rows per
+transaction. The database runs in WAL mode, so readers never block a writer.
+The tier column is quality_analysis.classify_profile() of the profile.
+
+The profiles/ directories stay the scrapers' output format: `import` loads
+them (re-reading only files whose mtime changed), `export` writes a store
+back out as a JSON directory in the same format.
+
+Run:
+    python profile_store.py import                       # all datasets
+    python profile_store.py import --only Fintech SaaS
+    python profile_store.py stats
+    python profile_store.py missing General
+    python profile_store.py export SaaS /tmp/saas-profiles
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from profile_manifest import DATASETS
+from quality_analysis import analyze_profile, classify_profile
+from url_journal import load_url_list
+
+# =============================================================================
+# CONFIG
+# =============================================================================
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_FILE = os.path.join(BASE_DIR, "profiles.db")
+BATCH_SIZE = 500           # rows per write transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    dataset     TEXT NOT NULL,
+    slug        TEXT NOT NULL,
+    name        TEXT,
+    url         TEXT,
+    scraped_at  TEXT,
+    tier        TEXT,
+    source      TEXT,
+    file_mtime  REAL,
+    updated_at  TEXT NOT NULL,
+    data        TEXT NOT NULL,
+    PRIMARY KEY (dataset, slug)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS profiles_tier ON profiles (dataset, tier);
+CREATE INDEX IF NOT EXISTS profiles_slug ON profiles (slug);
+
+CREATE TABLE IF NOT EXISTS urls (
+    dataset     TEXT NOT NULL,
+    slug        TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    PRIMARY KEY (dataset, slug)
+) WITHOUT ROWID;
+"""
+
+
+def profile_tier(data):
+    """Quality tier (complete/good/minimal/garbage) as reported by quality_analysis.py."""
+    return classify_profile(analyze_profile(data))
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+class ProfileStore:
+    """Profiles keyed by (dataset, slug) in one SQLite file."""
+
+    def __init__(self, path=STORE_FILE, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._pending = []
+        self.stats = {"written": 0, "transactions": 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- writes ----------------------------------------------------------------
+    def put(self, dataset, slug, data, source=None, file_mtime=None):
+        """Queue one profile; committed with the next full batch or flush()."""
+        basic = data.get("basicInfo") or {}
+        self._pending.append((
+            dataset, slug,
+            basic.get("name") if isinstance(basic, dict) else None,
+            data.get("profileUrl"),
+            data.get("scraped_at"),
+            profile_tier(data),
+            source,
+            file_mtime,
+            datetime.now().isoformat(),
+            json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+        ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write every queued profile in one transaction."""
+        if not self._pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO profiles (dataset, slug, name, url, scraped_at, tier,"
+                " source, file_mtime, updated_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        self.stats["written"] += len(self._pending)
+        self.stats["transactions"] += 1
+        self._pending = []
+
+    def delete(self, dataset, slug):
+        self.flush()
+        with self.conn:
+            self.conn.execute("DELETE FROM profiles WHERE dataset = ? AND slug = ?", (dataset, slug))
+
+    def set_urls(self, dataset, url_list):
+        """Replace a dataset's URL list ([{"slug", "url"}, ...])."""
+        with self.conn:
+            self.conn.execute("DELETE FROM urls WHERE dataset = ?", (dataset,))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO urls (dataset, slug, url) VALUES (?, ?, ?)",
+                ((dataset, inv["slug"], inv["url"]) for inv in url_list),
+            )
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+    # -- reads -----------------------------------------------------------------
+    def get(self, dataset, slug):
+        """Profile dict, or None."""
+        self.flush()
+        row = self.conn.execute(
+            "SELECT data FROM profiles WHERE dataset = ? AND slug = ?", (dataset, slug)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def has(self, dataset, slug):
+        self.flush()
+        return self.conn.execute(
+            "SELECT 1 FROM profiles WHERE dataset = ? AND slug = ?", (dataset, slug)
+        ).fetchone() is not None
+
+    def slugs(self, dataset):
+        """Set of slugs stored for a dataset."""
+        self.flush()
+        return {r[0] for r in self.conn.execute("SELECT slug FROM profiles WHERE dataset = ?", (dataset,))}
+
+    def count(self, dataset=None, tier=None):
+        self.flush()
+        sql, args = "SELECT COUNT(*) FROM profiles WHERE 1=1", []
+        if dataset:
+            sql += " AND dataset = ?"
+            args.append(dataset)
+        if tier:
+            sql += " AND tier = ?"
+            args.append(tier)
+        return self.conn.execute(sql, args).fetchone()[0]
+
+    def tier_counts(self):
+        """{dataset: {tier: count}}."""
+        self.flush()
+        counts = {}
+        for dataset, tier, n in self.conn.execute(
+                "SELECT dataset, tier, COUNT(*) FROM profiles GROUP BY dataset, tier"):
+            counts.setdefault(dataset, {})[tier] = n
+        return counts
+
+    def missing(self, dataset):
+        """[{"slug", "url"}, ...] in the dataset's URL list with no stored profile."""
+        self.flush()
+        return [{"slug": slug, "url": url} for slug, url in self.conn.execute(
+            "SELECT u.slug, u.url FROM urls u LEFT JOIN profiles p"
+            " ON p.dataset = u.dataset AND p.slug = u.slug"
+            " WHERE u.dataset = ? AND p.slug IS NULL ORDER BY u.slug", (dataset,))]
+
+    def iter_profiles(self, dataset=None):
+        """Yield (dataset, slug, data) in slug order without loading the whole table."""
+        self.flush()
+        sql, args = "SELECT dataset, slug, data FROM profiles", ()
+        if dataset:
+            sql, args = sql + " WHERE dataset = ?", (dataset,)
+        for ds, slug, data in self.conn.execute(sql + " ORDER BY dataset, slug", args):
+            yield ds, slug, json.loads(data)
+
+    # -- JSON directories ------------------------------------------------------
+    def import_dir(self, dataset, profiles_dir, force=False):
+        """Load <dataset>/profiles/*.json, skipping files whose mtime is unchanged,
+        and remove imported rows whose file is gone. Returns (imported, unchanged, bad, removed)."""
+        self.flush()
+        known = dict(self.conn.execute(
+            "SELECT slug, file_mtime FROM profiles WHERE dataset = ? AND source = 'import'", (dataset,)))
+        seen = set()
+        imported = unchanged = bad = 0
+        with os.scandir(profiles_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                slug = entry.name[:-5]
+                seen.add(slug)
+                mtime = entry.stat().st_mtime
+                if not force and known.get(slug) == mtime:
+                    unchanged += 1
+                    continue
+                try:
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except (json.JSONDecodeError, UnicodeDecodeError, OSError):
+                    bad += 1
+                    continue
+                self.put(dataset, slug, data, source="import", file_mtime=mtime)
+                imported += 1
+        self.flush()
+        gone = [(dataset, slug) for slug in known if slug not in seen]
+        with self.conn:
+            self.conn.executemany("DELETE FROM profiles WHERE dataset = ? AND slug = ?", gone)
+        return imported, unchanged, bad, len(gone)
+
+    def export_dir(self, dataset, out_dir):
+        """Write a dataset back out as one indented JSON file per slug. Returns the count."""
+        os.makedirs(out_dir, exist_ok=True)
+        n = 0
+        for _, slug, data in self.iter_profiles(dataset):
+            filepath = os.path.join(out_dir, f"{slug}.json")
+            tmp = filepath + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, filepath)
+            n += 1
+        return n
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+def cmd_import(store, args):
+    for name, dataset_dir in DATASETS.items():
+        if args.only and name not in args.only:
+            continue
+        profiles_dir = os.path.join(dataset_dir, "profiles")
+        if not os.path.isdir(profiles_dir):
+            print(f"  [{name}] no profiles dir — skipping")
+            continue
+        started = time.monotonic()
+        imported, unchanged, bad, removed = store.import_dir(name, profiles_dir, force=args.force)
+        urls_file = os.path.join(dataset_dir, "all_investor_urls.json")
+        url_list = load_url_list(urls_file) if os.path.exists(urls_file) else []
+        if url_list:
+            store.set_urls(name, url_list)
+        print(f"  [{name}] {imported} imported, {unchanged} unchanged, {removed} removed, {bad} unreadable, "
+              f"{len(url_list)} URLs ({time.monotonic() - started:.1f}s)")
+    print(f"\n  {store.stats['written']} rows in {store.stats['transactions']} transactions -> {store.path}")
+
+
+def cmd_stats(store, args):
+    tiers = ["complete", "good", "minimal", "garbage"]
+    print(f"  {'Dataset':<12} {'Total':>7} " + " ".join(f"{t:>9}" for t in tiers) + f" {'Missing':>8}")
+    for name, counts in sorted(store.tier_counts().items()):
+        total = sum(counts.values())
+        print(f"  {name:<12} {total:>7} " + " ".join(f"{counts.get(t, 0):>9}" for t in tiers)
+              + f" {len(store.missing(name)):>8}")
+
+
+def cmd_missing(store, args):
+    for inv in store.missing(args.dataset):
+        print(inv["url"])
+
+
+def cmd_export(store, args):
+    n = store.export_dir(args.dataset, args.out_dir)
+    print(f"  [{args.dataset}] {n} profiles -> {args.out_dir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite store for scraped investor profiles")
+    parser.add_argument("--db", default=STORE_FILE, help="Store file (default: profiles.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("import", help="Import profiles/ directories and URL lists")
+    p.add_argument("--only", nargs="+", metavar="DATASET", help="Only these datasets (e.g. Fintech SaaS)")
+    p.add_argument("--force", action="store_true", help="Re-read every file, not just changed ones")
+    p.set_defaults(func=cmd_import)
+
+    p = sub.add_parser("stats", help="Profile counts per dataset and quality tier")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("missing", help="Print URLs with no stored profile")
+    p.add_argument("dataset", choices=list(DATASETS))
+    p.set_defaults(func=cmd_missing)
+
+    p = sub.add_parser("export", help="Write a dataset as a profiles/ JSON directory")
+    p.add_argument("dataset", choices=list(DATASETS))
+    p.add_argument("out_dir")
+    p.set_defaults(func=cmd_export)
+
+    args = parser.parse_args()
+    with ProfileStore(args.db) as store:
+        args.func(store, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Background Profile Writer
+=======================================
+Moves profile writes off the asyncio event loop.
+
+A dedicated thread drains a bounded queue in batches:
+- each profile is written atomically (tmp + os.replace), then it is
+  recorded in the dataset manifest (profile_manifest.py) and its "ok"
+  record goes to the progress log, then the waiting coroutine is woken;
+  a profile counts as done only once save_profile() has returned True
+- with fsync=True each file is fsynced and the profiles directory once per
+  batch (group commit) instead of once per file
+
+When the queue is full save_profile() waits for room in a worker thread, so
+a slow disk slows the scrapers down instead of growing memory.
+
+Usage:
+    writer = ProfileWriter(PROFILES_DIR, progress=progress, manifest=manifest)
+    writer.start()
+    if await writer.save_profile(slug, data): ...
+    await writer.close()
+    log.info(writer.summary())
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+QUEUE_SIZE = 64      # profiles waiting to be written before save_profile() blocks
+BATCH_MAX = 16       # profiles written per batch
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def write_profile(profiles_dir, slug, data, fsync=False):
+    """Write one profile atomically (tmp + os.replace). Returns the bytes written."""
+    filepath = os.path.join(profiles_dir, f"{slug}.json")
+    tmp = filepath + ".tmp"
+    raw = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    with open(tmp, "wb") as f:
+        f.write(raw)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, filepath)
+    return raw
+
+
+def record_profile(manifest, slug, raw, data):
+    """Record a written profile in the dataset manifest (if any); errors are only logged."""
+    if manifest is None:
+        return
+    # The profile is on disk either way; a stale manifest entry is fixed by the next refresh
+    try:
+        manifest.record(slug, raw, data)
+    except Exception as e:
+        log.error(f"Error recording {slug} in the manifest: {e}")
+
+
+class ProfileWriter:
+    """Single writer thread for one dataset's profiles/ dir."""
+
+    def __init__(self, profiles_dir, progress=None, manifest=None,
+                 queue_size=QUEUE_SIZE, batch_max=BATCH_MAX, fsync=False):
+        self.profiles_dir = profiles_dir
+        self.progress = progress
+        self.manifest = manifest
+        self.queue_size = queue_size
+        self.batch_max = batch_max
+        self.fsync = fsync
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="profile-writer", daemon=True)
+        self._loop = None
+
+        self.latencies = []    # enqueue -> acknowledged, seconds
+        self.stats = {"written": 0, "errors": 0, "batches": 0, "max_depth": 0, "full_waits": 0}
+
+    def start(self):
+        """Start the writer thread; call from inside the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._thread.start()
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    async def _put(self, item):
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.stats["full_waits"] += 1
+            await asyncio.to_thread(self._queue.put, item)
+        self.stats["max_depth"] = max(self.stats["max_depth"], self._queue.qsize())
+
+    # -- API -------------------------------------------------------------------
+    async def save_profile(self, slug, data):
+        """Queue a profile and wait until it is on disk (and in the progress log). Returns success."""
+        fut = self._loop.create_future()
+        await self._put((slug, data, fut, time.monotonic()))
+        return await fut
+
+    async def close(self):
+        """Write everything still queued and stop the thread."""
+        await self._put(_STOP)
+        await asyncio.to_thread(self._thread.join)
+
+    # -- writer thread ---------------------------------------------------------
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_max:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            profiles = [item for item in batch if item is not _STOP]
+            if profiles:
+                self._write_profiles(profiles)
+            if _STOP in batch:
+                return
+
+    def _write_profiles(self, batch):
+        results = []
+        for slug, data, fut, queued_at in batch:
+            try:
+                raw = write_profile(self.profiles_dir, slug, data, self.fsync)
+                ok = True
+            except Exception as e:
+                log.error(f"Error saving {slug}: {e}")
+                ok = False
+            if ok:
+                record_profile(self.manifest, slug, raw, data)
+            results.append((slug, fut, queued_at, ok))
+
+        if self.fsync and any(ok for *_, ok in results):
+            try:
+                dir_fd = os.open(self.profiles_dir, os.O_RDONLY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            except OSError as e:
+                log.error(f"Error syncing {self.profiles_dir}: {e}")
+
+        # Every future is resolved, whatever the bookkeeping does: a dead writer
+        # thread would leave the scrapers waiting in save_profile() forever
+        now = time.monotonic()
+        for slug, fut, queued_at, ok in results:
+            if ok and self.progress is not None:
+                try:
+                    self.progress.done(slug)
+                except Exception as e:
+                    log.error(f"Error recording {slug} in the progress log: {e}")
+            self.stats["written" if ok else "errors"] += 1
+            self.latencies.append(now - queued_at)
+            self._loop.call_soon_threadsafe(_resolve, fut, ok)
+        self.stats["batches"] += 1
+
+    def summary(self):
+        s = self.stats
+        lat = sorted(self.latencies)
+        p50 = lat[len(lat) // 2] * 1000 if lat else 0
+        p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000 if lat else 0
+        per_batch = s["written"] / s["batches"] if s["batches"] else 0
+        return (f"{s['written']} profiles in {s['batches']} batches ({per_batch:.1f}/batch), "
+                f"{s['errors']} errors | write latency p50 {p50:.1f} ms, p95 {p95:.1f} ms | "
+                f"queue max {s['max_depth']}/{self.queue_size}, {s['full_waits']} full")
+
+
+def _resolve(fut, ok):
+    if not fut.done():
+        fut.set_result(ok)
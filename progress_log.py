@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Write-Ahead Progress Log
+======================================
+Replaces whole-file progress.json rewrites in the profile scrapers.
+
+Every state change is one JSON line appended to progress.wal.jsonl next to
+progress.json, with a single unbuffered write:
+
+    {"s": "jane-doe", "st": "start"}                  about to scrape
+    {"s": "jane-doe", "st": "ok"}                     profile file saved
+    {"s": "jane-doe", "st": "fail", "e": "timeout"}   attempt failed
+    {"s": "jane-doe", "st": "drop"}                   forget the slug
+    {"s": "jane-doe", "st": "redo", "e": "bad json"}  re-scrape it, first
+
+On startup the progress.json snapshot is loaded and the log replayed on top.
+A slug whose last record is "start" was in flight when the process died
+(kill -9, OOM, reboot); it shows up in ProgressLog.interrupted so the
+scraper can retry it first. profile_fsck.py uses "redo" to put damaged
+profiles on the same path: they come back as interrupted on the next run.
+
+Every COMPACT_EVERY records the log is rotated and a background thread
+writes a new progress.json snapshot (same "scraped"/"total_scraped" keys
+as before, so older readers still work), then deletes the rotated segment.
+Replay order is snapshot, rotated segment, live log. Applying a record
+twice gives the same state, so a crash at any point of compaction is safe.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+COMPACT_EVERY = 500    # log records between snapshots
+
+
+class ProgressLog:
+    """Scrape state for one dataset: scraped set, last failure per slug, in-flight slugs."""
+
+    def __init__(self, progress_file, compact_every=COMPACT_EVERY, fsync=False, readonly=False):
+        self.snapshot_file = progress_file
+        base = os.path.splitext(progress_file)[0]
+        self.path = base + ".wal.jsonl"
+        self.rotated_path = base + ".wal.old.jsonl"
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self.readonly = readonly
+
+        self.scraped = set()
+        self.failed = {}          # slug -> last error, cleared on success
+        self.in_flight = set()
+        # True when there is no log-format state yet (first run, or a progress.json
+        # from the old whole-file save_progress): reconcile once with the disk
+        self.needs_resync = True
+
+        self._lock = threading.Lock()
+        self._compactor = None
+        self._records = 0
+        self.stats = {"records": 0, "compactions": 0, "replayed": 0}
+
+        self._replay()
+        # Whatever was in flight at the last exit never finished
+        self.interrupted = set(self.in_flight)
+        self.in_flight.clear()
+        self._fd = None if readonly else os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    # -- replay ----------------------------------------------------------------
+    def _apply(self, slug, state, error=None):
+        if state == "start":
+            self.in_flight.add(slug)
+        elif state == "ok":
+            self.in_flight.discard(slug)
+            self.scraped.add(slug)
+            self.failed.pop(slug, None)
+        elif state == "fail":
+            self.in_flight.discard(slug)
+            self.failed[slug] = error or ""
+        elif state == "drop":
+            self.in_flight.discard(slug)
+            self.scraped.discard(slug)
+            self.failed.pop(slug, None)
+        elif state == "redo":
+            self.scraped.discard(slug)
+            self.failed[slug] = error or ""
+            self.in_flight.add(slug)
+
+    def _replay(self):
+        if os.path.exists(self.snapshot_file):
+            try:
+                with open(self.snapshot_file, "r") as f:
+                    data = json.load(f)
+                self.scraped = set(data.get("scraped", []))
+                self.failed = dict(data.get("failed", {}))
+                self.in_flight = set(data.get("in_flight", []))
+                self.needs_resync = "format" not in data
+            except Exception:
+                pass
+        for path in (self.rotated_path, self.path):
+            if not os.path.exists(path):
+                continue
+            self.needs_resync = False
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue   # torn line from a hard kill
+                    self._apply(rec["s"], rec["st"], rec.get("e"))
+                    self.stats["replayed"] += 1
+
+    # -- recording -------------------------------------------------------------
+    def _append(self, slug, state, error=None):
+        rec = {"s": slug, "st": state}
+        if error:
+            rec["e"] = str(error)[:200]
+        line = (json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            self._apply(slug, state, rec.get("e"))
+            os.write(self._fd, line)
+            if self.fsync:
+                os.fsync(self._fd)
+            self._records += 1
+            self.stats["records"] += 1
+            due = self._records >= self.compact_every
+        if due:
+            self.compact(background=True)
+
+    def start(self, slug):
+        self._append(slug, "start")
+
+    def done(self, slug):
+        self._append(slug, "ok")
+
+    def fail(self, slug, error):
+        self._append(slug, "fail", error)
+
+    def drop(self, slug):
+        self._append(slug, "drop")
+
+    def requeue(self, slug, reason):
+        """Forget a scraped slug and have the next run scrape it before anything else."""
+        self._append(slug, "redo", reason)
+
+    def resync(self, profiles_dir, slugs, on_disk=None):
+        """Mark slugs whose profile file exists as scraped, and drop scraped slugs
+        whose file is gone. One directory listing, not a stat per slug; callers
+        holding a dataset manifest pass its slugs as on_disk and skip even that."""
+        if on_disk is None:
+            on_disk = {f[:-5] for f in os.listdir(profiles_dir) if f.endswith(".json")}
+        added = dropped = 0
+        for slug in slugs:
+            if slug in on_disk and slug not in self.scraped:
+                self.done(slug)
+                added += 1
+        for slug in list(self.scraped):
+            if slug not in on_disk:
+                self.drop(slug)
+                dropped += 1
+        return added, dropped
+
+    # -- compaction ------------------------------------------------------------
+    def _write_snapshot(self, scraped, failed, in_flight):
+        tmp = self.snapshot_file + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "format": "wal",
+                "scraped": sorted(scraped),
+                "total_scraped": len(scraped),
+                "failed": failed,
+                "in_flight": sorted(in_flight),
+                "compacted_at": datetime.now().isoformat(),
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_file)
+
+    def compact(self, background=False):
+        """Rotate the log and fold everything so far into progress.json."""
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            if os.path.exists(self.rotated_path):
+                # A previous compaction died before finishing; its records are still
+                # needed, so fold them in now together with the live log.
+                with open(self.rotated_path, "ab") as old, open(self.path, "rb") as live:
+                    old.write(b"\n" + live.read())   # newline seals a torn last line
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.rotated_path)
+            os.close(self._fd)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._records = 0
+            state = (set(self.scraped), dict(self.failed), set(self.in_flight))
+
+        def work():
+            self._write_snapshot(*state)
+            os.remove(self.rotated_path)
+            self.stats["compactions"] += 1
+
+        if background:
+            self._compactor = threading.Thread(target=work, name="progress-compactor", daemon=True)
+            self._compactor.start()
+        else:
+            work()
+
+    def close(self):
+        """Wait for background compaction, write a final snapshot and close the log."""
+        if self.readonly:
+            return
+        if self._compactor is not None:
+            self._compactor.join()
+        self.compact()
+        os.close(self._fd)
+
+    def summary(self):
+        return (f"{len(self.scraped)} scraped, {len(self.failed)} failing, "
+                f"{self.stats['records']} log records, {self.stats['compactions']} compactions")
@@ -4,13 +4,12 @@ Comprehensive Quality Analysis of Scraped Investor Profiles
 Analyzes all JSON profiles in data/profiles/ directory.
 """
 
-import json
-import os
-import sys
 from collections import defaultdict
 from pathlib import Path
 
-PROFILES_DIR = Path("/Users/apple/Desktop/Techweer/SAUD BHAI/Scraping VC/data/profiles")
+from profile_corpus import Corpus
+
+PROFILES_DIR = Path(__file__).resolve().parent / "data" / "profiles"
 
 # Garbage indicators in names
 GARBAGE_INDICATORS = [
@@ -163,8 +162,8 @@ def classify_profile(fields):
 
 
 def main():
-    json_files = sorted(PROFILES_DIR.glob("*.json"))
-    total = len(json_files)
+    corpus = Corpus.from_profiles_dir(PROFILES_DIR)
+    total = len(corpus)
 
     print("=" * 80)
     print("  COMPREHENSIVE INVESTOR PROFILE QUALITY ANALYSIS")
@@ -177,17 +176,13 @@ def main():
 
     # Parse all profiles
     malformed = []
-    profiles = {}  # slug -> (fields, data)
-    
-    for fpath in json_files:
-        slug = fpath.stem
-        try:
-            with open(fpath, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            fields = analyze_profile(data)
-            profiles[slug] = (fields, data)
-        except (json.JSONDecodeError, UnicodeDecodeError) as e:
-            malformed.append((slug, str(e)))
+    profiles = {}  # slug -> fields (analyze_profile runs in the corpus workers)
+
+    for item in corpus.iter(analyze_profile):
+        if item.error:
+            malformed.append((item.slug, item.error))
+        else:
+            profiles[item.slug] = item.data
 
     # 2. Malformed JSON
     print(f"2. MALFORMED JSON FILES: {len(malformed)}")
@@ -200,7 +195,7 @@ def main():
 
     # 3. Quality tiers
     tiers = defaultdict(list)
-    for slug, (fields, data) in profiles.items():
+    for slug, fields in profiles.items():
         tier = classify_profile(fields)
         tiers[tier].append(slug)
 
@@ -239,7 +234,7 @@ def main():
     ]
 
     for field_key, label in field_labels:
-        count = sum(1 for slug, (fields, _) in profiles.items() if fields.get(field_key, False))
+        count = sum(1 for slug, fields in profiles.items() if fields.get(field_key, False))
         pct = (count / parsed_total * 100) if parsed_total > 0 else 0
         print(f"   {label:<40} {count:>7} {'of':>3} {parsed_total:>5}  {pct:>7.1f}%")
     print()
@@ -253,7 +248,7 @@ def main():
         print(f"   {'#':<5} {'Slug':<50} {'Name (truncated)'}")
         print(f"   {'-'*5} {'-'*50} {'-'*40}")
         for i, slug in enumerate(sorted(garbage_list), 1):
-            fields, data = profiles[slug]
+            fields = profiles[slug]
             name_val = fields.get("name_value", "<NONE>")
             if name_val is None:
                 name_val = "<null>"
@@ -269,7 +264,7 @@ def main():
     # 6. Suspiciously short names
     print("6. PROFILES WITH SUSPICIOUSLY SHORT NAMES (< 3 chars, excluding empty):")
     short_names = []
-    for slug, (fields, data) in profiles.items():
+    for slug, fields in profiles.items():
         name_val = fields.get("name_value", "")
         if name_val and isinstance(name_val, str):
             stripped = name_val.strip()
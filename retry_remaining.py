@@ -8,7 +8,6 @@ fresh browser every 25 profiles, non-headless option for Cloudflare.
 """
 
 import asyncio
-import json
 import os
 import sys
 import logging
@@ -17,6 +16,14 @@ from datetime import datetime
 
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from failure_ledger import FailureLedger
+from profile_manifest import Manifest
+from profile_writer import ProfileWriter
+from progress_log import ProgressLog
+from scrape_profiles import wait_for_settle
+from url_registry import UrlRegistry, dataset_name
+from url_journal import load_url_list
+
 # =============================================================================
 # CONFIG
 # =============================================================================
@@ -32,7 +39,7 @@ LOG_FILE = os.path.join(SCRIPT_DIR, "retry_remaining.log")
 PAGE_TIMEOUT = 60000      # 60s
 H1_TIMEOUT = 30000        # 30s
 CONTENT_TIMEOUT = 20000   # 20s
-EXTRA_WAIT = 4000         # 4s buffer
+EXTRA_WAIT = 4000         # 4s cap on waiting for lazy content (DOM settle, scrape_profiles.py)
 BETWEEN_PROFILES = 6      # seconds between each profile
 RESTART_EVERY = 25        # restart browser every N profiles
 RESTART_COOLDOWN = 60     # seconds after restart
@@ -210,7 +217,6 @@ SCRAPE_JS = r"""
 }
 """
 
-
 # =============================================================================
 # HELPERS
 # =============================================================================
@@ -248,41 +254,18 @@ def is_garbage_name(name):
     )
 
 
-def save_profile(slug, data):
-    filepath = os.path.join(PROFILES_DIR, f"{slug}.json")
-    tmp = filepath + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    os.replace(tmp, filepath)
-
-
-def load_progress():
-    if os.path.exists(PROGRESS_FILE):
-        try:
-            with open(PROGRESS_FILE, "r") as f:
-                return set(json.load(f).get("scraped", []))
-        except Exception:
-            pass
-    return set()
-
-
-def save_progress(scraped_set):
-    tmp = PROGRESS_FILE + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump({"scraped": sorted(scraped_set), "total_scraped": len(scraped_set)}, f)
-    os.replace(tmp, PROGRESS_FILE)
-
-
 def profile_exists(slug):
     return os.path.exists(os.path.join(PROFILES_DIR, f"{slug}.json"))
 
 
-def get_remaining():
+def get_remaining(manifest):
     """Get list of URLs that don't have a profile file yet."""
-    with open(ALL_URLS_FILE, "r") as f:
-        all_urls = json.load(f)
+    # Snapshot plus any URLs still in the collector journal
+    all_urls = load_url_list(ALL_URLS_FILE)
 
-    existing = {f.replace(".json", "") for f in os.listdir(PROFILES_DIR) if f.endswith(".json")}
+    # The manifest only re-reads files changed since it was last updated
+    manifest.refresh()
+    existing = manifest.slugs()
     remaining = [inv for inv in all_urls if inv["slug"] not in existing]
     return remaining, existing
 
@@ -338,8 +321,8 @@ async def scrape_one(context, slug, url, attempt=1):
         except PlaywrightTimeout:
             pass
 
-        # Extra buffer
-        await page.wait_for_timeout(EXTRA_WAIT)
+        # Wait for lazy content to stop changing
+        await wait_for_settle(page, EXTRA_WAIT)
 
         # Check page title for error pages
         title = await page.title()
@@ -355,7 +338,7 @@ async def scrape_one(context, slug, url, attempt=1):
                 await page.close()
                 page = await context.new_page()
                 await page.goto(url, wait_until="networkidle", timeout=PAGE_TIMEOUT)
-                await page.wait_for_timeout(EXTRA_WAIT + 2000)
+                await wait_for_settle(page, EXTRA_WAIT + 2000)
                 data = await page.evaluate(SCRAPE_JS)
                 name = data.get("basicInfo", {}).get("name", "")
                 if is_garbage_name(name):
@@ -383,10 +366,17 @@ async def scrape_one(context, slug, url, attempt=1):
 async def run():
     os.makedirs(PROFILES_DIR, exist_ok=True)
 
-    remaining, existing = get_remaining()
-    scraped_set = load_progress()
-    # Sync with disk
-    scraped_set = scraped_set | existing
+    manifest = Manifest.for_profiles_dir(PROFILES_DIR)
+    remaining, existing = get_remaining(manifest)
+    # Shared write-ahead progress log with scrape_profiles.py; sync the files
+    # the manifest knows about into it
+    progress = ProgressLog(PROGRESS_FILE)
+    for slug in existing - progress.scraped:
+        progress.done(slug)
+    # Failure ledger shared with scrape_profiles.py; slugs with a file are not failing
+    ledger = FailureLedger(FAILED_FILE)
+    for slug in ledger.slugs() & existing:
+        ledger.clear(slug)
 
     log.info("=" * 60)
     log.info("  NFX SIGNAL - RETRY REMAINING PROFILES")
@@ -396,16 +386,37 @@ async def run():
 
     if not remaining:
         log.info("Nothing to scrape! All profiles exist.")
+        progress.close()
+        manifest.close()
+        ledger.close()
         return
 
-    # Shuffle to avoid hitting same part of the site
+    # Shuffle to avoid hitting same part of the site; slugs that failed the most go last
     random.shuffle(remaining)
+    remaining.sort(key=lambda inv: ledger.entries[inv["slug"]]["attempts"] if inv["slug"] in ledger else 0)
 
     succeeded = 0
     failed = 0
-    still_failed = []
     consecutive_fails = 0
 
+    # Profile writes run on a background thread, which also logs "ok" to progress
+    writer = ProfileWriter(PROFILES_DIR, progress=progress, manifest=manifest)
+    writer.start()
+
+    # Investors with a fresh profile in another list are copied, not loaded again
+    registry = UrlRegistry(dataset=dataset_name(DATA_DIR))
+    still_remaining = []
+    for inv in remaining:
+        data = registry.reuse(inv["slug"])
+        if data is not None and await writer.save_profile(inv["slug"], data):
+            ledger.clear(inv["slug"])
+            succeeded += 1
+        else:
+            still_remaining.append(inv)
+    if len(still_remaining) < len(remaining):
+        log.info(f"  Reused {len(remaining) - len(still_remaining)} profiles from other lists")
+    remaining = still_remaining
+
     async with async_playwright() as p:
         browser, context = await create_browser(p)
         profiles_since_restart = 0
@@ -416,16 +427,20 @@ async def run():
 
             if profile_exists(slug):
                 log.info(f"  [{i}/{len(remaining)}] SKIP {slug} (already exists)")
-                scraped_set.add(slug)
+                progress.done(slug)
+                ledger.clear(slug)
                 continue
 
             log.info(f"  [{i}/{len(remaining)}] Scraping {slug}...")
+            progress.start(slug)
 
             data, error = await scrape_one(context, slug, url)
 
+            if data and not error and not await writer.save_profile(slug, data):
+                error = "save failed"
+
             if data and not error:
-                save_profile(slug, data)
-                scraped_set.add(slug)
+                ledger.clear(slug)
                 succeeded += 1
                 consecutive_fails = 0
                 name = data.get("basicInfo", {}).get("name", "")
@@ -433,13 +448,10 @@ async def run():
             else:
                 failed += 1
                 consecutive_fails += 1
-                still_failed.append({"slug": slug, "url": url, "error": error, "timestamp": datetime.now().isoformat()})
+                ledger.fail(slug, url, error)
+                progress.fail(slug, error)
                 log.warning(f"    FAIL - {error}")
 
-            # Save progress every 10
-            if i % 10 == 0:
-                save_progress(scraped_set)
-
             profiles_since_restart += 1
 
             # Restart browser periodically
@@ -477,22 +489,25 @@ async def run():
         except Exception:
             pass
 
-    # Final save
-    save_progress(scraped_set)
+    await writer.close()
 
-    # Update failed_profiles.json with only the still-failed ones
-    with open(FAILED_FILE, "w") as f:
-        json.dump({"failed": still_failed}, f, indent=2)
+    # Final snapshots of the progress log and failure ledger
+    progress.close()
+    ledger.close()
 
     # Final report
-    remaining_after, existing_after = get_remaining()
+    remaining_after, existing_after = get_remaining(manifest)
+    manifest.close()
     log.info("")
     log.info("=" * 60)
     log.info("  RETRY COMPLETE")
     log.info(f"  Succeeded:          {succeeded}")
     log.info(f"  Still failed:       {failed}")
+    log.info(f"  Failure ledger:     {ledger.summary()}")
     log.info(f"  Total on disk now:  {len(existing_after)}")
     log.info(f"  Still remaining:    {len(remaining_after)}")
+    log.info(f"  Writer:             {writer.summary()}")
+    log.info(f"  URL registry:       {registry.summary()}")
     log.info("=" * 60)
 
 
@@ -14,12 +14,12 @@ HOW TO START CHROME (run once before this script):
 
 - INSTANT skip on failure — no per-failure 15s stalls
 - One bulk pause (30s) every 5 consecutive fails, then keeps moving
-- Saves progress every 10 successes
+- Logs every start/success/failure to the progress write-ahead log
 - Up to 8 retry rounds for failures (shuffled to vary request pattern)
 """
 
 import os
-import json
+import sys
 import time
 import logging
 import traceback
@@ -32,6 +32,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, InvalidSessionIdException, WebDriverException
 
+from failure_ledger import FailureLedger
+from profile_manifest import Manifest
+from profile_writer import record_profile, write_profile
+from progress_log import ProgressLog
+from url_registry import UrlRegistry, dataset_name
+from url_journal import load_url_list
+
 # =============================================================================
 # CONFIG
 # =============================================================================
@@ -53,7 +60,6 @@ PAGE_LOAD_WAIT        = 12
 SUCCESS_DELAY         = 0.5
 CONSEC_FAIL_PAUSE     = 30
 CONSEC_FAIL_THRESHOLD = 5
-SAVE_EVERY            = 10
 MAX_RETRY_ROUNDS      = 8
 
 USER_AGENTS = [
@@ -276,46 +282,14 @@ def is_session_expired(driver):
 # =============================================================================
 # FILE I/O
 # =============================================================================
-def load_progress():
-    if os.path.exists(PROGRESS_FILE):
-        try:
-            with open(PROGRESS_FILE) as f:
-                return set(json.load(f).get("scraped", []))
-        except Exception:
-            pass
-    return set()
-
-
-def save_progress(scraped_set):
-    tmp = PROGRESS_FILE + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump({"scraped": sorted(scraped_set), "total_scraped": len(scraped_set)}, f)
-    os.replace(tmp, PROGRESS_FILE)
-
-
-def save_failed(failed_slugs, url_lookup):
-    tmp = FAILED_FILE + ".tmp"
-    data = {"failed": [
-        {"slug": s, "url": url_lookup.get(s, f"https://signal.nfx.com/investors/{s}"),
-         "timestamp": datetime.now().isoformat()}
-        for s in failed_slugs
-    ]}
-    with open(tmp, "w") as f:
-        json.dump(data, f, indent=2)
-    os.replace(tmp, FAILED_FILE)
-
-
-def save_profile(slug, data):
-    filepath = os.path.join(PROFILES_DIR, f"{slug}.json")
+def save_profile(slug, data, manifest=None):
     try:
-        tmp = filepath + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        os.replace(tmp, filepath)
-        return True
+        raw = write_profile(PROFILES_DIR, slug, data)
     except Exception as e:
         log.error(f"Save error {slug}: {e}")
         return False
+    record_profile(manifest, slug, raw, data)
+    return True
 
 
 # =============================================================================
@@ -457,11 +431,11 @@ def scrape_one(driver, slug, url):
 # =============================================================================
 # PASS RUNNER
 # =============================================================================
-def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
+def run_pass(driver, to_scrape, progress, ledger, url_lookup, pass_name="MAIN", manifest=None):
+    scraped_set = progress.scraped
     total = len(to_scrape)
     failed_slugs = []
     ok_count = 0
-    save_counter = 0
     consec_fails = 0
 
     log.info(f"  {pass_name}: {total} profiles")
@@ -484,6 +458,7 @@ def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
                 failed_slugs.extend(x["slug"] for x in to_scrape[i:] if x["slug"] not in scraped_set)
                 break
 
+        progress.start(slug)
         try:
             data, error = scrape_one(driver, slug, url)
         except (InvalidSessionIdException, WebDriverException) as e:
@@ -511,10 +486,10 @@ def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
                 break
 
         if data and is_valid_profile(data):
-            if save_profile(slug, data):
-                scraped_set.add(slug)
+            if save_profile(slug, data, manifest):
+                progress.done(slug)
+                ledger.clear(slug)
                 ok_count += 1
-                save_counter += 1
                 consec_fails = 0
                 name = (data.get("basicInfo") or {}).get("name", "?")
 
@@ -523,16 +498,17 @@ def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
                 else:
                     log.info(f"  OK {slug} ({name})")
 
-                if save_counter >= SAVE_EVERY:
-                    save_progress(scraped_set)
-                    save_counter = 0
 
                 time.sleep(SUCCESS_DELAY + random.uniform(0, 0.3))
             else:
+                progress.fail(slug, "save failed")
+                ledger.fail(slug, url, "save failed")
                 failed_slugs.append(slug)
         else:
             err = error or f"invalid:{(data or {}).get('basicInfo', {}).get('name','') if data else 'nodata'}"
             log.warning(f"  FAIL {slug}: {err}")
+            progress.fail(slug, err)
+            ledger.fail(slug, url, err)
             failed_slugs.append(slug)
             consec_fails += 1
 
@@ -542,7 +518,6 @@ def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
                 time.sleep(CONSEC_FAIL_PAUSE)
             # NO per-failure delay — move to next immediately
 
-    save_progress(scraped_set)
     log.info(f"  {pass_name} done: {ok_count} OK, {len(failed_slugs)} failed")
     try: driver.quit()
     except: pass
@@ -555,19 +530,43 @@ def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
 def main():
     os.makedirs(PROFILES_DIR, exist_ok=True)
 
-    with open(ALL_URLS_FILE) as f:
-        all_urls = json.load(f)
+    # Snapshot plus any URLs still in the collector journal
+    all_urls = load_url_list(ALL_URLS_FILE)
 
     url_lookup = {inv["slug"]: inv["url"] for inv in all_urls}
 
-    # Sync progress with disk
-    scraped_set = load_progress()
-    for inv in all_urls:
-        if os.path.exists(os.path.join(PROFILES_DIR, f"{inv['slug']}.json")):
-            scraped_set.add(inv["slug"])
-    save_progress(scraped_set)
+    # Progress is a write-ahead log (progress_log.py); reconcile with the
+    # files on disk only on its first run or with --resync
+    progress = ProgressLog(PROGRESS_FILE)
+    scraped_set = progress.scraped
+    # One entry per failing slug with attempts and backoff (failure_ledger.py)
+    ledger = FailureLedger(FAILED_FILE)
+    if progress.needs_resync or "--resync" in sys.argv:
+        added, dropped = progress.resync(PROFILES_DIR, [inv["slug"] for inv in all_urls])
+        log.info(f"Progress resynced with disk: +{added} found, -{dropped} missing")
 
     to_scrape = [inv for inv in all_urls if inv["slug"] not in scraped_set]
+    if progress.interrupted:
+        to_scrape.sort(key=lambda inv: inv["slug"] not in progress.interrupted)
+
+    # Every profile written is recorded in the dataset manifest (profile_manifest.py);
+    # it is built by a full scan only the first time or with --resync
+    manifest = Manifest(DATA_DIR)
+    if not manifest.exists or "--resync" in sys.argv:
+        added, changed, removed, _ = manifest.refresh()
+        log.info(f"Manifest refreshed: +{added} new, {changed} changed, -{removed} removed")
+
+    # Investors with a fresh profile in another list are copied, not loaded again
+    registry = UrlRegistry(dataset=dataset_name(DATA_DIR))
+    remaining = []
+    for inv in to_scrape:
+        data = registry.reuse(inv["slug"])
+        if data is not None and save_profile(inv["slug"], data, manifest):
+            progress.done(inv["slug"])
+            ledger.clear(inv["slug"])
+        else:
+            remaining.append(inv)
+    to_scrape = remaining
 
     log.info("=" * 60)
     log.info("  NFX SIGNAL - FINTECH SEED SCRAPER (REAL CHROME CDP)")
@@ -579,10 +578,13 @@ def main():
 
     if not to_scrape:
         log.info("All done!")
+        progress.close()
+        ledger.close()
+        manifest.close()
         return
 
     # MAIN PASS
-    failed = run_pass(connect_to_chrome(), to_scrape, scraped_set, url_lookup, "MAIN PASS")
+    failed = run_pass(connect_to_chrome(), to_scrape, progress, ledger, url_lookup, "MAIN PASS", manifest)
 
     # RETRY ROUNDS
     for rnd in range(1, MAX_RETRY_ROUNDS + 1):
@@ -598,11 +600,13 @@ def main():
         retry_list = [{"slug": s, "url": url_lookup.get(s, f"https://signal.nfx.com/investors/{s}")}
                       for s in retry_slugs]
         random.shuffle(retry_list)
-        failed = run_pass(connect_to_chrome(), retry_list, scraped_set, url_lookup, f"RETRY {rnd}")
+        failed = run_pass(connect_to_chrome(), retry_list, progress, ledger, url_lookup, f"RETRY {rnd}", manifest)
 
     # FINAL REPORT
     final_failed = [s for s in set(failed) if s not in scraped_set]
-    save_failed(final_failed, url_lookup)
+    progress.close()
+    ledger.close()
+    manifest.close()
 
     on_disk = sum(1 for f in os.listdir(PROFILES_DIR) if f.endswith(".json"))
 
@@ -613,6 +617,8 @@ def main():
     log.info(f"  On disk:       {on_disk}")
     log.info(f"  In progress:   {len(scraped_set)}")
     log.info(f"  Final failed:  {len(final_failed)}")
+    log.info(f"  Ledger:        {ledger.summary()}")
+    log.info(f"  Registry:      {registry.summary()}")
     log.info(f"  Output:        {PROFILES_DIR}")
     log.info("=" * 60)
 
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Multi-Dataset Profile Scraper (Headless)
+======================================================
+One process, one Chrome and one rate limit for several datasets, instead of
+scrape_profiles.py / scrape_saas_profiles.py / scrape_enterprise_profiles.py /
+scrape_fintech_profiles.py fighting over the same budget.
+
+- Datasets are given as DATA_DIR[:WEIGHT]; each keeps its own
+  all_investor_urls.json, profiles/, progress log, failure ledger and
+  manifest, exactly as the single-dataset scrapers leave them.
+- Fair share: the next page goes to the dataset with the lowest
+  pages/weight served so far (stride scheduling), so a weight-2 dataset
+  gets twice the page loads of a weight-1 dataset while both have work.
+- An investor queued by several datasets is loaded once and written to
+  each of them; investors with a fresh profile elsewhere are copied first
+  (url_registry.py).
+- One page pool, one AIMD concurrency controller and one page-start rate
+  limiter (PAGES_PER_MINUTE) are shared by every dataset. Page scraping,
+  validation and browser restarts are scrape_profiles.py's.
+
+Run:
+    python scrape_multi.py                                   # all four datasets, weight 1
+    python scrape_multi.py data-saas:2 data-fintech-seed:1
+    python scrape_multi.py data:1 data-saas:1 --pages-per-minute 30
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import time
+import traceback
+from collections import deque
+
+from playwright.async_api import async_playwright
+
+from failure_ledger import FailureLedger
+from profile_manifest import Manifest
+from profile_writer import ProfileWriter
+from progress_log import ProgressLog
+from scrape_profiles import (
+    AIMDController, BROWSER_RESTART_COOLDOWN, MAX_CONSECUTIVE_FAILURES,
+    PREVENTIVE_RESTART_PROFILES, PAGE_LOAD_TIMEOUT, H1_TIMEOUT, CONTENT_TIMEOUT, EXTRA_WAIT,
+    RETRY_PAGE_TIMEOUT, RETRY_H1_TIMEOUT, RETRY_CONTENT_TIMEOUT, RETRY_EXTRA_WAIT, MAX_WORKERS,
+    classify_failure, create_browser_context, is_cloudflare_text, is_garbage_name, restart_browser,
+    scrape_single_page,
+)
+from url_journal import load_url_list
+from url_registry import UrlRegistry, dataset_name
+
+# =============================================================================
+# CONFIG
+# =============================================================================
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LOG_FILE = os.path.join(SCRIPT_DIR, "scraper_multi.log")
+
+DEFAULT_DATASETS = ["data", "data-saas", "data-enterprise-seed", "data-fintech-seed"]
+PAGES_PER_MINUTE = 40        # page loads started per minute across every dataset
+WORKER_JITTER = 2.0          # max random pause after each profile; pacing is the limiter's job
+
+MAIN_TIMEOUTS = (PAGE_LOAD_TIMEOUT, H1_TIMEOUT, CONTENT_TIMEOUT, EXTRA_WAIT)
+RETRY_TIMEOUTS = (RETRY_PAGE_TIMEOUT, RETRY_H1_TIMEOUT, RETRY_CONTENT_TIMEOUT, RETRY_EXTRA_WAIT)
+
+log = logging.getLogger(__name__)
+
+
+# =============================================================================
+# DATASETS
+# =============================================================================
+class DatasetRun:
+    """One dataset's queue and state files inside a multi-dataset run."""
+
+    def __init__(self, data_dir, weight=1.0):
+        self.data_dir = os.path.abspath(data_dir)
+        self.name = dataset_name(self.data_dir) or os.path.basename(self.data_dir)
+        self.weight = weight
+        self.profiles_dir = os.path.join(self.data_dir, "profiles")
+        self.urls_file = os.path.join(self.data_dir, "all_investor_urls.json")
+
+        self.pending = deque()
+        self.pass_value = 0.0        # pages served / weight
+        self.stats = {"pages": 0, "scraped": 0, "shared": 0, "reused": 0, "failed": 0}
+
+    def open(self, registry, resync=False):
+        """Load progress, ledger and manifest, queue what is left, start the writer."""
+        os.makedirs(self.profiles_dir, exist_ok=True)
+        self.all_urls = load_url_list(self.urls_file)
+        self.progress = ProgressLog(os.path.join(self.data_dir, "progress.json"))
+        self.ledger = FailureLedger(os.path.join(self.data_dir, "failed_profiles.json"))
+        self.manifest = Manifest(self.data_dir)
+        if not self.manifest.exists or resync:
+            self.manifest.refresh()
+        if self.progress.needs_resync or resync:
+            self.progress.resync(self.profiles_dir, [inv["slug"] for inv in self.all_urls],
+                                 on_disk=self.manifest.slugs())
+
+        to_scrape = [inv for inv in self.all_urls if inv["slug"] not in self.progress.scraped]
+        backing_off = self.ledger.slugs() - {e["slug"] for e in self.ledger.eligible()}
+        to_scrape.sort(key=lambda inv: (inv["slug"] not in self.progress.interrupted, inv["slug"] in backing_off))
+        self.writer = ProfileWriter(self.profiles_dir, progress=self.progress, manifest=self.manifest)
+        self.writer.start()
+        self.registry = registry
+        self.pending.extend(to_scrape)
+
+    async def save(self, slug, data):
+        if await self.writer.save_profile(slug, data):
+            self.ledger.clear(slug)
+            return True
+        return False
+
+    def fail(self, inv, error):
+        self.progress.fail(inv["slug"], error)
+        self.ledger.fail(inv["slug"], inv["url"], error)
+        self.stats["failed"] += 1
+
+    async def reuse_pass(self):
+        """Copy investors that another dataset already holds a fresh profile of."""
+        remaining = deque()
+        for inv in self.pending:
+            data = self.registry.reuse(inv["slug"], dataset=self.name)
+            if data is not None and await self.save(inv["slug"], data):
+                self.stats["reused"] += 1
+            else:
+                remaining.append(inv)
+        self.pending = remaining
+
+    async def close(self):
+        await self.writer.close()
+        self.progress.close()
+        self.ledger.close()
+        self.manifest.close()
+
+    def report(self):
+        s = self.stats
+        missing = len({inv["slug"] for inv in self.all_urls} - self.manifest.slugs())
+        log.info(f"  [{self.name}] weight {self.weight:g}: {s['pages']} pages, {s['scraped']} scraped, "
+                 f"{s['shared']} from another dataset's page, {s['reused']} reused, {s['failed']} failed, "
+                 f"{missing} missing | ledger: {self.ledger.summary()}")
+
+
+class FairShareScheduler:
+    """Stride scheduling over datasets; each slug is handed out once for all datasets wanting it."""
+
+    def __init__(self, runs):
+        self.runs = runs
+        self.wanted = {}             # slug -> [runs that still need it]
+        for run in runs:
+            for inv in run.pending:
+                self.wanted.setdefault(inv["slug"], []).append(run)
+
+    @property
+    def remaining(self):
+        return len(self.wanted)
+
+    @property
+    def pending(self):
+        return any(r.pending for r in self.runs)
+
+    def next(self):
+        """(run charged for the page, inv, [runs to save it for]) or None when all queues are empty."""
+        while True:
+            candidates = [r for r in self.runs if r.pending]
+            if not candidates:
+                return None
+            run = min(candidates, key=lambda r: r.pass_value)
+            inv = run.pending.popleft()
+            wanting = [r for r in self.wanted.pop(inv["slug"], []) if inv["slug"] not in r.progress.scraped]
+            if not wanting:
+                continue
+            run.pass_value += 1.0 / run.weight
+            run.stats["pages"] += 1
+            wanting.sort(key=lambda r: r is not run)
+            return run, inv, wanting
+
+    def requeue(self, runs, inv):
+        """Put a blocked slug back for later, for every dataset that wanted it."""
+        self.wanted[inv["slug"]] = list(runs)
+        for run in runs:
+            run.pending.append(inv)
+
+
+class RateLimiter:
+    """Spaces page-load starts at least 60/per_minute seconds apart across all workers."""
+
+    def __init__(self, per_minute=PAGES_PER_MINUTE):
+        self.min_interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next_start = 0.0
+        self.waited = 0.0
+
+    async def wait(self):
+        if self.min_interval <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                self.waited += wait
+                now += wait
+            self._next_start = now + self.min_interval
+
+
+# =============================================================================
+# SCRAPE PASS
+# =============================================================================
+async def run_pass(p, session, scheduler, limiter, controller, timeouts, max_workers, label,
+                   requeue_blocked=True):
+    """
+    Scrape until every dataset queue is empty. Returns pages loaded.
+    With requeue_blocked, the slugs of a blocked round go back into the
+    queues; without it (the retry pass) each slug is tried once and its
+    failure stays in the ledger.
+    """
+    slots = asyncio.Condition()
+    gate = asyncio.Event()
+    gate.set()
+    idle = asyncio.Event()
+    idle.set()
+    hold_lock = asyncio.Lock()
+    state = {"in_flight": 0, "active": 0, "consecutive_failures": 0, "streak_round": max_workers, "blocked_rounds": 0,
+             "since_restart": 0, "pages": 0}
+    failed_streak = []               # (runs, inv) that failed since the last success
+
+    async def hold_workers(wait_time, restart):
+        async with hold_lock:
+            gate.clear()
+            await idle.wait()
+            await asyncio.sleep(wait_time)
+            if restart:
+                session["browser"], _, session["pool"] = await restart_browser(p, session["browser"], session["pool"])
+            gate.set()
+
+    async def worker():
+        while True:
+            await gate.wait()
+            async with slots:
+                # Empty queues only end the pass once no worker holds a slug it could re-queue
+                await slots.wait_for(lambda: state["in_flight"] < min(controller.limit, max_workers)
+                                     and (scheduler.pending or state["active"] == 0))
+                if not gate.is_set():
+                    continue
+                picked = scheduler.next()
+                if picked is None:
+                    if state["active"]:
+                        continue
+                    return
+                run, inv, runs = picked
+                state["in_flight"] += 1
+                state["active"] += 1
+                idle.clear()
+
+            slug = inv["slug"]
+            for r in runs:
+                r.progress.start(slug)
+            await limiter.wait()
+            started = time.monotonic()
+            try:
+                data, error = await scrape_single_page(session["pool"], slug, inv["url"], *timeouts)
+            except Exception as e:
+                data, error = None, str(e)[:200]
+            finally:
+                state["in_flight"] -= 1
+                if state["in_flight"] == 0:
+                    idle.set()
+            latency = time.monotonic() - started
+            state["since_restart"] += 1
+            state["pages"] += 1
+
+            if not error:
+                name = data.get("basicInfo", {}).get("name", "")
+                if is_cloudflare_text(name):
+                    error = f"cloudflare: {name}"
+                elif is_garbage_name(name):
+                    error = f"garbage name: {name}"
+
+            if error:
+                log.warning(f"  FAIL [{run.name}] {slug}: {error[:60]}")
+                for r in runs:
+                    r.fail(inv, error)
+                if state["consecutive_failures"] == 0:
+                    # A round is the concurrency in force when the streak began
+                    state["streak_round"] = min(controller.limit, max_workers)
+                state["consecutive_failures"] += 1
+                failed_streak.append((runs, inv))
+                controller.record(classify_failure(error), latency)
+            else:
+                saved = []
+                for r in runs:
+                    if await r.save(slug, data):
+                        saved.append(r.name)
+                        r.stats["scraped" if r is run else "shared"] += 1
+                    else:
+                        r.fail(inv, "save failed")
+                state["consecutive_failures"] = 0
+                state["blocked_rounds"] = 0
+                failed_streak.clear()
+                controller.record("ok", latency)
+                log.info(f"  OK   [{', '.join(saved)}] {slug} ({data['basicInfo'].get('name', '')}) "
+                         f"| ~{scheduler.remaining} left")
+
+            blocked = state["consecutive_failures"] >= state["streak_round"]
+            if blocked:
+                state["consecutive_failures"] = 0
+                state["blocked_rounds"] += 1
+                if requeue_blocked:
+                    for blocked_runs, blocked_inv in failed_streak:
+                        scheduler.requeue(blocked_runs, blocked_inv)
+                failed_streak.clear()
+
+            async with slots:
+                state["active"] -= 1
+                slots.notify_all()
+
+            if blocked:
+                if state["blocked_rounds"] >= MAX_CONSECUTIVE_FAILURES:
+                    log.warning(f"  {state['blocked_rounds']} consecutive blocked rounds — RESTARTING BROWSER "
+                                f"+ waiting {BROWSER_RESTART_COOLDOWN}s...")
+                    state["blocked_rounds"] = 0
+                    state["since_restart"] = 0
+                    await hold_workers(BROWSER_RESTART_COOLDOWN, restart=True)
+                else:
+                    wait_time = 15 * state["blocked_rounds"]
+                    log.warning(f"  Blocked ({state['blocked_rounds']}x). Waiting {wait_time}s"
+                                + (", re-queuing..." if requeue_blocked else "..."))
+                    await hold_workers(wait_time, restart=False)
+                continue
+
+            if state["since_restart"] >= PREVENTIVE_RESTART_PROFILES:
+                log.info(f"  Preventive browser restart ({state['since_restart']} profiles)...")
+                state["since_restart"] = 0
+                await hold_workers(30, restart=True)
+                continue
+
+            await asyncio.sleep(random.uniform(0, WORKER_JITTER))
+
+    log.info(f"{label}: {scheduler.remaining} investors across {len(scheduler.runs)} datasets")
+    await asyncio.gather(*(worker() for _ in range(max_workers)))
+    return state["pages"]
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+async def run(runs, pages_per_minute=PAGES_PER_MINUTE, resync=False):
+    registry = UrlRegistry()
+    for ds in runs:
+        ds.open(registry, resync=resync)
+        await ds.reuse_pass()
+
+    started = time.monotonic()
+    scheduler = FairShareScheduler(runs)
+    log.info("=" * 60)
+    log.info("  NFX SIGNAL - MULTI-DATASET PROFILE SCRAPER (HEADLESS)")
+    for ds in runs:
+        log.info(f"  {ds.name:<12} weight {ds.weight:<4g} {len(ds.pending):>6} to scrape, "
+                 f"{ds.stats['reused']} reused from other lists")
+    log.info(f"  Unique investors to load: {scheduler.remaining}")
+    log.info(f"  Rate limit:               {pages_per_minute} pages/min shared")
+    log.info("=" * 60)
+
+    pages = 0
+    session = None
+    if scheduler.remaining:
+        limiter = RateLimiter(pages_per_minute)
+        controller = AIMDController()
+        async with async_playwright() as p:
+            browser, _, pool = await create_browser_context(p)
+            session = {"browser": browser, "pool": pool}
+            pages += await run_pass(p, session, scheduler, limiter, controller,
+                                    MAIN_TIMEOUTS, MAX_WORKERS, "MAIN PASS")
+
+            # One careful retry of everything that failed, one page at a time
+            for ds in runs:
+                ds.pending.extend({"slug": e["slug"], "url": e["url"]}
+                                    for e in ds.ledger.eligible(ignore_backoff=True)
+                                    if e["slug"] not in ds.progress.scraped)
+            scheduler = FairShareScheduler(runs)
+            if scheduler.remaining:
+                await asyncio.sleep(30)
+                session["browser"], _, session["pool"] = await restart_browser(p, session["browser"], session["pool"])
+                pages += await run_pass(p, session, scheduler, limiter, controller,
+                                        RETRY_TIMEOUTS, 1, "RETRY PASS", requeue_blocked=False)
+            try:
+                await session["browser"].close()
+            except Exception:
+                pass
+
+    for ds in runs:
+        await ds.close()
+
+    elapsed = time.monotonic() - started
+    log.info("")
+    log.info("=" * 60)
+    log.info("  FINAL REPORT")
+    for ds in runs:
+        ds.report()
+    shared = sum(r.stats["shared"] for r in runs)
+    log.info(f"  Pages loaded:     {pages} in {elapsed / 60:.1f} min "
+             f"({pages / elapsed * 60 if elapsed else 0:.1f}/min)")
+    log.info(f"  Page loads saved: {shared} shared within this run, {registry.stats['reused']} reused from disk")
+    log.info(f"  Page pool:        {session['pool'].summary() if session else 'not started'}")
+    log.info("=" * 60)
+
+
+def parse_dataset_arg(value):
+    """'DATA_DIR' or 'DATA_DIR:WEIGHT' -> DatasetRun."""
+    path, sep, weight = value.rpartition(":")
+    if not sep or not weight.replace(".", "", 1).isdigit():
+        path, weight = value, "1"
+    path = path if os.path.isabs(path) else os.path.join(SCRIPT_DIR, path)
+    try:
+        weight = float(weight)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad weight in '{value}'")
+    if weight <= 0:
+        raise argparse.ArgumentTypeError(f"weight must be positive in '{value}'")
+    if not os.path.exists(os.path.join(path, "all_investor_urls.json")):
+        raise argparse.ArgumentTypeError(f"no all_investor_urls.json in {path}")
+    return DatasetRun(path, weight)
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler(LOG_FILE, encoding="utf-8"),
+            logging.StreamHandler(),
+        ],
+    )
+
+    parser = argparse.ArgumentParser(description="NFX Signal - one scraper for several datasets")
+    parser.add_argument("datasets", nargs="*", type=parse_dataset_arg, metavar="DATA_DIR[:WEIGHT]",
+                        help="Datasets to scrape (default: all four, weight 1)")
+    parser.add_argument("--pages-per-minute", type=float, default=PAGES_PER_MINUTE,
+                        help=f"Page loads per minute across all datasets (default: {PAGES_PER_MINUTE})")
+    parser.add_argument("--resync", action="store_true", help="Re-check progress against the files on disk")
+    args = parser.parse_args()
+
+    runs = args.datasets or [parse_dataset_arg(d) for d in DEFAULT_DATASETS]
+    try:
+        asyncio.run(run(runs, pages_per_minute=args.pages_per_minute, resync=args.resync))
+    except KeyboardInterrupt:
+        log.info("\nStopped by user. Progress saved.")
+    except Exception as e:
+        log.error(f"CRASH: {e}")
+        log.error(traceback.format_exc())
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,22 +4,32 @@ NFX Signal - Profile Scraper (Headless)
 ========================================
 Scrapes full profile data for every investor URL in data/all_investor_urls.json.
 Uses the battle-tested SCRAPE_JS from the original nfx_scraper.py.
-Runs headless, no login needed, batches of 4 concurrent pages.
-Saves progress after every batch, retries failures at the end.
+Runs headless, no login needed, a pool of workers pulling from one queue.
+Concurrency adapts (AIMD) between MIN_WORKERS and MAX_WORKERS.
+Profiles are written by a background thread, retries failures at the end.
+Failures go to a per-slug ledger with backoff (failure_ledger.py).
+Investors already scraped for another list are copied (url_registry.py).
 Auto-restarts browser when blocked by Cloudflare/rate-limiting.
 """
 
 import asyncio
-import json
 import os
 import sys
 import logging
+import time
 import traceback
 import random
 from datetime import datetime
 
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
+from failure_ledger import FailureLedger
+from profile_manifest import Manifest
+from profile_writer import ProfileWriter
+from progress_log import ProgressLog
+from url_registry import UrlRegistry, dataset_name
+from url_journal import load_url_list
+
 # =============================================================================
 # CONFIG
 # =============================================================================
@@ -32,12 +42,12 @@ FAILED_FILE = os.path.join(DATA_DIR, "failed_profiles.json")
 ALL_URLS_FILE = os.path.join(DATA_DIR, "all_investor_urls.json")
 LOG_FILE = os.path.join(SCRIPT_DIR, "scraper_profiles.log")
 
-BATCH_SIZE = 4
+WORKERS = 4                  # starting concurrency; each worker takes the next slug as soon as it is free
 PAGE_LOAD_TIMEOUT = 30000   # 30s for page.goto
 H1_TIMEOUT = 15000           # 15s for h1 to appear
 CONTENT_TIMEOUT = 10000      # 10s for .line-separated-row
-EXTRA_WAIT = 2000            # 2s buffer for lazy content
-BATCH_PAUSE = 5.0            # seconds between batches (avoid rate-limit)
+EXTRA_WAIT = 2000            # 2s cap on waiting for lazy content
+WORKER_PAUSE = 5.0           # seconds each worker rests between profiles (avoid rate-limit)
 
 # Retry pass settings
 RETRY_PAGE_TIMEOUT = 45000
@@ -45,19 +55,28 @@ RETRY_H1_TIMEOUT = 20000
 RETRY_CONTENT_TIMEOUT = 15000
 RETRY_EXTRA_WAIT = 4000
 
+# Lazy-content readiness: "settle" returns as soon as the scraped sections stop
+# changing for SETTLE_QUIET_MS (capped at EXTRA_WAIT); "fixed" always sleeps EXTRA_WAIT
+READINESS_MODE = "settle"
+SETTLE_QUIET_MS = 400
+
 # Browser restart threshold
-MAX_CONSECUTIVE_FAILURES = 3
+MAX_CONSECUTIVE_FAILURES = 3    # blocked rounds (a round of fails in a row at the AIMD limit) before restart
 BROWSER_RESTART_COOLDOWN = 120  # seconds
-PREVENTIVE_RESTART_BATCHES = 80
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding="utf-8"),
-        logging.StreamHandler(),
-    ],
-)
+PREVENTIVE_RESTART_PROFILES = 320
+
+# Adaptive concurrency (AIMD): +1 worker after a healthy round, halve on timeouts,
+# garbage names or Cloudflare pages. Blocked-round restarts above stay as the backstop.
+MIN_WORKERS = 1
+MAX_WORKERS = 12
+AIMD_MIN_SUCCESS = 0.9          # success rate a round needs before concurrency grows
+AIMD_LATENCY_TARGET = 20.0      # seconds; no growth while average page latency is above this
+AIMD_DECREASE_FACTOR = 0.5
+
+# Page pool: pages are navigated in place instead of opened/closed per profile
+PAGE_POOL_SIZE = MAX_WORKERS
+PAGE_MAX_USES = 50              # recycle a page after N profiles to release renderer memory
+
 log = logging.getLogger(__name__)
 
 
@@ -231,62 +250,38 @@ SCRAPE_JS = r"""
 }
 """
 
-
 # =============================================================================
-# FILE I/O
+# SETTLE_JS — DOM-settle probe for the sections SCRAPE_JS reads
 # =============================================================================
-def load_progress() -> set:
-    if os.path.exists(PROGRESS_FILE):
-        try:
-            with open(PROGRESS_FILE, "r") as f:
-                data = json.load(f)
-                return set(data.get("scraped", []))
-        except Exception:
-            pass
-    return set()
-
-
-def save_progress(scraped_set: set):
-    tmp = PROGRESS_FILE + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump({"scraped": sorted(scraped_set), "total_scraped": len(scraped_set)}, f)
-    os.replace(tmp, PROGRESS_FILE)
-
-
-def load_failed() -> dict:
-    if os.path.exists(FAILED_FILE):
-        try:
-            with open(FAILED_FILE, "r") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {"failed": []}
-
-
-def save_failed(failed: dict):
-    tmp = FAILED_FILE + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump(failed, f, indent=2)
-    os.replace(tmp, FAILED_FILE)
-
-
-def save_profile(slug: str, data: dict) -> bool:
-    filepath = os.path.join(PROFILES_DIR, f"{slug}.json")
-    try:
-        tmp = filepath + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        os.replace(tmp, filepath)
-        return True
-    except Exception as e:
-        log.error(f"Error saving {slug}: {e}")
-        return False
-
-
-def profile_exists(slug: str) -> bool:
-    return os.path.exists(os.path.join(PROFILES_DIR, f"{slug}.json"))
+# Returns true once the identity block, investing rows, investments table,
+# experience rows, sector chips and social links have kept the same shape for
+# `quietMs`. State lives on window, so every navigation starts a fresh window.
+SETTLE_JS = r"""
+(quietMs) => {
+    const count = (sel) => document.querySelectorAll(sel).length;
+    const size = (sel) => { const el = document.querySelector(sel); return el ? el.textContent.length : -1; };
+    const sig = [
+        size('.identity-block'),
+        count('.line-separated-row.row'),
+        count('.past-investments-table-body tr'),
+        count('.line-separated-row.flex'),
+        count('a.vc-list-chip'),
+        count('.sn-linkset a.iconlink'),
+    ].join('|');
+    const now = performance.now();
+    const st = window.__nfxSettle;
+    if (!st || st.sig !== sig) {
+        window.__nfxSettle = { sig: sig, since: now };
+        return false;
+    }
+    return now - st.since >= quietMs;
+}
+"""
 
 
+# =============================================================================
+# FILE I/O
+# =============================================================================
 def is_garbage_name(name):
     """Check if extracted name is an error page, not a real person."""
     name_lower = name.strip().lower() if name else ""
@@ -313,6 +308,100 @@ def is_garbage_name(name):
     )
 
 
+CLOUDFLARE_MARKERS = ("just a moment", "attention required", "cloudflare", "checking your browser")
+
+
+def is_cloudflare_text(text):
+    """Check if a page title or extracted name comes from a Cloudflare challenge page."""
+    text_lower = text.strip().lower() if text else ""
+    return any(m in text_lower for m in CLOUDFLARE_MARKERS)
+
+
+def classify_failure(error):
+    """Map a scrape error string to the outcome the AIMD controller reacts to."""
+    error_lower = error.lower()
+    if error_lower.startswith("cloudflare") or is_cloudflare_text(error_lower):
+        return "cloudflare"
+    if error_lower.startswith("garbage name"):
+        return "garbage"
+    if "timeout" in error_lower or "never appeared" in error_lower:
+        return "timeout"
+    return "error"
+
+
+# =============================================================================
+# ADAPTIVE CONCURRENCY
+# =============================================================================
+class AIMDController:
+    """Additive-increase / multiplicative-decrease limit on pages in flight.
+
+    Every finished profile is recorded with its outcome. After a full round
+    (as many results as the current limit) with a healthy success rate and
+    latency, the limit grows by one. A timeout, garbage name or Cloudflare
+    page halves it straight away; results from pages that were already in
+    flight under the old limit cannot cut it again.
+    """
+
+    BACKOFF_OUTCOMES = ("timeout", "garbage", "cloudflare")
+
+    def __init__(self, start=WORKERS, minimum=MIN_WORKERS, maximum=MAX_WORKERS):
+        self.limit = start
+        self.minimum = minimum
+        self.maximum = maximum
+        self.peak = start
+        self.increases = 0
+        self.decreases = 0
+        self._round = []
+        self._latency = None
+        self._grace = 0
+
+    def record(self, outcome, latency):
+        """Record one finished profile. Returns True if the limit changed."""
+        if outcome == "ok":
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+
+        if self._grace > 0:
+            self._grace -= 1
+            if outcome in self.BACKOFF_OUTCOMES:
+                return False
+
+        if outcome in self.BACKOFF_OUTCOMES:
+            old = self.limit
+            self.limit = max(self.minimum, int(self.limit * AIMD_DECREASE_FACTOR))
+            self._grace = old
+            self._round.clear()
+            if self.limit == old:
+                log.info(f"  AIMD: {outcome} — holding at {old} worker(s) (minimum)")
+                return False
+            self.decreases += 1
+            log.warning(f"  AIMD: {outcome} — concurrency {old} -> {self.limit}")
+            return True
+
+        self._round.append(outcome == "ok")
+        if len(self._round) < self.limit:
+            return False
+
+        success = sum(self._round) / len(self._round)
+        self._round.clear()
+        latency_ok = self._latency is None or self._latency <= AIMD_LATENCY_TARGET
+        if success >= AIMD_MIN_SUCCESS and latency_ok and self.limit < self.maximum:
+            old = self.limit
+            self.limit += 1
+            self.increases += 1
+            self.peak = max(self.peak, self.limit)
+            log.info(f"  AIMD: healthy round ({success:.0%} ok, {self._latency or 0:.1f}s avg) — concurrency {old} -> {self.limit}")
+            return True
+        if not latency_ok:
+            log.info(f"  AIMD: holding at {self.limit} (avg latency {self._latency:.1f}s > {AIMD_LATENCY_TARGET:.0f}s)")
+        return False
+
+    def summary(self):
+        return (
+            f"final {self.limit}, peak {self.peak}, "
+            f"{self.increases} increases, {self.decreases} decreases"
+        )
+
+
 # =============================================================================
 # BROWSER MANAGEMENT
 # =============================================================================
@@ -330,8 +419,92 @@ BLOCKED_DOMAINS = [
 ]
 
 
-async def create_browser_context(p):
-    """Create a fresh browser + context with resource blocking."""
+class PagePool:
+    """Pre-created pages for one context, navigated in place and recycled.
+
+    The pool starts with a few pages and grows on demand up to `size`.
+    A page goes back to the pool after each profile. It is closed and
+    replaced once it has served PAGE_MAX_USES profiles, or straight away
+    if it crashed or the caller flags it as broken.
+
+    stats is per pool; restart_browser() hands the old pool's dict to its
+    replacement, so summary() covers every browser of one run.
+    """
+
+    def __init__(self, context, size=PAGE_POOL_SIZE, max_uses=PAGE_MAX_USES, stats=None):
+        self.context = context
+        if stats is None:
+            stats = {"created": 0, "reused": 0, "recycled": 0, "crashed": 0, "setup_seconds": 0.0}
+        self.stats = stats
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = asyncio.Queue()
+        self._uses = {}
+        self._crashed = set()
+
+    async def start(self, initial):
+        for _ in range(min(initial, self.size)):
+            self._idle.put_nowait(await self._new_page())
+        return self
+
+    async def _new_page(self):
+        started = time.monotonic()
+        page = await self.context.new_page()
+        page.on("crash", lambda pg: self._crashed.add(pg))
+        self._uses[page] = 0
+        self.stats["created"] += 1
+        self.stats["setup_seconds"] += time.monotonic() - started
+        return page
+
+    async def _discard(self, page):
+        started = time.monotonic()
+        self._uses.pop(page, None)
+        self._crashed.discard(page)
+        try:
+            await page.close()
+        except Exception:
+            pass
+        self.stats["setup_seconds"] += time.monotonic() - started
+
+    async def acquire(self):
+        if self._idle.empty() and len(self._uses) < self.size:
+            self._idle.put_nowait(await self._new_page())
+        page = await self._idle.get()
+        if self._uses[page] > 0:
+            self.stats["reused"] += 1
+        self._uses[page] += 1
+        return page
+
+    async def release(self, page, broken=False):
+        crashed = page in self._crashed or page.is_closed()
+        if crashed:
+            self.stats["crashed"] += 1
+        if crashed or broken or self._uses.get(page, 0) >= self.max_uses:
+            self.stats["recycled"] += 1
+            await self._discard(page)
+            try:
+                page = await self._new_page()
+            except Exception as e:
+                log.warning(f"  Page pool: could not replace page: {str(e)[:80]}")
+                return
+        self._idle.put_nowait(page)
+
+    async def close(self):
+        while not self._idle.empty():
+            await self._discard(self._idle.get_nowait())
+
+    def summary(self):
+        st = self.stats
+        created = st["created"]
+        per_page = st["setup_seconds"] / created if created else 0.0
+        return (
+            f"{st['reused']} reuses, {created} pages created, {st['recycled']} recycled "
+            f"({st['crashed']} crashed), ~{st['reused'] * per_page:.0f}s setup saved"
+        )
+
+
+async def create_browser_context(p, pool_stats=None):
+    """Create a fresh browser + context with resource blocking, plus its page pool."""
     browser = await p.chromium.launch(
         headless=True,
         args=[
@@ -351,32 +524,48 @@ async def create_browser_context(p):
     await context.route("**/*.{png,jpg,jpeg,gif,svg,woff,woff2,ttf,eot}", lambda route: route.abort())
     for domain in BLOCKED_DOMAINS:
         await context.route(f"**/{domain}/**", lambda route: route.abort())
-    return browser, context
+    pool = await PagePool(context, stats=pool_stats).start(WORKERS)
+    return browser, context, pool
 
 
-async def restart_browser(p, browser):
-    """Close old browser and create a fresh one."""
+async def restart_browser(p, browser, pool=None):
+    """Close old browser and create a fresh one; the new page pool keeps pool's counters."""
     try:
         await browser.close()
     except Exception:
         pass
-    return await create_browser_context(p)
+    return await create_browser_context(p, pool.stats if pool is not None else None)
 
 
 # =============================================================================
 # SCRAPE A SINGLE PAGE
 # =============================================================================
-async def scrape_single_page(context, slug, url, page_timeout, h1_timeout, content_timeout, extra_wait):
-    """Open a new page, scrape a single investor profile, close the page."""
+async def wait_for_settle(page, max_wait):
+    """Wait for lazy content: until the DOM settles (READINESS_MODE="settle") or a fixed sleep."""
+    if READINESS_MODE != "settle":
+        await page.wait_for_timeout(max_wait)
+        return
+    try:
+        await page.wait_for_function(SETTLE_JS, arg=SETTLE_QUIET_MS, polling=100, timeout=max_wait)
+    except PlaywrightTimeout:
+        pass  # hard cap reached, scrape whatever has rendered
+
+
+async def scrape_single_page(pool, slug, url, page_timeout, h1_timeout, content_timeout, extra_wait):
+    """Borrow a pooled page, scrape a single investor profile, hand the page back."""
     page = None
+    broken = False
     try:
-        page = await context.new_page()
+        page = await pool.acquire()
         await page.goto(url, wait_until="domcontentloaded", timeout=page_timeout)
 
         # Wait for h1 (name)
         try:
             await page.wait_for_selector("h1", timeout=h1_timeout)
         except PlaywrightTimeout:
+            title = await page.title()
+            if is_cloudflare_text(title):
+                return None, f"cloudflare: {title}"
             return None, "h1 never appeared"
 
         # Wait for investing profile section
@@ -385,8 +574,8 @@ async def scrape_single_page(context, slug, url, page_timeout, h1_timeout, conte
         except PlaywrightTimeout:
             pass  # some profiles may not have this
 
-        # Buffer for lazy content
-        await page.wait_for_timeout(extra_wait)
+        # Wait for lazy content to stop changing
+        await wait_for_settle(page, extra_wait)
 
         data = await page.evaluate(SCRAPE_JS)
 
@@ -399,14 +588,14 @@ async def scrape_single_page(context, slug, url, page_timeout, h1_timeout, conte
         data["slug"] = slug
         return data, None
 
+    except PlaywrightTimeout as e:
+        return None, str(e)[:200]
     except Exception as e:
+        broken = True
         return None, str(e)[:200]
     finally:
         if page:
-            try:
-                await page.close()
-            except Exception:
-                pass
+            await pool.release(page, broken=broken)
 
 
 # =============================================================================
@@ -416,157 +605,231 @@ async def run():
     os.makedirs(PROFILES_DIR, exist_ok=True)
 
     # Load data
-    with open(ALL_URLS_FILE, "r") as f:
-        all_urls = json.load(f)
-
-    scraped_set = load_progress()
-    failed_tracker = load_failed()
-
-    # Sync scraped_set with actual profile files on disk
-    for slug in list(scraped_set):
-        if not profile_exists(slug):
-            scraped_set.discard(slug)
-    for inv in all_urls:
-        if profile_exists(inv["slug"]):
-            scraped_set.add(inv["slug"])
-    save_progress(scraped_set)
-
-    # Determine what to scrape
+    # Snapshot plus any URLs still in the collector journal
+    all_urls = load_url_list(ALL_URLS_FILE)
+
+    # Progress is a write-ahead log: every start/ok/fail is one appended line,
+    # so it is never ahead of the profile files and survives a hard kill
+    progress = ProgressLog(PROGRESS_FILE)
+    scraped_set = progress.scraped
+    # One entry per failing slug, appended as it changes instead of rewritten
+    ledger = FailureLedger(FAILED_FILE)
+
+    # What is on disk comes from the dataset manifest; it is built once by a full
+    # scan and kept current by the writer, --resync re-checks changed files
+    manifest = Manifest.for_profiles_dir(PROFILES_DIR)
+    if not manifest.exists or "--resync" in sys.argv:
+        added, changed, removed, _ = manifest.refresh()
+        log.info(f"Manifest refreshed: +{added} new, {changed} changed, -{removed} removed")
+
+    # Reconcile with the files on disk only on the first run with the log
+    # (or a progress.json from before it), or when asked with --resync
+    if progress.needs_resync or "--resync" in sys.argv:
+        added, dropped = progress.resync(PROFILES_DIR, [inv["slug"] for inv in all_urls],
+                                         on_disk=manifest.slugs())
+        log.info(f"Progress resynced with disk: +{added} found, -{dropped} missing")
+
+    # Determine what to scrape; slugs in flight when the last run died go first,
+    # slugs still in their failure backoff go last
     to_scrape = [inv for inv in all_urls if inv["slug"] not in scraped_set]
+    backing_off = ledger.slugs() - {e["slug"] for e in ledger.eligible()}
+    to_scrape.sort(key=lambda inv: (inv["slug"] not in progress.interrupted, inv["slug"] in backing_off))
+    if progress.interrupted:
+        log.info(f"{len(progress.interrupted)} profiles were in flight at the last exit; retrying them first")
+
+    # Profile writes run on a background thread; the writer also logs "ok" to
+    # the progress log once a profile file is on disk
+    writer = ProfileWriter(PROFILES_DIR, progress=progress, manifest=manifest)
+    writer.start()
+
+    # Investors with a fresh profile in another list are copied, not loaded again
+    registry = UrlRegistry(dataset=dataset_name(DATA_DIR))
+    remaining = []
+    for inv in to_scrape:
+        data = registry.reuse(inv["slug"])
+        if data is not None and await writer.save_profile(inv["slug"], data):
+            ledger.clear(inv["slug"])
+        else:
+            remaining.append(inv)
+    reused, to_scrape = len(to_scrape) - len(remaining), remaining
 
     log.info("=" * 60)
     log.info("  NFX SIGNAL - PROFILE SCRAPER (HEADLESS)")
     log.info(f"  Total URLs:       {len(all_urls)}")
-    log.info(f"  Already scraped:  {len(scraped_set)}")
+    log.info(f"  Already scraped:  {len(scraped_set) - reused}")
+    log.info(f"  Reused:           {reused} (profile from another list)")
     log.info(f"  To scrape:        {len(to_scrape)}")
-    log.info(f"  Batch size:       {BATCH_SIZE}")
+    log.info(f"  Workers:          {WORKERS} (adaptive {MIN_WORKERS}-{MAX_WORKERS})")
     log.info("=" * 60)
 
     if not to_scrape:
         log.info("Nothing to scrape! All done.")
+        await writer.close()
+        progress.close()
+        manifest.close()
+        ledger.close()
         return
 
     async with async_playwright() as p:
-        browser, context = await create_browser_context(p)
-        batches_since_restart = 0
-        consecutive_failures = 0
+        browser, context, pool = await create_browser_context(p)
+        session = {"browser": browser, "pool": pool}
+
+        queue = asyncio.Queue()
+        for inv in to_scrape:
+            queue.put_nowait(inv)
+
+        controller = AIMDController()
+        slots = asyncio.Condition()  # workers wait here while in_flight >= controller.limit
+        gate = asyncio.Event()      # cleared while workers are held (cooldown / restart)
+        gate.set()
+        idle = asyncio.Event()      # set when no page is in flight
+        idle.set()
+        hold_lock = asyncio.Lock()
+
+        in_flight = 0
+        active = 0                  # workers holding a slug, from queue.get() to any re-queue
+        consecutive_failures = 0    # failed profiles in a row, across all workers
+        streak_round = WORKERS      # AIMD limit when the current failure streak began
+        blocked_rounds = 0
+        failed_streak = []          # invs that failed since the last success
+        profiles_since_restart = 0
         session_scraped = 0
         session_failed = 0
-        idx = 0
 
-        # ── MAIN SCRAPE PASS ──
-        while idx < len(to_scrape):
-            batch = to_scrape[idx:idx + BATCH_SIZE]
-            idx += BATCH_SIZE
-
-            # Skip already-scraped
-            batch = [inv for inv in batch if inv["slug"] not in scraped_set]
-            if not batch:
-                continue
-
-            batches_since_restart += 1
-            log.info(f"BATCH | {len(batch)} pages | ~{len(to_scrape) - idx} queued | {len(scraped_set)} total on disk")
-
-            tasks = [
-                scrape_single_page(
-                    context, inv["slug"], inv["url"],
-                    PAGE_LOAD_TIMEOUT, H1_TIMEOUT, CONTENT_TIMEOUT, EXTRA_WAIT,
-                )
-                for inv in batch
-            ]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            batch_ok = 0
-            batch_fail = 0
-            batch_garbage = 0
-
-            for i, result in enumerate(results):
-                slug = batch[i]["slug"]
-
-                if isinstance(result, Exception):
-                    error_msg = str(result)[:200]
-                    log.warning(f"  FAIL {slug}: {error_msg[:60]}")
-                    failed_tracker["failed"].append({
-                        "slug": slug, "url": batch[i]["url"],
-                        "error": error_msg, "timestamp": datetime.now().isoformat(),
-                    })
-                    session_failed += 1
-                    batch_fail += 1
-                    continue
-
-                data, error = result
+        async def hold_workers(wait_time, restart):
+            """Stop workers taking new slugs, let in-flight pages finish, then pause/restart."""
+            async with hold_lock:
+                gate.clear()
+                await idle.wait()
+                await asyncio.sleep(wait_time)
+                if restart:
+                    session["browser"], _, session["pool"] = await restart_browser(p, session["browser"], session["pool"])
+                gate.set()
+
+        def record_failure(inv, error, latency):
+            nonlocal session_failed, consecutive_failures, streak_round
+            if consecutive_failures == 0:
+                streak_round = controller.limit
+            progress.fail(inv["slug"], error)
+            ledger.fail(inv["slug"], inv["url"], error)
+            session_failed += 1
+            consecutive_failures += 1
+            failed_streak.append(inv)
+            controller.record(classify_failure(error), latency)
+
+        async def worker():
+            nonlocal in_flight, active, consecutive_failures, blocked_rounds
+            nonlocal profiles_since_restart, session_scraped
+
+            while True:
+                await gate.wait()
+                async with slots:
+                    # An empty queue only ends the pass once no worker holds a slug
+                    # it could still re-queue after a blocked round
+                    await slots.wait_for(lambda: in_flight < controller.limit
+                                         and (not queue.empty() or active == 0))
+                    if not gate.is_set():
+                        continue
+                    if queue.empty():
+                        return
+                    inv = queue.get_nowait()
+
+                    slug = inv["slug"]
+                    if slug in scraped_set:
+                        continue
+
+                    in_flight += 1
+                    active += 1
+                    idle.clear()
+
+                progress.start(slug)
+                started = time.monotonic()
+                try:
+                    data, error = await scrape_single_page(
+                        session["pool"], slug, inv["url"],
+                        PAGE_LOAD_TIMEOUT, H1_TIMEOUT, CONTENT_TIMEOUT, EXTRA_WAIT,
+                    )
+                except Exception as e:
+                    data, error = None, str(e)[:200]
+                finally:
+                    in_flight -= 1
+                    if in_flight == 0:
+                        idle.set()
+                latency = time.monotonic() - started
+
+                profiles_since_restart += 1
 
                 if error:
                     log.warning(f"  FAIL {slug}: {error[:60]}")
-                    failed_tracker["failed"].append({
-                        "slug": slug, "url": batch[i]["url"],
-                        "error": error, "timestamp": datetime.now().isoformat(),
-                    })
-                    session_failed += 1
-                    batch_fail += 1
+                    record_failure(inv, error, latency)
+                else:
+                    name = data.get("basicInfo", {}).get("name", "")
+                    if is_cloudflare_text(name):
+                        log.warning(f"  FAIL {slug}: cloudflare page '{name}'")
+                        record_failure(inv, f"cloudflare: {name}", latency)
+                    elif is_garbage_name(name):
+                        log.warning(f"  FAIL {slug}: garbage name '{name}'")
+                        record_failure(inv, f"garbage name: {name}", latency)
+                    elif await writer.save_profile(slug, data):
+                        ledger.clear(slug)
+                        session_scraped += 1
+                        consecutive_failures = 0
+                        blocked_rounds = 0
+                        failed_streak.clear()
+                        controller.record("ok", latency)
+                        log.info(f"  OK   {slug} ({name}) | ~{queue.qsize()} queued | {len(scraped_set)} total on disk")
+                    else:
+                        record_failure(inv, "save failed", latency)
+
+                # A full round at the current limit failed in a row → server is blocking us
+                blocked = consecutive_failures >= streak_round
+                if blocked:
+                    consecutive_failures = 0
+                    blocked_rounds += 1
+                    # Re-queue failed items for later
+                    for failed_inv in failed_streak:
+                        if failed_inv["slug"] not in scraped_set:
+                            queue.put_nowait(failed_inv)
+                    failed_streak.clear()
+
+                async with slots:
+                    active -= 1
+                    slots.notify_all()
+
+                if blocked:
+                    if blocked_rounds >= MAX_CONSECUTIVE_FAILURES:
+                        log.warning(f"  {blocked_rounds} consecutive blocked rounds — RESTARTING BROWSER + waiting {BROWSER_RESTART_COOLDOWN}s...")
+                        blocked_rounds = 0
+                        profiles_since_restart = 0
+                        await hold_workers(BROWSER_RESTART_COOLDOWN, restart=True)
+                    else:
+                        wait_time = 15 * blocked_rounds
+                        log.warning(f"  Blocked ({blocked_rounds}x). Waiting {wait_time}s, re-queuing...")
+                        await hold_workers(wait_time, restart=False)
                     continue
 
-                name = data.get("basicInfo", {}).get("name", "")
-                if is_garbage_name(name):
-                    log.warning(f"  FAIL {slug}: garbage name '{name}'")
-                    failed_tracker["failed"].append({
-                        "slug": slug, "url": batch[i]["url"],
-                        "error": f"garbage name: {name}", "timestamp": datetime.now().isoformat(),
-                    })
-                    session_failed += 1
-                    batch_fail += 1
-                    batch_garbage += 1
+                # Preventive browser restart every N profiles
+                if profiles_since_restart >= PREVENTIVE_RESTART_PROFILES:
+                    log.info(f"  Preventive browser restart ({profiles_since_restart} profiles)...")
+                    profiles_since_restart = 0
+                    await hold_workers(30, restart=True)
                     continue
 
-                if save_profile(slug, data):
-                    scraped_set.add(slug)
-                    session_scraped += 1
-                    batch_ok += 1
-                    log.info(f"  OK   {slug} ({name})")
-                else:
-                    session_failed += 1
-                    batch_fail += 1
-
-            save_progress(scraped_set)
-            save_failed(failed_tracker)
-
-            # Entire batch failed → server is blocking us
-            if batch_fail >= len(batch) and batch_ok == 0:
-                consecutive_failures += 1
-                # Re-queue failed items for later
-                for inv in batch:
-                    if inv["slug"] not in scraped_set:
-                        to_scrape.append(inv)
-
-                if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
-                    log.warning(f"  {consecutive_failures} consecutive failed batches — RESTARTING BROWSER + waiting {BROWSER_RESTART_COOLDOWN}s...")
-                    await asyncio.sleep(BROWSER_RESTART_COOLDOWN)
-                    browser, context = await restart_browser(p, browser)
-                    batches_since_restart = 0
-                    consecutive_failures = 0
-                else:
-                    wait_time = 15 * consecutive_failures
-                    log.warning(f"  Blocked batch ({consecutive_failures}x). Waiting {wait_time}s, re-queuing...")
-                    await asyncio.sleep(wait_time)
-            else:
-                consecutive_failures = 0
                 # Randomized pause to look more natural
-                pause = BATCH_PAUSE + random.uniform(0, 2)
-                await asyncio.sleep(pause)
+                await asyncio.sleep(WORKER_PAUSE + random.uniform(0, 2))
 
-            # Preventive browser restart every N batches
-            if batches_since_restart >= PREVENTIVE_RESTART_BATCHES:
-                log.info(f"  Preventive browser restart ({batches_since_restart} batches)...")
-                await asyncio.sleep(30)
-                browser, context = await restart_browser(p, browser)
-                batches_since_restart = 0
+        # ── MAIN SCRAPE PASS ──
+        await asyncio.gather(*(worker() for _ in range(MAX_WORKERS)))
+        browser, pool = session["browser"], session["pool"]
 
         log.info("")
         log.info(f"Main pass done: {session_scraped} scraped, {session_failed} failed")
+        log.info(f"Page pool: {pool.summary()}")
+        log.info(f"AIMD concurrency: {controller.summary()}")
 
         # ── RETRY PASS (one-at-a-time, fresh browser) ──
-        failed_slugs = {f["slug"]: f for f in failed_tracker.get("failed", []) if f["slug"] not in scraped_set}
-        failed_list = list(failed_slugs.values())
+        # Every failing slug once, whatever its backoff: this pass is the slow, careful retry
+        failed_list = [f for f in ledger.eligible(ignore_backoff=True) if f["slug"] not in scraped_set]
 
         if failed_list:
             log.info("")
@@ -576,70 +839,73 @@ async def run():
 
             # Fresh browser for retry
             await asyncio.sleep(30)
-            browser, context = await restart_browser(p, browser)
+            browser, context, pool = await restart_browser(p, browser, pool)
 
             retry_ok = 0
             retry_fail = 0
-            new_failures = []
             retry_consecutive_fails = 0
 
             for i, f in enumerate(failed_list, 1):
                 slug = f["slug"]
                 url = f["url"]
 
-                if slug in scraped_set or profile_exists(slug):
+                if slug in scraped_set:
                     continue
 
                 log.info(f"  Retry {i}/{len(failed_list)}: {slug}")
 
+                progress.start(slug)
                 data, error = await scrape_single_page(
-                    context, slug, url,
+                    pool, slug, url,
                     RETRY_PAGE_TIMEOUT, RETRY_H1_TIMEOUT, RETRY_CONTENT_TIMEOUT, RETRY_EXTRA_WAIT,
                 )
 
                 if error:
                     log.warning(f"    FAIL: {error[:60]}")
-                    new_failures.append({"slug": slug, "url": url, "error": error, "timestamp": datetime.now().isoformat()})
+                    progress.fail(slug, error)
+                    ledger.fail(slug, url, error)
                     retry_fail += 1
                     retry_consecutive_fails += 1
                 elif data:
                     name = data.get("basicInfo", {}).get("name", "")
                     if is_garbage_name(name):
                         log.warning(f"    FAIL: garbage name '{name}'")
-                        new_failures.append({"slug": slug, "url": url, "error": f"garbage name: {name}", "timestamp": datetime.now().isoformat()})
+                        progress.fail(slug, f"garbage name: {name}")
+                        ledger.fail(slug, url, f"garbage name: {name}")
                         retry_fail += 1
                         retry_consecutive_fails += 1
-                    elif save_profile(slug, data):
-                        scraped_set.add(slug)
+                    elif await writer.save_profile(slug, data):
+                        ledger.clear(slug)
                         retry_ok += 1
                         retry_consecutive_fails = 0
                         log.info(f"    OK  {slug} ({name})")
                     else:
+                        progress.fail(slug, "save failed")
+                        ledger.fail(slug, url, "save failed")
                         retry_fail += 1
                         retry_consecutive_fails += 1
                 else:
+                    progress.fail(slug, "no data")
+                    ledger.fail(slug, url, "no data")
                     retry_fail += 1
                     retry_consecutive_fails += 1
 
-                save_progress(scraped_set)
                 await asyncio.sleep(3 + random.uniform(0, 2))
 
                 # Restart browser if seeing too many consecutive failures in retry
                 if retry_consecutive_fails >= 10:
                     log.info("  Retry: restarting browser (10 consecutive fails)...")
                     await asyncio.sleep(60)
-                    browser, context = await restart_browser(p, browser)
+                    browser, context, pool = await restart_browser(p, browser, pool)
                     retry_consecutive_fails = 0
 
                 # Also restart every 50 retries as prevention
                 if i % 50 == 0:
                     log.info("  Retry: preventive browser restart...")
                     await asyncio.sleep(20)
-                    browser, context = await restart_browser(p, browser)
+                    browser, context, pool = await restart_browser(p, browser, pool)
                     retry_consecutive_fails = 0
 
-            failed_tracker["failed"] = new_failures
-            save_failed(failed_tracker)
             log.info(f"  Retry pass: {retry_ok} recovered, {retry_fail} still failed")
 
         try:
@@ -647,13 +913,14 @@ async def run():
         except Exception:
             pass
 
+    await writer.close()
+    progress.close()
+    manifest.close()
+    ledger.close()
+
     # ── FINAL REPORT ──
     all_slugs = {inv["slug"] for inv in all_urls}
-    scraped_on_disk = {
-        f.replace(".json", "")
-        for f in os.listdir(PROFILES_DIR)
-        if f.endswith(".json")
-    }
+    scraped_on_disk = manifest.slugs()
     missing = all_slugs - scraped_on_disk
 
     log.info("")
@@ -662,7 +929,12 @@ async def run():
     log.info(f"  Total in all_investor_urls.json:  {len(all_slugs)}")
     log.info(f"  Profiles on disk:                 {len(scraped_on_disk)}")
     log.info(f"  Missing profiles:                 {len(missing)}")
-    log.info(f"  Failed (after retry):             {len(failed_tracker.get('failed', []))}")
+    log.info(f"  Failed (after retry):             {ledger.summary()}")
+    log.info(f"  Progress log:                     {progress.summary()}")
+    log.info(f"  Writer:                           {writer.summary()}")
+    log.info(f"  Manifest:                         {manifest.summary()}")
+    log.info(f"  URL registry:                     {registry.summary()}")
+    log.info(f"  Page pool:                        {pool.summary()}")
     log.info("=" * 60)
 
     if missing and len(missing) <= 50:
@@ -676,6 +948,14 @@ async def run():
 
 
 def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[
+            logging.FileHandler(LOG_FILE, encoding="utf-8"),
+            logging.StreamHandler(),
+        ],
+    )
     try:
         asyncio.run(run())
     except KeyboardInterrupt:
@@ -683,14 +963,7 @@ def main():
     except Exception as e:
         log.error(f"CRASH: {e}")
         log.error(traceback.format_exc())
-        # Emergency save
-        try:
-            existing = load_progress()
-            if existing:
-                save_progress(existing)
-                log.info(f"Emergency save: {len(existing)} in progress.json")
-        except Exception:
-            pass
+        # Nothing to save: every progress change is already in the progress log
         sys.exit(1)
 
 
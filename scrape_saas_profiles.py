@@ -8,7 +8,7 @@ Resumable via progress.json.
 """
 
 import os
-import json
+import sys
 import time
 import logging
 import traceback
@@ -23,6 +23,13 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from failure_ledger import FailureLedger
+from profile_manifest import Manifest
+from profile_writer import record_profile, write_profile
+from progress_log import ProgressLog
+from url_registry import UrlRegistry, dataset_name
+from url_journal import load_url_list
+
 # =============================================================================
 # CONFIG
 # =============================================================================
@@ -223,46 +230,14 @@ return data;
 # =============================================================================
 # FILE I/O
 # =============================================================================
-def load_progress():
-    if os.path.exists(PROGRESS_FILE):
-        try:
-            with open(PROGRESS_FILE, "r") as f:
-                return set(json.load(f).get("scraped", []))
-        except Exception:
-            pass
-    return set()
-
-
-def save_progress(scraped_set):
-    tmp = PROGRESS_FILE + ".tmp"
-    with open(tmp, "w") as f:
-        json.dump({"scraped": sorted(scraped_set), "total_scraped": len(scraped_set)}, f)
-    os.replace(tmp, PROGRESS_FILE)
-
-
-def save_failed(failed_slugs, url_lookup):
-    tmp = FAILED_FILE + ".tmp"
-    data = {"failed": [
-        {"slug": s, "url": url_lookup.get(s, f"https://signal.nfx.com/investors/{s}"),
-         "timestamp": datetime.now().isoformat()}
-        for s in failed_slugs
-    ]}
-    with open(tmp, "w") as f:
-        json.dump(data, f, indent=2)
-    os.replace(tmp, FAILED_FILE)
-
-
-def save_profile(slug, data):
-    filepath = os.path.join(PROFILES_DIR, f"{slug}.json")
+def save_profile(slug, data, manifest=None):
     try:
-        tmp = filepath + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        os.replace(tmp, filepath)
-        return True
+        raw = write_profile(PROFILES_DIR, slug, data)
     except Exception as e:
         log.error(f"Save error {slug}: {e}")
         return False
+    record_profile(manifest, slug, raw, data)
+    return True
 
 
 def is_garbage_name(name):
@@ -404,8 +379,9 @@ def scrape_one(driver, url, slug):
 # =============================================================================
 # MAIN
 # =============================================================================
-def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
+def run_pass(driver, to_scrape, progress, ledger, url_lookup, pass_name="MAIN", manifest=None):
     """Scrape a list of {slug, url} dicts one by one. Returns list of failed slugs."""
+    scraped_set = progress.scraped
     total = len(to_scrape)
     failed_slugs = []
     consecutive_fails = 0
@@ -439,11 +415,13 @@ def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
                 failed_slugs.extend(inv2["slug"] for inv2 in to_scrape[i:] if inv2["slug"] not in scraped_set)
                 break
 
+        progress.start(slug)
         data, error = scrape_one(driver, url, slug)
 
         if data and is_profile_valid(data):
-            if save_profile(slug, data):
-                scraped_set.add(slug)
+            if save_profile(slug, data, manifest):
+                progress.done(slug)
+                ledger.clear(slug)
                 ok_count += 1
                 name = data.get("basicInfo", {}).get("name", "?")
                 consecutive_fails = 0
@@ -453,15 +431,15 @@ def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
                     log.info(f"  [{ok_count}/{total}] OK {slug} ({name}) | total: {len(scraped_set)}")
                 else:
                     log.info(f"  OK {slug} ({name})")
-
-                # Save progress every 10 profiles
-                if ok_count % 10 == 0:
-                    save_progress(scraped_set)
             else:
+                progress.fail(slug, "save failed")
+                ledger.fail(slug, url, "save failed")
                 failed_slugs.append(slug)
         else:
             err_msg = error or f"invalid: {data.get('basicInfo',{}).get('name','') if data else 'no data'}"
             log.warning(f"  FAIL {slug}: {err_msg}")
+            progress.fail(slug, err_msg)
+            ledger.fail(slug, url, err_msg)
             failed_slugs.append(slug)
             consecutive_fails += 1
 
@@ -480,7 +458,6 @@ def run_pass(driver, to_scrape, scraped_set, url_lookup, pass_name="MAIN"):
         jitter = random.uniform(0.5, 1.5)
         time.sleep(current_delay * jitter)
 
-    save_progress(scraped_set)
     log.info(f"  {pass_name} done: {ok_count} OK, {len(failed_slugs)} failed")
     return driver, failed_slugs
 
@@ -492,20 +469,43 @@ def main():
 
     os.makedirs(PROFILES_DIR, exist_ok=True)
 
-    with open(ALL_URLS_FILE, "r") as f:
-        all_urls = json.load(f)
+    # Snapshot plus any URLs still in the collector journal
+    all_urls = load_url_list(ALL_URLS_FILE)
 
     url_lookup = {inv["slug"]: inv["url"] for inv in all_urls}
 
-    # Load + sync progress
-    scraped_set = load_progress()
-    for inv in all_urls:
-        fp = os.path.join(PROFILES_DIR, f"{inv['slug']}.json")
-        if os.path.exists(fp):
-            scraped_set.add(inv["slug"])
-    save_progress(scraped_set)
+    # Progress is a write-ahead log (progress_log.py); reconcile with the
+    # files on disk only on its first run or with --resync
+    progress = ProgressLog(PROGRESS_FILE)
+    scraped_set = progress.scraped
+    # One entry per failing slug with attempts and backoff (failure_ledger.py)
+    ledger = FailureLedger(FAILED_FILE)
+    if progress.needs_resync or "--resync" in sys.argv:
+        added, dropped = progress.resync(PROFILES_DIR, [inv["slug"] for inv in all_urls])
+        log.info(f"Progress resynced with disk: +{added} found, -{dropped} missing")
 
     to_scrape = [inv for inv in all_urls if inv["slug"] not in scraped_set]
+    if progress.interrupted:
+        to_scrape.sort(key=lambda inv: inv["slug"] not in progress.interrupted)
+
+    # Every profile written is recorded in the dataset manifest (profile_manifest.py);
+    # it is built by a full scan only the first time or with --resync
+    manifest = Manifest(DATA_DIR)
+    if not manifest.exists or "--resync" in sys.argv:
+        added, changed, removed, _ = manifest.refresh()
+        log.info(f"Manifest refreshed: +{added} new, {changed} changed, -{removed} removed")
+
+    # Investors with a fresh profile in another list are copied, not loaded again
+    registry = UrlRegistry(dataset=dataset_name(DATA_DIR))
+    remaining = []
+    for inv in to_scrape:
+        data = registry.reuse(inv["slug"])
+        if data is not None and save_profile(inv["slug"], data, manifest):
+            progress.done(inv["slug"])
+            ledger.clear(inv["slug"])
+        else:
+            remaining.append(inv)
+    to_scrape = remaining
 
     log.info("=" * 60)
     log.info("  NFX SIGNAL - SAAS SCRAPER (HEADLESS SEQUENTIAL)")
@@ -517,6 +517,9 @@ def main():
 
     if not to_scrape:
         log.info("All done!")
+        progress.close()
+        ledger.close()
+        manifest.close()
         return
 
     driver = launch_chrome()
@@ -526,7 +529,7 @@ def main():
         return
 
     # ── MAIN PASS ──
-    driver, failed = run_pass(driver, to_scrape, scraped_set, url_lookup, "MAIN PASS")
+    driver, failed = run_pass(driver, to_scrape, progress, ledger, url_lookup, "MAIN PASS", manifest)
 
     # ── RETRY ROUNDS ──
     for rnd in range(1, MAX_RETRY_ROUNDS + 1):
@@ -543,11 +546,13 @@ def main():
 
         retry_list = [{"slug": s, "url": url_lookup.get(s, f"https://signal.nfx.com/investors/{s}")}
                       for s in retry_slugs]
-        driver, failed = run_pass(driver, retry_list, scraped_set, url_lookup, f"RETRY {rnd}")
+        driver, failed = run_pass(driver, retry_list, progress, ledger, url_lookup, f"RETRY {rnd}", manifest)
 
     # ── FINAL REPORT ──
     final_failed = [s for s in set(failed) if s not in scraped_set]
-    save_failed(final_failed, url_lookup)
+    progress.close()
+    ledger.close()
+    manifest.close()
 
     all_slugs = {inv["slug"] for inv in all_urls}
     on_disk = {f.replace(".json", "") for f in os.listdir(PROFILES_DIR) if f.endswith(".json")}
@@ -559,6 +564,8 @@ def main():
     log.info(f"  On disk:          {len(on_disk)}")
     log.info(f"  In progress:      {len(scraped_set)}")
     log.info(f"  Final failed:     {len(final_failed)}")
+    log.info(f"  Failure ledger:   {ledger.summary()}")
+    log.info(f"  URL registry:     {registry.summary()}")
     log.info(f"  Output:           {PROFILES_DIR}")
     log.info("=" * 60)
 
@@ -576,10 +583,3 @@ if __name__ == "__main__":
     except Exception as e:
         log.error(f"CRASH: {e}")
         log.error(traceback.format_exc())
-        try:
-            existing = load_progress()
-            if existing:
-                save_progress(existing)
-                log.info(f"Emergency save: {len(existing)}")
-        except Exception:
-            pass
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Pooled Async GraphQL Client
+=========================================
+Shared client for the GraphQL URL collectors.
+
+- Keep-alive connections: a small pool of http.client connections is reused
+  across requests instead of a fresh TCP+TLS handshake per page.
+- gzip: responses are requested and decoded compressed.
+- Backoff: 429/503 honour Retry-After (capped at RETRY_AFTER_MAX); other 5xx
+  and network errors back off exponentially with jitter. Other 4xx raise SignalAPIError immediately.
+- Pacing: min_interval spaces request *starts* (shared by every caller of
+  the client), so the time a request spends in flight counts toward the gap
+  instead of a fixed sleep after each page.
+- Latency: every request's wall time is recorded; summary() reports it.
+
+Blocking socket work runs in worker threads via asyncio.to_thread.
+
+Usage:
+    async with SignalClient(min_interval=0.3) as client:
+        data = await client.post({"operationName": ..., "variables": ..., "query": ...})
+        log.info(client.summary())
+"""
+
+import asyncio
+import gzip
+import http.client
+import json
+import logging
+import random
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# =============================================================================
+# CONFIG
+# =============================================================================
+GRAPHQL_URL = "https://signal-api.nfx.com/graphql"
+POOL_SIZE = 4              # keep-alive connections held open
+REQUEST_TIMEOUT = 30       # seconds per request
+MAX_RETRIES = 5
+BACKOFF_BASE = 2.0         # seconds, doubled per attempt
+BACKOFF_MAX = 60.0
+RETRY_AFTER_MAX = 5 * BACKOFF_MAX   # longest server-requested wait honoured per attempt
+
+HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+    "Origin": "https://signal.nfx.com",
+    "Referer": "https://signal.nfx.com/",
+}
+
+log = logging.getLogger(__name__)
+
+
+class SignalAPIError(Exception):
+    """Non-retryable HTTP error from the GraphQL endpoint."""
+
+    def __init__(self, status, reason, body=b""):
+        super().__init__(f"HTTP {status}: {reason}")
+        self.status = status
+        self.body = body
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, status, reason, retry_after):
+        super().__init__(f"HTTP {status}: {reason}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def decode_body(body, encoding):
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        # "deflate" should be zlib-wrapped, but some servers send raw deflate
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+# =============================================================================
+# CLIENT
+# =============================================================================
+class SignalClient:
+    """Async GraphQL client over a pool of keep-alive HTTP(S) connections."""
+
+    def __init__(self, graphql_url=GRAPHQL_URL, pool_size=POOL_SIZE, min_interval=0.0,
+                 timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES):
+        parts = urlsplit(graphql_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path or "/"
+        if parts.query:
+            self.path += "?" + parts.query
+        self.pool_size = pool_size
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.retries = retries
+
+        self._idle = []
+        self._slots = asyncio.Semaphore(pool_size)
+        self._pace_lock = asyncio.Lock()
+        self._next_start = 0.0
+
+        self.latencies = []
+        self.stats = {"requests": 0, "retries": 0, "errors": 0,
+                      "connections": 0, "bytes_in": 0, "bytes_raw": 0}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    # -- connections ---------------------------------------------------------
+    def _new_connection(self):
+        self.stats["connections"] += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def close(self):
+        while self._idle:
+            self._idle.pop().close()
+
+    def _send(self, conn, body):
+        """Blocking request on one connection. Returns (status, reason, response, raw_body)."""
+        conn.request("POST", self.path, body=body, headers=HEADERS)
+        resp = conn.getresponse()
+        raw = resp.read()
+        return resp.status, resp.reason, resp, raw
+
+    async def _pace(self):
+        """Space request starts at least min_interval apart across all callers."""
+        if self.min_interval <= 0:
+            return
+        async with self._pace_lock:
+            now = time.monotonic()
+            wait = self._next_start - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now += wait
+            self._next_start = now + self.min_interval
+
+    async def _request_once(self, body):
+        async with self._slots:
+            await self._pace()
+            reused = bool(self._idle)
+            conn = self._idle.pop() if reused else self._new_connection()
+            started = time.monotonic()
+            try:
+                status, reason, resp, raw = await asyncio.to_thread(self._send, conn, body)
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once on a fresh one
+                conn = self._new_connection()
+                try:
+                    status, reason, resp, raw = await asyncio.to_thread(self._send, conn, body)
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    raise
+            latency = time.monotonic() - started
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._idle.append(conn)
+
+        self.latencies.append(latency)
+        self.stats["requests"] += 1
+        self.stats["bytes_raw"] += len(raw)
+        log.debug(f"POST {self.path} -> {status} in {latency * 1000:.0f} ms ({len(raw)} bytes)")
+
+        if status == 200:
+            data = decode_body(raw, resp.getheader("Content-Encoding"))
+            self.stats["bytes_in"] += len(data)
+            return json.loads(data)
+        if status == 429 or status >= 500:
+            raise _RetryableStatus(status, reason, parse_retry_after(resp.getheader("Retry-After")))
+        raise SignalAPIError(status, reason, raw)
+
+    async def post(self, payload):
+        """POST one GraphQL payload and return the parsed JSON response."""
+        body = json.dumps(payload).encode("utf-8")
+
+        last_error = None
+        for attempt in range(self.retries):
+            backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1.0)
+            final = attempt == self.retries - 1
+            try:
+                return await self._request_once(body)
+            except _RetryableStatus as e:
+                last_error = e
+                wait = backoff
+                note = ""
+                if e.retry_after is not None:
+                    wait = min(e.retry_after, RETRY_AFTER_MAX)
+                    note = " (Retry-After)" if wait == e.retry_after else f" (Retry-After {e.retry_after:.0f}s, capped)"
+                if not final:
+                    log.warning(f"{e} on attempt {attempt+1}; retrying in {wait:.1f}s{note}")
+            except (OSError, http.client.HTTPException) as e:
+                last_error = e
+                wait = backoff
+                if not final:
+                    log.warning(f"Network error on attempt {attempt+1}: {e!r}; retrying in {wait:.1f}s")
+            if final:
+                break
+            self.stats["retries"] += 1
+            await asyncio.sleep(wait)
+
+        self.stats["errors"] += 1
+        raise RuntimeError(f"Failed after {self.retries} attempts: {last_error}") from last_error
+
+    def summary(self):
+        lat = sorted(self.latencies)
+        s = self.stats
+        saved = ""
+        if s["bytes_raw"] and s["bytes_in"] > s["bytes_raw"]:
+            saved = f", gzip {s['bytes_raw'] / 1024:.0f}/{s['bytes_in'] / 1024:.0f} KB"
+        return (
+            f"{s['requests']} requests over {s['connections']} connections, "
+            f"{s['retries']} retries, {s['errors']} failed | latency "
+            f"p50 {percentile(lat, 50) * 1000:.0f} ms, p95 {percentile(lat, 95) * 1000:.0f} ms, "
+            f"max {(lat[-1] if lat else 0) * 1000:.0f} ms{saved}"
+        )
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Append-Only Journal for URL Snapshots
+===================================================
+all_investor_urls.json (and all_investor_lite.json) are sorted, indented
+snapshots. Rewriting the whole snapshot on every checkpoint costs time in
+proportion to everything collected so far. Instead, collectors append newly
+discovered records to a JSONL journal next to the snapshot
+(all_investor_urls.journal.jsonl) and fold the journal into the snapshot
+only every COMPACT_EVERY records and at the end of a walk.
+
+Readers call load_records()/load_url_list(), which return snapshot plus
+journal. A torn line (kill -9 mid-append) is skipped, and the next append
+starts on a fresh line so it does not glue onto the fragment. Compaction writes
+the new snapshot atomically before truncating the journal, so a crash in
+between just replays records that are already in the snapshot.
+"""
+
+import json
+import os
+
+COMPACT_EVERY = 2000   # journal records before folding them into the snapshot
+
+
+def journal_path(snapshot_file):
+    return os.path.splitext(snapshot_file)[0] + ".journal.jsonl"
+
+
+def read_journal(path):
+    """Return the records in a journal file, skipping torn lines."""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue   # torn line from a hard kill
+    return records
+
+
+def seal(path):
+    """End the file with a newline if a hard kill left a partial last line."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def load_records(snapshot_file):
+    """Return {slug: record} from the snapshot plus its journal (journal wins)."""
+    records = {}
+    if os.path.exists(snapshot_file):
+        with open(snapshot_file, "r", encoding="utf-8") as f:
+            for item in json.load(f):
+                records[item["slug"]] = item
+    for item in read_journal(journal_path(snapshot_file)):
+        if item.get("slug"):
+            records[item["slug"]] = item
+    return records
+
+
+def load_url_list(snapshot_file):
+    """Return [{"slug", "url"}, ...] like json.load(all_investor_urls.json), journal included."""
+    return [{"slug": r["slug"], "url": r["url"]} for r in load_records(snapshot_file).values()]
+
+
+def write_snapshot(snapshot_file, records):
+    """Atomically write records (already in order) as the canonical indented JSON."""
+    tmp = snapshot_file + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, snapshot_file)
+
+
+class Journal:
+    """Append-only companion of one snapshot file."""
+
+    def __init__(self, snapshot_file, compact_every=COMPACT_EVERY):
+        self.snapshot_file = snapshot_file
+        self.path = journal_path(snapshot_file)
+        self.compact_every = compact_every
+        self.pending = len(read_journal(self.path))
+        self.appended = 0
+        self.compactions = 0
+
+    def append(self, records):
+        """Append records as JSON lines and fsync. Cost is proportional to len(records)."""
+        if not records:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        seal(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending += len(records)
+        self.appended += len(records)
+
+    @property
+    def due(self):
+        return self.pending >= self.compact_every
+
+    def compact(self, records):
+        """Write the full snapshot (records in final order), then truncate the journal."""
+        write_snapshot(self.snapshot_file, records)
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.pending = 0
+        self.compactions += 1
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+NFX Signal - Cross-Dataset URL Registry
+========================================
+The same investor shows up in several lists (data/, data-saas/,
+data-enterprise-seed/, data-fintech-seed/), and each dataset used to scrape
+it again. The registry records every slug once with the set of lists it
+belongs to:
+
+    slug -> {"url", "lists": ["Enterprise", "SaaS", ...]}
+
+and, from the dataset manifests (profile_manifest.py), which datasets
+already hold a valid profile for it and when that profile was scraped.
+
+Scrapers call reuse(slug) before opening a page: if another dataset has a
+valid profile scraped within FRESH_DAYS, its data is returned and written
+into this dataset instead of loading the page again.
+
+Run:
+    python url_registry.py report                  # overlap and page loads saved
+    python url_registry.py build                   # also write url_registry.json
+    python url_registry.py lists some-investor-slug
+"""
+
+import argparse
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+
+from profile_manifest import DATASETS, Manifest
+from url_journal import load_url_list
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_FILE = os.path.join(BASE_DIR, "url_registry.json")
+FRESH_DAYS = 365        # profiles scraped more recently than this are reused as-is
+
+log = logging.getLogger(__name__)
+
+
+def dataset_name(data_dir):
+    """Registry name of a dataset dir (e.g. .../data-saas -> "SaaS"), or None."""
+    data_dir = os.path.abspath(data_dir)
+    for name, path in DATASETS.items():
+        if os.path.abspath(path) == data_dir:
+            return name
+    return None
+
+
+class UrlRegistry:
+    """Every investor slug once, with its list memberships and stored profiles."""
+
+    def __init__(self, datasets=DATASETS, dataset=None, fresh_days=FRESH_DAYS):
+        self.datasets = datasets
+        self.dataset = dataset          # the dataset this process scrapes, if any
+        self.fresh_days = fresh_days
+        self.slugs = {}                 # slug -> {"url", "lists"}
+        self.manifests = {}
+        self.stats = {"checked": 0, "reused": 0, "stale": 0, "unreadable": 0}
+        self._build()
+
+    def _build(self):
+        for name, dataset_dir in self.datasets.items():
+            urls_file = os.path.join(dataset_dir, "all_investor_urls.json")
+            if os.path.exists(urls_file):
+                for inv in load_url_list(urls_file):
+                    entry = self.slugs.setdefault(inv["slug"], {"url": inv["url"], "lists": set()})
+                    entry["lists"].add(name)
+            if os.path.isdir(os.path.join(dataset_dir, "profiles")):
+                manifest = Manifest(dataset_dir)
+                if not manifest.exists:
+                    manifest.refresh()
+                    manifest.close()
+                self.manifests[name] = manifest
+
+    # -- queries ---------------------------------------------------------------
+    def lists(self, slug):
+        entry = self.slugs.get(slug)
+        return sorted(entry["lists"]) if entry else []
+
+    def holders(self, slug):
+        """{dataset: manifest entry} for every dataset with a valid profile of slug."""
+        found = {}
+        for name, manifest in self.manifests.items():
+            entry = manifest.entries.get(slug)
+            if entry and entry["valid"]:
+                found[name] = entry
+        return found
+
+    def fresh_source(self, slug, exclude=None):
+        """Dataset holding the newest valid profile of slug scraped within fresh_days, or None."""
+        cutoff = (datetime.now() - timedelta(days=self.fresh_days)).isoformat()
+        best = None
+        for name, entry in self.holders(slug).items():
+            if name == exclude or not entry.get("scraped_at"):
+                continue
+            if entry["scraped_at"] >= cutoff and (best is None or entry["scraped_at"] > best[1]):
+                best = (name, entry["scraped_at"])
+        return best[0] if best else None
+
+    def reuse(self, slug, dataset=None):
+        """Profile data for slug from a dataset other than `dataset` (default: the
+        registry's own), if one is fresh; else None."""
+        self.stats["checked"] += 1
+        source = self.fresh_source(slug, exclude=dataset or self.dataset)
+        if source is None:
+            if self.holders(slug):
+                self.stats["stale"] += 1
+            return None
+        path = os.path.join(self.datasets[source], "profiles", f"{slug}.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            log.warning(f"  Registry: cannot reuse {slug} from {source}: {e}")
+            self.stats["unreadable"] += 1
+            return None
+        self.stats["reused"] += 1
+        return data
+
+    # -- report ----------------------------------------------------------------
+    def overlap(self):
+        """{number of lists: slugs in that many lists}."""
+        counts = {}
+        for entry in self.slugs.values():
+            counts[len(entry["lists"])] = counts.get(len(entry["lists"]), 0) + 1
+        return dict(sorted(counts.items()))
+
+    def report(self):
+        """Dict of overlap and page-load savings across all datasets."""
+        memberships = sum(len(e["lists"]) for e in self.slugs.values())
+        reusable = {name: 0 for name in self.datasets}
+        for slug, entry in self.slugs.items():
+            for name in entry["lists"]:
+                manifest = self.manifests.get(name)
+                if manifest is not None and slug in manifest.entries:
+                    continue
+                if self.fresh_source(slug, exclude=name):
+                    reusable[name] += 1
+        return {
+            "unique_slugs": len(self.slugs),
+            "list_memberships": memberships,
+            "duplicate_page_loads": memberships - len(self.slugs),
+            "by_list_count": self.overlap(),
+            "missing_but_reusable": reusable,
+        }
+
+    def save(self, path=REGISTRY_FILE):
+        out = {slug: {"url": e["url"], "lists": sorted(e["lists"]), "profiles": sorted(self.holders(slug))}
+               for slug, e in sorted(self.slugs.items())}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"built_at": datetime.now().isoformat(), "slugs": out}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def summary(self):
+        s = self.stats
+        return (f"{s['reused']} profiles reused from other lists (page loads saved), "
+                f"{s['stale']} stale copies ignored, {s['checked']} checked")
+
+
+# =============================================================================
+# MAIN
+# =============================================================================
+def print_report(registry):
+    r = registry.report()
+    print(f"  Unique investors:      {r['unique_slugs']}")
+    print(f"  List memberships:      {r['list_memberships']}")
+    print(f"  Duplicate page loads:  {r['duplicate_page_loads']} (one per extra list an investor is in)")
+    for n, count in r["by_list_count"].items():
+        print(f"    in {n} list{'s' if n > 1 else ' '}:          {count}")
+    print(f"  Missing profiles reusable from another list (fresh within {registry.fresh_days} days):")
+    for name, count in r["missing_but_reusable"].items():
+        print(f"    {name:<12} {count}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-dataset investor URL registry")
+    parser.add_argument("--fresh-days", type=int, default=FRESH_DAYS, help="Max profile age to reuse")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("report", help="Overlap between lists and page loads saved")
+    sub.add_parser("build", help="Write url_registry.json and print the report")
+    p = sub.add_parser("lists", help="Lists and stored profiles of one slug")
+    p.add_argument("slug")
+    args = parser.parse_args()
+
+    registry = UrlRegistry(fresh_days=args.fresh_days)
+    if args.command == "lists":
+        print(f"  lists:    {', '.join(registry.lists(args.slug)) or '-'}")
+        for name, entry in sorted(registry.holders(args.slug).items()):
+            print(f"  profile:  {name:<12} scraped {entry['scraped_at']}")
+        return
+    if args.command == "build":
+        registry.save()
+        print(f"  Wrote {REGISTRY_FILE}")
+    print_report(registry)
+
+
+if __name__ == "__main__":
+    main()